@@ -0,0 +1,75 @@
+"""
+Benchmark the overhead of `capture_output` per logging record and per `print` call,
+using a local file store. "hot path" defers the background flushes until the capture
+stops, so it only includes the cost on the calling thread. "total" flushes every second
+and also includes formatting and writing in the background thread, which competes with
+the calling thread for the GIL.
+
+Usage: python benchmarks/capture_overhead.py [num_records (default: 200000)]
+"""
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from mlflow_extend import mlflow
+
+
+def measure(func: Callable[[int], None], num_records: int) -> float:
+    start = time.perf_counter()
+    for i in range(num_records):
+        func(i)
+    return (time.perf_counter() - start) / num_records * 1e6
+
+
+def main() -> None:
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    def log(i: int) -> None:
+        logger.info("step %d loss %.4f", i, 0.5)
+
+    def write(i: int) -> None:
+        print("step {} loss {:.4f}".format(i, 0.5))
+
+    stdout = sys.stdout
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        mlflow.set_tracking_uri("file://" + os.path.join(root, "mlruns"))
+        with mlflow.start_run():
+            for name, func in [("logging", log), ("print", write)]:
+                # Discard the output so that only the capture is measured.
+                logger.addHandler(logging.NullHandler())
+                sys.stdout = io.StringIO()
+                base = measure(func, num_records)
+                overheads = []
+                for flush_interval in [3600, 1]:
+                    sys.stdout = io.StringIO()
+                    with mlflow.capture_output(
+                        logger=logger,
+                        stderr=False,
+                        flush_interval=flush_interval,
+                        buffer_size=num_records,
+                    ):
+                        overheads.append(measure(func, num_records) - base)
+                sys.stdout = stdout
+                logger.handlers = []
+                results.append((name, base, *overheads))
+
+    print("{:,} records".format(num_records))
+    print(
+        "{:<10}{:>12}{:>18}{:>14}".format(
+            "call", "base [us]", "hot path [us]", "total [us]"
+        )
+    )
+    for name, base, hot_path, total in results:
+        print("{:<10}{:>12.2f}{:>18.2f}{:>14.2f}".format(name, base, hot_path, total))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark write time, read time and size of dataframes logged by `log_df` and loaded by
+`load_df` in each supported file format, using a local file store.
+
+Usage: python benchmarks/dataframe_formats.py [num_rows (default: 5000000)]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from mlflow_extend import mlflow
+from mlflow_extend.loading import ArtifactCache
+
+# (path, fmt, compression)
+CASES = [
+    ("df.csv", "csv", None),
+    ("df.csv.zst", "csv", "zstd"),
+    ("df.parquet", "parquet", None),
+    ("df.arrow", "arrow", None),
+    ("df.lz4.arrow", "arrow", "lz4"),
+    ("df.zstd.arrow", "arrow", "zstd"),
+]
+
+
+def make_df(num_rows: int) -> pd.DataFrame:
+    rs = np.random.RandomState(42)
+    return pd.DataFrame(
+        {
+            "id": np.arange(num_rows),
+            "label": rs.randint(0, 2, num_rows),
+            "score": rs.rand(num_rows),
+            "feature": rs.randn(num_rows).astype(np.float32),
+            "group": pd.Categorical(rs.choice(["a", "b", "c"], num_rows)),
+        }
+    )
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    df = make_df(num_rows)
+    print("{:,} rows".format(num_rows))
+    print(
+        "{:<16}{:>12}{:>12}{:>12}".format("file", "write [s]", "read [s]", "size [MB]")
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        mlflow.set_tracking_uri("file://" + os.path.join(root, "mlruns"))
+        cache = ArtifactCache(os.path.join(root, "cache"))
+        with mlflow.start_run() as run:
+            for path, fmt, compression in CASES:
+                start = time.perf_counter()
+                mlflow.log_df(df, path, fmt=fmt, compression=compression)
+                write = time.perf_counter() - start
+
+                start = time.perf_counter()
+                mlflow.load_df(run.info.run_id, path, fmt=fmt, cache=cache)
+                read = time.perf_counter() - start
+
+                local_path = os.path.join(root, "cache", run.info.run_id, path)
+                if not os.path.exists(local_path):
+                    # Arrow files are read in place from the local artifact store.
+                    artifact_dir = run.info.artifact_uri.replace("file://", "")
+                    local_path = os.path.join(artifact_dir, path)
+                size = os.path.getsize(local_path) / 1024 ** 2
+                print(
+                    "{:<16}{:>12.2f}{:>12.2f}{:>12.1f}".format(path, write, read, size)
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark encoding time and size of matplotlib figures for each encoding profile and
+file format supported by `log_plt_figure`.
+
+Usage: python benchmarks/figure_encoding.py
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+from matplotlib import pyplot as plt
+
+from mlflow_extend.logging import _FIGURE_PROFILES, _save_plt_figure
+
+FORMATS = ["png", "webp", "svg", "pdf"]
+NUM_REPEATS = 5
+
+
+def make_figure() -> plt.Figure:
+    fig, ax = plt.subplots()
+    ax.plot(np.random.RandomState(42).randn(10000).cumsum())
+    ax.set_title("Benchmark")
+    return fig
+
+
+def main() -> None:
+    fig = make_figure()
+    print(
+        "{:<10}{:<8}{:>14}{:>14}".format("profile", "format", "time [ms]", "size [KB]")
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for profile, settings in _FIGURE_PROFILES.items():
+            for fmt in FORMATS:
+                path = os.path.join(tmpdir, "figure.{}".format(fmt))
+                pil_kwargs = settings["pil_kwargs"].get(fmt, {})
+
+                start = time.perf_counter()
+                for _ in range(NUM_REPEATS):
+                    _save_plt_figure(fig, path, fmt, settings["dpi"], pil_kwargs)
+                elapsed = (time.perf_counter() - start) / NUM_REPEATS
+
+                size = os.path.getsize(path) / 1024
+                print(
+                    "{:<10}{:<8}{:>14.1f}{:>14.1f}".format(
+                        profile, fmt, elapsed * 1000, size
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
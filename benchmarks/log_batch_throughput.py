@@ -0,0 +1,91 @@
+"""
+Benchmark the throughput of `log_params_flatten` and `log_metrics_flatten` for a config
+with 10k keys against a local tracking server, with and without concurrent batches.
+
+Usage: python benchmarks/log_batch_throughput.py
+"""
+import os
+import socket
+import subprocess
+import tempfile
+import time
+
+import requests
+
+from mlflow_extend import mlflow
+
+NUM_KEYS = 10000
+CONCURRENCY = [1, 2, 4, 8]
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(root: str, port: int) -> subprocess.Popen:
+    cmd = [
+        "mlflow",
+        "server",
+        "--backend-store-uri",
+        "sqlite:///{}".format(os.path.join(root, "mlflow.db")),
+        "--default-artifact-root",
+        os.path.join(root, "artifacts"),
+        "--port",
+        str(port),
+    ]
+    server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(120):
+        try:
+            requests.get("http://localhost:{}/health".format(port))
+            return server
+        except requests.ConnectionError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("Tracking server did not start.")
+
+
+def make_config(num_keys: int) -> dict:
+    # Nested config like {"group0": {"key0": 0, ...}, ...} with 100 keys per group.
+    return {
+        "group{}".format(g): {"key{}".format(k): g * 100 + k for k in range(100)}
+        for g in range(num_keys // 100)
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as root:
+        port = get_free_port()
+        server = start_server(root, port)
+        try:
+            mlflow.set_tracking_uri("http://localhost:{}".format(port))
+            config = make_config(NUM_KEYS)
+            print(
+                "{:<12}{:>16}{:>16}".format(
+                    "workers", "params [key/s]", "metrics [key/s]"
+                )
+            )
+
+            for workers in CONCURRENCY:
+                with mlflow.start_run():
+                    start = time.perf_counter()
+                    mlflow.log_params_flatten(config, max_workers=workers)
+                    params_time = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    mlflow.log_metrics_flatten(config, max_workers=workers)
+                    metrics_time = time.perf_counter() - start
+
+                print(
+                    "{:<12}{:>16.0f}{:>16.0f}".format(
+                        workers, NUM_KEYS / params_time, NUM_KEYS / metrics_time
+                    )
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
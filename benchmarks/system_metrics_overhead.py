@@ -0,0 +1,55 @@
+"""
+Benchmark the CPU overhead of `sample_system_metrics` while the main thread is busy,
+using a local file store. The overhead is the CPU time of the sampling thread as a
+percentage of the elapsed time.
+
+Usage: python benchmarks/system_metrics_overhead.py [seconds (default: 10)]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+from mlflow_extend import mlflow
+from mlflow_extend.system_metrics import _read_proc
+
+# (interval, flush_interval)
+CASES = [(10.0, 60.0), (1.0, 10.0), (0.1, 1.0)]
+
+
+def busy(seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    number = 10000
+    read = timeit.timeit(_read_proc, number=number) / number * 1e6
+    print("read /proc: {:.1f} us".format(read))
+    print(
+        "{:<10}{:>10}{:>10}{:>14}".format(
+            "interval", "flush", "samples", "overhead [%]"
+        )
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        mlflow.set_tracking_uri("file://" + os.path.join(root, "mlruns"))
+        for interval, flush_interval in CASES:
+            with mlflow.start_run():
+                with mlflow.sample_system_metrics(
+                    interval=interval, flush_interval=flush_interval
+                ) as sampler:
+                    busy(seconds)
+                overhead = sampler.overhead
+            print(
+                "{:<10}{:>10}{:>10}{:>14.3f}".format(
+                    interval, flush_interval, sampler._step, overhead
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
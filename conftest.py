@@ -11,7 +11,9 @@ import py
 import pytest
 from matplotlib import pyplot as plt
 
+import mlflow_extend.loading
 import mlflow_extend.mlflow
+import mlflow_extend.testing.utils
 
 
 def pytest_addoption(parser: _pytest.config.argparsing.Parser) -> None:
@@ -29,7 +31,22 @@ def inject_items_into_doctest_namespace(doctest_namespace: dict) -> None:
     doctest_namespace["pd"] = pd
     doctest_namespace["plt"] = plt
     doctest_namespace["mlflow"] = mlflow_extend.mlflow
-    doctest_namespace["list_artifacts"] = mlflow_extend.testing.utils._list_artifacts
+    doctest_namespace["list_artifacts"] = mlflow_extend.testing.utils.list_artifacts
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolate_artifact_cache(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[None, None, None]:
+    """
+    Keep artifacts cached by tests and doctests out of the user's cache directory.
+    """
+    default_cache_dir = mlflow_extend.loading.DEFAULT_CACHE_DIR
+    mlflow_extend.loading.DEFAULT_CACHE_DIR = str(tmp_path_factory.mktemp("cache"))
+    mlflow_extend.loading._default_cache = None
+    yield
+    mlflow_extend.loading.DEFAULT_CACHE_DIR = default_cache_dir
+    mlflow_extend.loading._default_cache = None
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -64,6 +64,9 @@ def main():
         cm = confusion_matrix(y_test, y_proba > 0.5)
         mlflow.log_confusion_matrix(cm)  # EX
 
+        # Log metrics at every decision threshold.
+        mlflow.log_threshold_sweep(y_test, y_proba)  # EX
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+import argparse
+from typing import List, Optional
+
+from mlflow_extend import spool
+
+
+def _replay(args: argparse.Namespace) -> None:
+    num_replayed = spool.replay(
+        args.path, args.tracking_uri, args.max_retries, args.backoff
+    )
+    print("Replayed {} records from {}.".format(num_replayed, args.path))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mlflow_extend")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    replay = subparsers.add_parser(
+        "replay", help="Upload a journal written in spool mode to the tracking server."
+    )
+    replay.add_argument("path", help="Journal directory.")
+    replay.add_argument(
+        "--tracking-uri",
+        default=None,
+        help="Tracking URI to upload to. Defaults to MLFLOW_TRACKING_URI.",
+    )
+    replay.add_argument(
+        "--max-retries", type=int, default=5, help="Maximum retries per request."
+    )
+    replay.add_argument(
+        "--backoff", type=float, default=1.0, help="Initial backoff in seconds."
+    )
+    replay.set_defaults(func=_replay)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
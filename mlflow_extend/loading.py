@@ -0,0 +1,769 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import mlflow
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import yaml
+from mlflow.entities import Run, RunStatus
+from mlflow.utils.file_utils import local_file_uri_to_path
+
+from mlflow_extend.streams import SEGMENT_PATTERN
+from mlflow_extend.utils import file_format, file_sha256
+
+__all__ = [
+    "ArtifactCache",
+    "fetch_artifacts",
+    "load_dict",
+    "load_df",
+    "load_numpy",
+    "load_numpy_sharded",
+    "load_curves",
+    "load_manifest",
+    "verify_artifacts",
+    "load_text_stream",
+    "load_metric_histories",
+]
+
+# Per-user cache directory, following the XDG base directory convention.
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "mlflow_extend",
+)
+
+_METRIC_COLUMNS = ["run_id", "key", "step", "timestamp", "value"]
+
+
+def _read_data(path: str) -> Dict[str, Any]:
+    """
+    Read data from JSON and YAML files.
+    """
+    with open(path, "r") as f:
+        ext = os.path.splitext(path)[-1]
+        if ext == ".json":
+            return json.load(f)
+        elif ext in [".yaml", ".yml"]:
+            return yaml.load(f, Loader=yaml.SafeLoader)
+        else:
+            raise ValueError("Invalid file type: `{}`".format(ext))
+
+
+def _get_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+class ArtifactCache:
+    """
+    Local on-disk cache of run artifacts keyed by run ID and artifact path.
+
+    Artifacts are stored in "<cache_dir>/<run_id>/<path>". When the total size
+    exceeds `max_bytes`, the least recently used artifacts are evicted. Artifacts
+    accessed since a `get` call started are never evicted by it, so a path returned to
+    another thread meanwhile stays valid.
+
+    Parameters
+    ----------
+    cache_dir : str, default None
+        Cache directory. If unspecified, `DEFAULT_CACHE_DIR` is used.
+    max_bytes : int, default None
+        Maximum total size of the cached artifacts. If ``None``, nothing is evicted.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_dict({'a': 0}, 'dict.json')
+    >>> cache = ArtifactCache(tempfile.mkdtemp())
+    >>> local_path = cache.get(run.info.run_id, 'dict.json')
+    >>> os.path.relpath(local_path, cache.cache_dir) == os.path.join(
+    ...     run.info.run_id, 'dict.json')
+    True
+
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None
+    ):
+        self.cache_dir = DEFAULT_CACHE_DIR if cache_dir is None else cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        # Logical time of the last access to each entry (see `_touch`).
+        self._accessed: Dict[str, int] = {}
+        self._clock = 0
+        self._total_bytes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        # Restore the LRU order of artifacts cached by previous sessions from mtime.
+        entries = []
+        for run_id in os.listdir(self.cache_dir):
+            run_dir = os.path.join(self.cache_dir, run_id)
+            if not os.path.isdir(run_dir) or run_id.startswith("."):
+                continue
+            for root, _, files in os.walk(run_dir):
+                for f in files:
+                    path = os.path.join(root, f)
+                    entries.append(
+                        (os.path.getmtime(path), path, os.path.getsize(path))
+                    )
+
+        for _, path, size in sorted(entries):
+            self._entries[path] = size
+            self._touch(path)
+            self._total_bytes += size
+
+    def _touch(self, path: str) -> None:
+        self._entries.move_to_end(path)
+        self._clock += 1
+        self._accessed[path] = self._clock
+
+    def _evict(self, before: int) -> None:
+        if self.max_bytes is None:
+            return
+
+        for path in list(self._entries):
+            # Entries are ordered by access time, so the rest are newer as well.
+            if self._total_bytes <= self.max_bytes or self._accessed[path] >= before:
+                break
+            self._total_bytes -= self._entries.pop(path)
+            del self._accessed[path]
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    def _local_path(self, run_id: str, path: str) -> str:
+        return os.path.join(self.cache_dir, run_id, os.path.normpath(path))
+
+    def get(self, run_id: str, path: str) -> str:
+        """
+        Get the local path of an artifact, downloading it if it's not cached.
+
+        Parameters
+        ----------
+        run_id : str
+            Run ID.
+        path : str
+            Artifact path.
+
+        Returns
+        -------
+        str
+            Local path of the artifact.
+
+        """
+        local_path = self._local_path(run_id, path)
+
+        with self._lock:
+            start = self._clock + 1
+            if local_path in self._entries:
+                self._touch(local_path)
+                os.utime(local_path)
+                return local_path
+
+        # Download into a temporary directory first so that an interrupted download
+        # never leaves a partial file in the cache.
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".download-")
+        try:
+            client = mlflow.tracking.MlflowClient()
+            downloaded = client.download_artifacts(run_id, path, tmp_dir)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with self._lock:
+                if not os.path.exists(local_path):
+                    os.replace(downloaded, local_path)
+                if local_path not in self._entries:
+                    size = _get_size(local_path)
+                    self._entries[local_path] = size
+                    self._total_bytes += size
+                self._touch(local_path)
+                self._evict(before=start)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return local_path
+
+    def fetch(
+        self, run_ids: Iterable[str], path: str, max_workers: int = 8
+    ) -> Dict[str, str]:
+        """
+        Download an artifact from many runs in parallel.
+
+        Parameters
+        ----------
+        run_ids : iterable of str
+            Run IDs.
+        path : str
+            Artifact path.
+        max_workers : int, default 8
+            Maximum number of concurrent downloads.
+
+        Returns
+        -------
+        dict
+            Mapping from run ID to the local path of the artifact.
+
+        """
+        run_ids = list(run_ids)
+        with ThreadPoolExecutor(max_workers) as executor:
+            local_paths = executor.map(lambda run_id: self.get(run_id, path), run_ids)
+            return dict(zip(run_ids, local_paths))
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        Total size of the cached artifacts.
+        """
+        return self._total_bytes
+
+
+_default_cache: Optional[ArtifactCache] = None
+
+
+def _get_cache(cache: Optional[ArtifactCache]) -> ArtifactCache:
+    global _default_cache
+
+    if cache is not None:
+        return cache
+
+    if _default_cache is None:
+        _default_cache = ArtifactCache()
+    return _default_cache
+
+
+def fetch_artifacts(
+    run_ids: Iterable[str],
+    path: str,
+    cache: Optional[ArtifactCache] = None,
+    max_workers: int = 8,
+) -> Dict[str, str]:
+    """
+    Download an artifact from many runs in parallel into the local cache.
+
+    Parameters
+    ----------
+    run_ids : iterable of str
+        Run IDs.
+    path : str
+        Artifact path.
+    cache : ArtifactCache, default None
+        Cache to store the artifacts in. If unspecified, the default cache is used.
+    max_workers : int, default 8
+        Maximum number of concurrent downloads.
+
+    Returns
+    -------
+    dict
+        Mapping from run ID to the local path of the artifact.
+
+    Examples
+    --------
+    >>> run_ids = []
+    >>> for i in range(3):
+    ...     with mlflow.start_run() as run:
+    ...         mlflow.log_dict({'i': i}, 'config.json')
+    ...     run_ids.append(run.info.run_id)
+    >>> _ = mlflow.fetch_artifacts(run_ids, 'config.json')
+    >>> [mlflow.load_dict(run_id, 'config.json') for run_id in run_ids]
+    [{'i': 0}, {'i': 1}, {'i': 2}]
+
+    """
+    return _get_cache(cache).fetch(run_ids, path, max_workers)
+
+
+def load_dict(run_id: str, path: str, cache: Optional[ArtifactCache] = None) -> dict:
+    """
+    Load a dictionary logged by `log_dict`.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str
+        Path in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the artifact from. If unspecified, the default cache is used.
+
+    Returns
+    -------
+    dict
+        Loaded dictionary.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_dict({'a': 0}, 'dict.yaml')
+    >>> mlflow.load_dict(run.info.run_id, 'dict.yaml')
+    {'a': 0}
+
+    """
+    return _read_data(_get_cache(cache).get(run_id, path))
+
+
+def _local_artifact_path(run_id: str, path: str) -> Optional[str]:
+    """
+    Return the path of an artifact if the artifact store of the run is on the local
+    file system, otherwise None.
+    """
+    artifact_uri = mlflow.tracking.MlflowClient().get_run(run_id).info.artifact_uri
+    if urllib.parse.urlparse(artifact_uri).scheme not in ["", "file"]:
+        return None
+
+    local_path = os.path.join(
+        local_file_uri_to_path(artifact_uri), os.path.normpath(path)
+    )
+    return local_path if os.path.isfile(local_path) else None
+
+
+def load_df(
+    run_id: str,
+    path: str,
+    fmt: Optional[str] = None,
+    cache: Optional[ArtifactCache] = None,
+) -> pd.DataFrame:
+    """
+    Load a dataframe logged by `log_df`.
+
+    Arrow IPC files ("feather" and "arrow") are memory-mapped, so the file isn't read
+    into an intermediate buffer. If the artifact store is on the local file system,
+    they are mapped in place without copying them into the cache. The data is still
+    converted into a pandas dataframe (decompressing it if needed), which takes about
+    as much memory as the dataframe that was logged.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str
+        Path in the artifact store.
+    fmt : str, default None
+        File format of the dataframe. If None, file format is inferred from `path`.
+    cache : ArtifactCache, default None
+        Cache to load the artifact from. If unspecified, the default cache is used.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Loaded dataframe.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_df(pd.DataFrame({'a': [0]}), 'df.csv')
+    >>> mlflow.load_df(run.info.run_id, 'df.csv')
+       a
+    0  0
+
+    """
+    fmt = file_format(path) if fmt is None else fmt.lstrip(".")
+
+    local_path = None
+    if fmt in ["feather", "arrow"]:
+        local_path = _local_artifact_path(run_id, path)
+    if local_path is None:
+        local_path = _get_cache(cache).get(run_id, path)
+
+    if fmt == "csv":
+        # pandas needs the optional zstandard package to read zstd files.
+        if local_path.endswith(".zst"):
+            with pa.CompressedInputStream(pa.OSFile(local_path), "zstd") as f:
+                return pd.read_csv(f)
+        return pd.read_csv(local_path)
+    elif fmt in ["feather", "arrow"]:
+        with pa.memory_map(local_path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            # Release the Arrow buffers column by column as they are converted.
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+    elif fmt == "parquet":
+        return pd.read_parquet(local_path)
+    else:
+        raise ValueError("Invalid file format: {}.".format(fmt))
+
+
+def load_numpy(
+    run_id: str, path: str, cache: Optional[ArtifactCache] = None
+) -> np.ndarray:
+    """
+    Load a numpy array logged by `log_numpy`.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str
+        Path in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the artifact from. If unspecified, the default cache is used.
+
+    Returns
+    -------
+    numpy.ndarray
+        Loaded array.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_numpy(np.array([0]), 'array.npy')
+    >>> mlflow.load_numpy(run.info.run_id, 'array.npy')
+    array([0])
+
+    """
+    return np.load(_get_cache(cache).get(run_id, path))
+
+
+def load_numpy_sharded(
+    run_id: str, path: str, cache: Optional[ArtifactCache] = None
+) -> np.ndarray:
+    """
+    Load a numpy array logged by `log_numpy_sharded`.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str
+        Directory path in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the artifact from. If unspecified, the default cache is used.
+
+    Returns
+    -------
+    numpy.ndarray
+        Loaded array.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_numpy_sharded(np.arange(5), 'array', shard_rows=2)
+    >>> mlflow.load_numpy_sharded(run.info.run_id, 'array')
+    array([0, 1, 2, 3, 4])
+
+    """
+    local_dir = _get_cache(cache).get(run_id, path)
+    index = _read_data(os.path.join(local_dir, "index.json"))
+    arr = np.empty(index["shape"], dtype=index["dtype"])
+    start = 0
+    for shard in index["shards"]:
+        with np.load(os.path.join(local_dir, shard)) as f:
+            rows = f["arr"]
+        end = start + len(rows)
+        arr[start:end] = rows
+        start = end
+    return arr
+
+
+def load_curves(
+    run_ids: Iterable[str],
+    path: str,
+    cache: Optional[ArtifactCache] = None,
+    max_workers: int = 8,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Load curve arrays logged by `log_roc_curve` or `log_pr_curve` with `data_path`
+    from many runs. The files are downloaded in parallel.
+
+    Parameters
+    ----------
+    run_ids : iterable of str
+        Run IDs.
+    path : str
+        Path of the arrays in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the artifacts from. If unspecified, the default cache is used.
+    max_workers : int, default 8
+        Maximum number of concurrent downloads.
+
+    Returns
+    -------
+    dict
+        Mapping from run ID to a mapping from array names (e.g. "fpr" and "tpr") to
+        arrays.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_pr_curve([1, 0], [0, 1], data_path='pr_curve.npz')
+    >>> curves = mlflow.load_curves([run.info.run_id], 'pr_curve.npz')
+    >>> curves[run.info.run_id]['rec']
+    array([0, 1])
+
+    """
+    curves = {}
+    for run_id, local_path in fetch_artifacts(
+        run_ids, path, cache, max_workers
+    ).items():
+        with np.load(local_path) as f:
+            curves[run_id] = {k: f[k] for k in f.files}
+    return curves
+
+
+def load_manifest(
+    run_id: str, path: str = "manifest.json", cache: Optional[ArtifactCache] = None
+) -> pd.DataFrame:
+    """
+    Load the artifact manifest logged by `log_manifest`.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str, default "manifest.json"
+        Path of the manifest in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the manifest from. If unspecified, the default cache is used.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with the columns "path", "bytes", "sha256", "seconds" and "format".
+
+    """
+    manifest = load_dict(run_id, path, cache)
+    columns = ["path", "bytes", "sha256", "seconds", "format"]
+    return pd.DataFrame(manifest["artifacts"], columns=columns)
+
+
+def verify_artifacts(
+    run_id: str,
+    path: str = "manifest.json",
+    cache: Optional[ArtifactCache] = None,
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """
+    Download the artifacts listed in the manifest in parallel and verify their sizes
+    and SHA-256 hashes.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str, default "manifest.json"
+        Path of the manifest in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to download the artifacts into. If unspecified, the default cache is used.
+    max_workers : int, default 8
+        Maximum number of concurrent downloads.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Manifest (see `load_manifest`) with the "ok" column which is True for intact
+        artifacts.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run, mlflow.record_manifest():
+    ...     mlflow.log_numpy(np.arange(3), 'array.npy')
+    >>> mlflow.verify_artifacts(run.info.run_id)[['path', 'ok']]
+            path    ok
+    0  array.npy  True
+
+    """
+    cache = _get_cache(cache)
+    manifest = load_manifest(run_id, path, cache)
+
+    def verify(entry: Tuple[str, int, str]) -> bool:
+        artifact_path, size, sha256 = entry
+        local_path = cache.get(run_id, artifact_path)
+        return os.path.getsize(local_path) == size and file_sha256(local_path) == sha256
+
+    entries = manifest[["path", "bytes", "sha256"]].itertuples(index=False, name=None)
+    with ThreadPoolExecutor(max_workers) as executor:
+        manifest["ok"] = list(executor.map(verify, entries))
+    return manifest
+
+
+def load_text_stream(
+    run_id: str,
+    path: str,
+    cache: Optional[ArtifactCache] = None,
+    max_workers: int = 8,
+    encoding: str = "utf-8",
+) -> str:
+    """
+    Load a text logged by `mlflow_extend.streams.TextStream`. Segments are downloaded
+    in parallel and concatenated.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    path : str
+        Directory of the segments in the artifact store.
+    cache : ArtifactCache, default None
+        Cache to load the segments from. If unspecified, the default cache is used.
+    max_workers : int, default 8
+        Maximum number of concurrent downloads.
+    encoding : str, default "utf-8"
+        Text encoding the stream was written with.
+
+    Returns
+    -------
+    str
+        Text.
+
+    """
+    cache = _get_cache(cache)
+    client = mlflow.tracking.MlflowClient()
+    segments = sorted(
+        (int(match.group(1)), f.path)
+        for f in client.list_artifacts(run_id, path)
+        for match in [SEGMENT_PATTERN.match(os.path.basename(f.path))]
+        if match is not None
+    )
+
+    def read(segment: Tuple[int, str]) -> bytes:
+        local_path = cache.get(run_id, segment[1])
+        with pa.input_stream(local_path, compression="detect") as f:
+            return f.read()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return b"".join(executor.map(read, segments)).decode(encoding)
+
+
+def _search_runs(
+    client: mlflow.tracking.MlflowClient, experiment_ids: List[str], filter_string: str
+) -> List[Run]:
+    runs: List[Run] = []
+    page_token = None
+    while True:
+        page = client.search_runs(experiment_ids, filter_string, page_token=page_token)
+        runs.extend(page)
+        page_token = page.token
+        if not page_token:
+            return runs
+
+
+def _get_run_state(run: Run) -> list:
+    return [run.info.status, run.info.end_time]
+
+
+def _read_metric_cache(cache_dir: Optional[str]) -> Tuple[pd.DataFrame, dict]:
+    metrics_path = os.path.join(cache_dir or "", "metrics.parquet")
+    if cache_dir is None or not os.path.exists(metrics_path):
+        return pd.DataFrame(columns=_METRIC_COLUMNS), {}
+
+    with open(os.path.join(cache_dir, "runs.json")) as f:
+        return pd.read_parquet(metrics_path), json.load(f)
+
+
+def _write_metric_cache(
+    cache_dir: str, metrics: pd.DataFrame, run_states: dict
+) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    metrics.to_parquet(os.path.join(cache_dir, "metrics.parquet"), index=False)
+    with open(os.path.join(cache_dir, "runs.json"), "w") as f:
+        json.dump(run_states, f)
+
+
+def load_metric_histories(
+    run_ids: Optional[Iterable[str]] = None,
+    experiment_ids: Optional[List[str]] = None,
+    filter_string: str = "",
+    sep: str = ".",
+    cache_dir: Optional[str] = None,
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """
+    Load metric histories of many runs into a single long-format dataframe.
+
+    Metric histories are fetched concurrently. If `cache_dir` is specified, the table
+    is cached there and only runs that are still active or have changed since the
+    last call are fetched again.
+
+    Parameters
+    ----------
+    run_ids : iterable of str, default None
+        Run IDs to load metrics from.
+    experiment_ids : list of str, default None
+        Experiment IDs to search runs in. Ignored if `run_ids` is specified.
+    filter_string : str, default ""
+        Filter query string used to search runs in `experiment_ids`.
+    sep : str, default "."
+        Key separator used to split metric keys into the "level_<n>" columns.
+    cache_dir : str, default None
+        Directory to cache the table in. If unspecified, nothing is cached.
+    max_workers : int, default 8
+        Maximum number of concurrent requests.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with the columns "run_id", "key", "step", "timestamp", "value" and
+        "level_0", "level_1", ... which contain the key split by `sep`.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     for step in range(2):
+    ...         mlflow.log_metrics_flatten({'a': {'b': step}}, step=step)
+    >>> df = mlflow.load_metric_histories([run.info.run_id])
+    >>> df[['key', 'level_0', 'level_1', 'step', 'value']]
+       key level_0 level_1  step  value
+    0  a.b       a       b     0    0.0
+    1  a.b       a       b     1    1.0
+
+    """
+    client = mlflow.tracking.MlflowClient()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        if run_ids is not None:
+            runs = list(executor.map(client.get_run, run_ids))
+        elif experiment_ids is not None:
+            runs = _search_runs(client, experiment_ids, filter_string)
+        else:
+            raise ValueError("Either `run_ids` or `experiment_ids` must be specified.")
+
+        cached, run_states = _read_metric_cache(cache_dir)
+
+        # Metrics of a terminated run can't change unless the run is restarted.
+        stale_runs = [
+            run
+            for run in runs
+            if not RunStatus.is_terminated(RunStatus.from_string(run.info.status))
+            or run_states.get(run.info.run_id) != _get_run_state(run)
+        ]
+        tasks = [
+            (run.info.run_id, key) for run in stale_runs for key in run.data.metrics
+        ]
+        histories = executor.map(lambda t: client.get_metric_history(*t), tasks)
+        rows = [
+            (run_id, key, m.step, m.timestamp, m.value)
+            for (run_id, key), history in zip(tasks, histories)
+            for m in history
+        ]
+
+    stale_run_ids = {run.info.run_id for run in stale_runs}
+    fetched = pd.DataFrame(rows, columns=_METRIC_COLUMNS)
+    metrics = pd.concat([cached[~cached["run_id"].isin(stale_run_ids)], fetched])
+    metrics = metrics.astype(
+        {"step": "int64", "timestamp": "int64", "value": "float64"}
+    )
+
+    if cache_dir is not None:
+        run_states.update({run.info.run_id: _get_run_state(run) for run in runs})
+        _write_metric_cache(cache_dir, metrics, run_states)
+
+    run_id_set = {run.info.run_id for run in runs}
+    metrics = metrics[metrics["run_id"].isin(run_id_set)]
+    metrics = metrics.sort_values(["run_id", "key", "step", "timestamp"])
+    metrics = metrics.reset_index(drop=True)
+
+    levels = metrics["key"].str.split(sep, expand=True)
+    levels.columns = ["level_{}".format(i) for i in range(levels.shape[1])]
+    return pd.concat([metrics, levels], axis=1)
@@ -1,21 +1,52 @@
+import io
 import json
+import math
 import os
 import pickle
+import queue
 import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Generator, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import mlflow
 import numpy as np
 import pandas as pd
 import plotly
+import pyarrow as pa
 import yaml
 from matplotlib import pyplot as plt
+from mlflow.entities import Metric, Param
+from mlflow.utils.validation import (
+    MAX_METRICS_PER_BATCH,
+    MAX_PARAM_VAL_LENGTH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+)
+from PIL import Image
+from PIL import features as pil_features
 from plotly import graph_objects as go
 
 from mlflow_extend import plotting as mplt
+from mlflow_extend import resilience, spool, stats
+from mlflow_extend.profiling import DataProfile
 from mlflow_extend.typing import ArrayLike
-from mlflow_extend.utils import flatten_dict
+from mlflow_extend.utils import chunks, file_format, file_sha256, flatten_dict
 
 __all__ = [
     "log_params_flatten",
@@ -25,31 +56,277 @@ __all__ = [
     "log_figure",
     "log_dict",
     "log_df",
+    "log_data_profile",
+    "log_drift_report",
     "log_text",
     "log_numpy",
+    "log_numpy_sharded",
+    "log_corr_matrix",
     "log_confusion_matrix",
+    "log_classification_report",
     "log_feature_importance",
+    "log_attribution_summary",
     "log_roc_curve",
     "log_pr_curve",
+    "log_roc_curves",
+    "log_pr_curves",
+    "log_threshold_sweep",
+    "log_calibration_curve",
+    "log_manifest",
+    "record_manifest",
 ]
 
 
+# Encoding profiles for matplotlib figures. `pil_kwargs` is keyed by file format and
+# passed to Pillow, so it only affects raster formats.
+_FIGURE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"dpi": None, "pil_kwargs": {}},
+    "preview": {
+        "dpi": 50,
+        "pil_kwargs": {
+            "png": {"compress_level": 1},
+            "webp": {"quality": 50, "method": 0},
+        },
+    },
+    "high": {"dpi": 300, "pil_kwargs": {"webp": {"quality": 95}}},
+}
+
+_RASTER_FORMATS = ["png", "jpg", "jpeg", "webp"]
+
+# Lower bound and maximum number of re-encodings when fitting a figure into `max_bytes`.
+_MIN_DPI = 10
+_MAX_BUDGET_ATTEMPTS = 5
+
+# Maximum number of runs to cache what has been logged for (see `_RunCache`).
+_MAX_CACHED_RUNS = 16
+
+
+class _RunCache:
+    """
+    LRU cache of a dictionary per run. A run that isn't cached (e.g. logged to by
+    another process, or evicted) is seeded with `load`, which reads the run's state
+    from the tracking server. Not thread-safe.
+    """
+
+    def __init__(self, load: Callable[[str], Dict[str, Any]]):
+        self._load = load
+        self._runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._runs
+
+    def get(self, run_id: str) -> Dict[str, Any]:
+        if run_id in self._runs:
+            self._runs.move_to_end(run_id)
+            return self._runs[run_id]
+
+        entry = self._load(run_id)
+        self._runs[run_id] = entry
+        while len(self._runs) > _MAX_CACHED_RUNS:
+            self._runs.popitem(last=False)
+        return entry
+
+
+def _load_logged_params(run_id: str) -> Dict[str, Any]:
+    # Spooled runs can't be read, and their params are logged in the journal anyway.
+    if spool.get_spool() is not None:
+        return {}
+    return dict(mlflow.tracking.MlflowClient().get_run(run_id).data.params)
+
+
+def _load_json_artifact(run_id: str, path: str) -> Any:
+    """
+    Load a JSON artifact of a run, or return ``None`` if it doesn't exist or the run
+    is spooled.
+    """
+    if spool.get_spool() is not None:
+        return None
+
+    client = mlflow.tracking.MlflowClient()
+    dirname = os.path.dirname(path)
+    if path not in [a.path for a in client.list_artifacts(run_id, dirname or None)]:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(client.download_artifacts(run_id, path, tmpdir)) as f:
+            return json.load(f)
+
+
+_LONG_PARAMS_PATH = "long_params.json"
+
+MANIFEST_PATH = "manifest.json"
+
+# Params logged so far in each run, and params too long to be logged as params.
+_logged_params = _RunCache(_load_logged_params)
+_long_params = _RunCache(
+    lambda run_id: _load_json_artifact(run_id, _LONG_PARAMS_PATH) or {}
+)
+_logged_params_lock = threading.Lock()
+
+# Artifacts logged so far in the runs that record a manifest, keyed by the artifact
+# path (see `record_manifest`).
+_manifests: Dict[str, Dict[str, Dict[str, Any]]] = {}
+_manifests_lock = threading.Lock()
+
+# Compression codecs of CSV files inferred from the extension.
+_CSV_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+# Maximum number of encoded CSV chunks waiting to be written.
+_CSV_QUEUE_SIZE = 4
+
+# Default compression codec of Arrow IPC (Feather v2) files, same as `df.to_feather`.
+_ARROW_COMPRESSION = "lz4"
+
+T = TypeVar("T")
+
+
+def _get_or_start_run_id() -> str:
+    run = mlflow.active_run() or mlflow.start_run()
+    return run.info.run_id
+
+
+def _active_run_id() -> str:
+    run = mlflow.active_run()
+    if run is None:
+        raise RuntimeError("No active run.")
+    return run.info.run_id
+
+
+def _current_run_id() -> str:
+    # A journal can't create runs, so a run must be active when spooling.
+    return _get_or_start_run_id() if spool.get_spool() is None else _active_run_id()
+
+
+# The functions below send data to the tracking server, or to the active journal when
+# spooling is enabled (see `mlflow_extend.spool`). Artifacts are uploaded through the
+# resilient uploader (see `mlflow_extend.resilience`).
+
+
+def _run_concurrently(
+    func: Callable[[T], None], batches: List[T], max_workers: int
+) -> None:
+    # Batches are independent of each other, so they can be sent in parallel.
+    if len(batches) <= 1 or max_workers <= 1:
+        for batch in batches:
+            func(batch)
+        return
+
+    with ThreadPoolExecutor(min(len(batches), max_workers)) as executor:
+        # Consume the results to raise the first error, if any.
+        list(executor.map(func, batches))
+
+
+def _log_params(params: dict, max_workers: int = 1) -> None:
+    journal = spool.get_spool()
+    run_id = _current_run_id()
+
+    # Params are immutable, so those already logged with the same value are skipped.
+    params = {k: str(v) for k, v in params.items()}
+    with _logged_params_lock:
+        logged = _logged_params.get(run_id)
+        new_params = [(k, v) for k, v in params.items() if logged.get(k) != v]
+
+    if journal is not None:
+        # `replay` splits the params into batches.
+        batches = [new_params] if len(new_params) > 0 else []
+    else:
+        batches = list(chunks(new_params, MAX_PARAMS_TAGS_PER_BATCH))
+
+    def log_batch(batch: List[Tuple[str, str]]) -> None:
+        if journal is None:
+            client = mlflow.tracking.MlflowClient()
+            client.log_batch(run_id, params=[Param(k, v) for k, v in batch])
+        else:
+            journal.log_params(run_id, dict(batch))
+
+        with _logged_params_lock:
+            logged.update(batch)
+
+    _run_concurrently(log_batch, batches, max_workers)
+
+
+def _log_metric_steps(
+    steps_metrics: List[Tuple[int, Dict[str, float]]],
+    max_workers: int = 1,
+    run_id: Optional[str] = None,
+) -> None:
+    journal = spool.get_spool()
+    if journal is not None:
+        run_id = run_id or _active_run_id()
+        for step, metrics in steps_metrics:
+            journal.log_metrics(run_id, metrics, step)
+        return
+
+    run_id = run_id or _get_or_start_run_id()
+    timestamp = int(time.time() * 1000)
+    metric_objs = [
+        Metric(k, float(v), timestamp, step)
+        for step, metrics in steps_metrics
+        for k, v in metrics.items()
+    ]
+
+    def log_batch(batch: List[Metric]) -> None:
+        mlflow.tracking.MlflowClient().log_batch(run_id, metrics=batch)
+
+    batches = list(chunks(metric_objs, MAX_METRICS_PER_BATCH))
+    _run_concurrently(log_batch, batches, max_workers)
+
+
+def _log_artifact(
+    local_path: str, artifact_path: Optional[str] = None, run_id: Optional[str] = None
+) -> str:
+    # An explicit run ID allows logging from threads that outlive the active run.
+    journal = spool.get_spool()
+    if journal is None:
+        run_id = run_id or _get_or_start_run_id()
+        resilience.get_uploader().upload(run_id, local_path, artifact_path)
+    else:
+        run_id = run_id or _active_run_id()
+        journal.log_artifact(run_id, local_path, artifact_path)
+    return run_id
+
+
 @contextmanager
-def _artifact_context(path: str) -> Generator[str, None, None]:
+def _artifact_context(
+    path: str, record: bool = True, run_id: Optional[str] = None
+) -> Generator[str, None, None]:
     with tempfile.TemporaryDirectory() as tmpdir:
         path = os.path.normpath(path)
         dirname = os.path.dirname(path)
         filename = os.path.basename(path)
         artifact_path = None if dirname == filename else dirname
-        path = os.path.join(tmpdir, filename)
-        yield path
-        mlflow.log_artifact(path, artifact_path)
-
-
-def log_params_flatten(params: dict, parent_key: str = "", sep: str = ".") -> None:
+        tmp_path = os.path.join(tmpdir, filename)
+        start = time.perf_counter()
+        yield tmp_path
+        seconds = time.perf_counter() - start
+        run_id = _log_artifact(tmp_path, artifact_path, run_id)
+        # Only hash the file if the run records a manifest.
+        if record and run_id in _manifests:
+            artifact = path.replace(os.sep, "/")
+            entry = {
+                "path": artifact,
+                "bytes": os.path.getsize(tmp_path),
+                "sha256": file_sha256(tmp_path),
+                "seconds": round(seconds, 6),
+                "format": file_format(filename),
+            }
+            with _manifests_lock:
+                if run_id in _manifests:
+                    _manifests[run_id][artifact] = entry
+
+
+def log_params_flatten(
+    params: dict,
+    parent_key: str = "",
+    sep: str = ".",
+    long_values: str = "truncate",
+    max_workers: int = 1,
+) -> None:
     """
     Log a batch of params after flattening.
 
+    Params already logged with the same value in the active run are skipped, and the
+    rest are sent in batches that don't exceed the server's per-request param limit.
+
     Parameters
     ----------
     params : dict
@@ -58,6 +335,16 @@ def log_params_flatten(params: dict, parent_key: str = "", sep: str = ".") -> No
         Parent key.
     sep : str, default "."
         Key separator.
+    long_values : str, default "truncate"
+        How to handle values longer than the server's limit. One of:
+
+        - "truncate": truncate the values.
+        - "artifact": log them in "long_params.json" instead of as params.
+
+    max_workers : int, default 1
+        Maximum number of batches to send concurrently. Concurrency helps with remote
+        servers backed by a database that handles concurrent writes well, but slows
+        down servers backed by SQLite.
 
     Returns
     -------
@@ -75,26 +362,148 @@ def log_params_flatten(params: dict, parent_key: str = "", sep: str = ".") -> No
     >>> sorted(r.data.params.items())
     [('a.b', '0'), ('a_b', '0'), ('d.a.b', '0')]
 
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_params_flatten({"a": "x" * 1000}, long_values="artifact")
+    >>> list_artifacts(run.info.run_id)
+    ['long_params.json']
+
+    """
+    if long_values not in ["truncate", "artifact"]:
+        raise ValueError("Invalid value for `long_values`: {}.".format(long_values))
+
+    params = {k: str(v) for k, v in flatten_dict(params, parent_key, sep).items()}
+    long_params = {k: v for k, v in params.items() if len(v) > MAX_PARAM_VAL_LENGTH}
+
+    if long_values == "truncate":
+        params.update({k: v[:MAX_PARAM_VAL_LENGTH] for k, v in long_params.items()})
+    elif len(long_params) > 0:
+        params = {k: v for k, v in params.items() if k not in long_params}
+        # Re-log all long params of the run so that the artifact contains every one.
+        run_id = _current_run_id()
+        with _logged_params_lock:
+            run_long_params = _long_params.get(run_id)
+            run_long_params.update(long_params)
+            long_params = dict(run_long_params)
+        log_dict(long_params, _LONG_PARAMS_PATH)
+
+    _log_params(params, max_workers)
+
+
+def _join_index(index: pd.Index, parent_key: str, sep: str) -> List[str]:
+    # Build metric keys with vectorized string operations instead of a Python loop.
+    levels = [index.get_level_values(i).astype(str) for i in range(index.nlevels)]
+    keys = pd.Series(levels[0]).str.cat([pd.Series(lv) for lv in levels[1:]], sep=sep)
+    if parent_key:
+        keys = parent_key + sep + keys
+    return keys.tolist()
+
+
+def _flatten_metrics(
+    metrics: Any,
+    step: Optional[int],
+    parent_key: str,
+    sep: str,
+    labels: Optional[ArrayLike],
+) -> List[Tuple[int, Dict[str, float]]]:
+    """
+    Convert metrics in any of the supported input types into (step, metrics) pairs.
     """
-    mlflow.log_params(flatten_dict(params, parent_key, sep))
+    if isinstance(metrics, dict):
+        return [(step or 0, flatten_dict(metrics, parent_key, sep))]
+
+    # xarray.DataArray
+    if hasattr(metrics, "dims") and hasattr(metrics, "to_series"):
+        metrics = metrics.to_series()
+
+    if isinstance(metrics, np.ndarray):
+        if metrics.ndim != 1:
+            raise ValueError("Only 1D arrays are supported.")
+        index = np.arange(len(metrics)) if labels is None else labels
+        metrics = pd.Series(metrics, index=pd.Index(index))
+
+    if isinstance(metrics, pd.Series):
+        if "step" not in metrics.index.names:
+            keys = _join_index(metrics.index, parent_key, sep)
+            values = metrics.to_numpy(dtype=np.float64).tolist()
+            return [(step or 0, dict(zip(keys, values)))]
+
+        if metrics.index.nlevels > 1:
+            metrics = metrics.unstack("step").T
+        elif metrics.name is not None:
+            metrics = metrics.to_frame()
+        elif parent_key:
+            metrics = metrics.to_frame(parent_key)
+            parent_key = ""
+        else:
+            raise ValueError(
+                "A series indexed only by step must have a name or `parent_key`."
+            )
+
+    if isinstance(metrics, pd.DataFrame):
+        if "step" in metrics.columns:
+            steps = metrics["step"].to_numpy()
+            metrics = metrics.drop(columns="step")
+        else:
+            steps = metrics.index.to_numpy()
+
+        kind = pd.api.types.infer_dtype(steps, skipna=False)
+        if not (
+            kind == "integer" or (kind == "floating" and np.all(np.mod(steps, 1) == 0))
+        ):
+            raise ValueError(
+                'Steps must be integers, got values of type "{}".'.format(kind)
+            )
+
+        columns = np.array(_join_index(metrics.columns, parent_key, sep), dtype=object)
+        values = metrics.to_numpy(dtype=np.float64)
+        # Missing cells (e.g. of series with different steps) aren't logged.
+        present = ~np.isnan(values)
+        return [
+            (int(s), dict(zip(columns[mask].tolist(), row[mask].tolist())))
+            for s, row, mask in zip(steps, values, present)
+            if mask.any()
+        ]
+
+    raise TypeError('Invalid metrics type: "{}"'.format(type(metrics)))
 
 
 def log_metrics_flatten(
-    metrics: dict, step: Optional[int] = None, parent_key: str = "", sep: str = ".",
+    metrics: Union[dict, np.ndarray, pd.Series, pd.DataFrame],
+    step: Optional[int] = None,
+    parent_key: str = "",
+    sep: str = ".",
+    max_workers: int = 1,
+    labels: Optional[ArrayLike] = None,
 ) -> None:
     """
     Log a batch of metrics after flattening.
 
+    Metrics are sent in batches that don't exceed the server's per-request metric limit.
+
     Parameters
     ----------
-    metrics : dict
-        Dictionary of metrics to log.
+    metrics : dict, numpy.ndarray, pandas.Series, pandas.DataFrame or xarray.DataArray
+        Metrics to log.
+
+        - dict: (nested) dictionary of metrics.
+        - numpy.ndarray: 1D array of metrics. Keys are taken from `labels`, or the
+          positions if `labels` is unspecified.
+        - pandas.Series: keys are taken from the index. The levels of a MultiIndex are
+          joined with `sep`. A level named "step" is used as the metric step.
+        - pandas.DataFrame: each row is logged as a step. Keys are taken from the
+          columns, and steps from the "step" column if it exists, or the index.
+        - xarray.DataArray: converted into a pandas.Series with `to_series`.
+
     step : int, default None
-        Metric step. Defaults to zero if unspecified.
+        Metric step. Defaults to zero if unspecified. Ignored if `metrics` contains steps.
     parent_key : str, default ""
         Parent key.
     sep : str, default "."
         Key separator.
+    max_workers : int, default 1
+        Maximum number of batches to send concurrently (see `log_params_flatten`).
+    labels : array-like, default None
+        Metric keys of a numpy array.
 
     Returns
     -------
@@ -112,11 +521,45 @@ def log_metrics_flatten(
     >>> sorted(r.data.metrics.items())
     [('a.b', 0.0), ('a_b', 0.0), ('d.a.b', 0.0)]
 
+    >>> with mlflow.start_run() as run:
+    ...     f1 = np.array([0.5, 0.9])
+    ...     mlflow.log_metrics_flatten(f1, parent_key="f1", labels=["cat", "dog"])
+    ...     df = pd.DataFrame({"step": [0, 1], "loss": [1.0, 0.5]})
+    ...     mlflow.log_metrics_flatten(df)
+    >>> r = mlflow.get_run(run.info.run_id)
+    >>> sorted(r.data.metrics.items())
+    [('f1.cat', 0.5), ('f1.dog', 0.9), ('loss', 0.5)]
+
     """
-    mlflow.log_metrics(flatten_dict(metrics, parent_key, sep), step)
+    steps_metrics = _flatten_metrics(metrics, step, parent_key, sep, labels)
+    _log_metric_steps(steps_metrics, max_workers)
 
 
-def log_plt_figure(fig: plt.Figure, path: str) -> None:
+def _save_plt_figure(
+    fig: plt.Figure, path: str, fmt: str, dpi: Optional[float], pil_kwargs: dict
+) -> None:
+    if fmt == "webp":
+        if not pil_features.check("webp"):
+            raise ValueError("WebP is not supported by the installed Pillow.")
+
+        if "webp" not in fig.canvas.get_supported_filetypes():
+            # Old matplotlib can't write WebP. Render a PNG and re-encode it with Pillow.
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", dpi=dpi)
+            buf.seek(0)
+            Image.open(buf).save(path, format="webp", **pil_kwargs)
+            return
+
+    kwargs = {"pil_kwargs": pil_kwargs} if pil_kwargs else {}
+    fig.savefig(path, format=fmt, dpi=dpi, **kwargs)
+
+
+def log_plt_figure(
+    fig: plt.Figure,
+    path: str,
+    profile: str = "default",
+    max_bytes: Optional[int] = None,
+) -> None:
     """
     Log a matplotlib figure as an artifact.
 
@@ -125,7 +568,19 @@ def log_plt_figure(fig: plt.Figure, path: str) -> None:
     fig : matplotlib.pyplot.Figure
         Figure to log.
     path : str
-        Path in the artifact store.
+        Path in the artifact store. The file format is inferred from the extension
+        (e.g. "png", "webp", "svg", "pdf").
+    profile : str, default "default"
+        Encoding profile. One of:
+
+        - "default": matplotlib's default settings.
+        - "preview": low DPI and fast PNG/WebP compression.
+        - "high": high DPI.
+
+    max_bytes : int, default None
+        Maximum size of the artifact in bytes. If the encoded figure exceeds it, the
+        figure is re-encoded with a lower DPI. If it still exceeds it, the figure is
+        logged anyway with a warning. Ignored for vector formats.
 
     Returns
     -------
@@ -141,9 +596,43 @@ def log_plt_figure(fig: plt.Figure, path: str) -> None:
     >>> list_artifacts(run.info.run_id)
     ['plt_figure.png']
 
+    >>> with mlflow.start_run() as run:
+    ...     fig, ax = plt.subplots()
+    ...     _ = ax.plot([0, 1], [0, 1])
+    ...     mlflow.log_plt_figure(fig, 'preview.png', profile='preview')
+    >>> list_artifacts(run.info.run_id)
+    ['preview.png']
+
     """
+    if profile not in _FIGURE_PROFILES:
+        raise ValueError("Invalid profile: {}.".format(profile))
+
+    fmt = os.path.splitext(path)[-1].lstrip(".").lower() or "png"
+    dpi = _FIGURE_PROFILES[profile]["dpi"]
+    pil_kwargs = _FIGURE_PROFILES[profile]["pil_kwargs"].get(fmt, {})
+
     with _artifact_context(path) as tmp_path:
-        fig.savefig(tmp_path)
+        _save_plt_figure(fig, tmp_path, fmt, dpi, pil_kwargs)
+
+        if max_bytes is not None and fmt in _RASTER_FORMATS:
+            if dpi is None:
+                dpi = plt.rcParams["savefig.dpi"]
+                dpi = fig.dpi if dpi == "figure" else dpi
+
+            for _ in range(_MAX_BUDGET_ATTEMPTS):
+                size = os.path.getsize(tmp_path)
+                if size <= max_bytes or dpi <= _MIN_DPI:
+                    break
+
+                # The encoded size is roughly proportional to the pixel count.
+                dpi = max(_MIN_DPI, dpi * math.sqrt(max_bytes / size) * 0.9)
+                _save_plt_figure(fig, tmp_path, fmt, dpi, pil_kwargs)
+
+            size = os.path.getsize(tmp_path)
+            if size > max_bytes:
+                msg = '"{}" is {} bytes at {:.0f} DPI, which exceeds `max_bytes` ({}).'
+                warnings.warn(msg.format(path, size, dpi, max_bytes))
+
         plt.close(fig)
 
 
@@ -289,18 +778,126 @@ def log_pickle(obj: Any, path: str) -> None:
             pickle.dump(obj, f)
 
 
-def log_df(df: pd.DataFrame, path: str, fmt: str = "csv") -> None:
+DataFrames = Union[pd.DataFrame, Iterable[Union[pd.DataFrame, pa.RecordBatch]]]
+
+
+def _iter_row_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterable[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[slice(start, start + chunk_rows)]
+
+
+def _write_csv_stream(
+    dfs: Iterable[Union[pd.DataFrame, pa.RecordBatch]],
+    path: str,
+    compression: Optional[str],
+) -> None:
+    """
+    Write dataframes into a single CSV file. Dataframes are encoded on the calling
+    thread, while another thread compresses and writes the encoded chunks. The queue
+    between them is bounded, so memory usage doesn't grow with the number of rows.
+    """
+    if compression not in [None, "gzip", "zstd"]:
+        raise ValueError("Invalid compression: {}.".format(compression))
+
+    encoded: queue.Queue = queue.Queue(_CSV_QUEUE_SIZE)
+    failed = threading.Event()
+
+    def write() -> None:
+        # The last stream wraps the others, so closing it closes them all.
+        streams = []
+        try:
+            streams.append(pa.OSFile(path, "wb"))
+            if compression is not None:
+                streams.append(pa.CompressedOutputStream(streams[-1], compression))
+            while True:
+                data = encoded.get()
+                if data is None:
+                    return
+                streams[-1].write(data)
+        except Exception:
+            # Keep consuming until the end so that the producer never blocks.
+            failed.set()
+            while encoded.get() is not None:
+                pass
+            raise
+        finally:
+            if len(streams) > 0:
+                streams[-1].close()
+
+    with ThreadPoolExecutor(1) as executor:
+        writer = executor.submit(write)
+        columns = None
+        try:
+            for df in dfs:
+                if failed.is_set() or writer.done():
+                    break
+                if isinstance(df, pa.RecordBatch):
+                    df = df.to_pandas()
+                # Only the first dataframe writes the header.
+                header = columns is None
+                if columns is None:
+                    columns = df.columns
+                elif not df.columns.equals(columns):
+                    raise ValueError("All dataframes must have the same columns.")
+                encoded.put(df.to_csv(index=False, header=header).encode())
+        finally:
+            encoded.put(None)
+        writer.result()
+
+    if columns is None:
+        raise ValueError("No dataframes to log.")
+
+
+def _write_arrow(
+    df: pd.DataFrame, path: str, compression: Optional[str], chunk_rows: int
+) -> None:
+    """
+    Write a dataframe into an Arrow IPC file (Feather v2) in record batches of at most
+    `chunk_rows` rows. Unlike `df.to_feather`, any index is preserved.
+    """
+    if compression not in [None, "lz4", "zstd"]:
+        raise ValueError("Invalid compression: {}.".format(compression))
+
+    # A RangeIndex is stored as metadata, and other indexes as columns.
+    table = pa.Table.from_pandas(df, preserve_index=None)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=chunk_rows)
+
+
+def log_df(
+    df: DataFrames,
+    path: str,
+    fmt: str = "csv",
+    compression: Optional[str] = "infer",
+    chunk_rows: int = 100000,
+) -> None:
     """
     Log a dataframe as an artifact.
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        Dataframe to log.
+    df : pandas.DataFrame or iterable of pandas.DataFrame or pyarrow.RecordBatch
+        Dataframe to log. An iterable (e.g. a generator of prediction batches) is
+        streamed into a single CSV file with one header, without concatenating the
+        dataframes in memory. All dataframes must have the same columns.
     path : str
         Path in the artifact store.
     fmt : str, default "csv"
-        File format to save the dataframe in.
+        File format to save the dataframe in ("csv", "feather" (or its alias
+        "arrow") or "parquet"). Only "csv" supports iterables. "feather" writes an
+        Arrow IPC file that preserves the index and can be memory-mapped by `load_df`.
+    compression : str, default "infer"
+        Compression codec.
+
+        - "csv": "gzip", "zstd" or None. If "infer", "gzip" is used for paths ending
+          with ".gz", and "zstd" for ".zst".
+        - "feather": "lz4", "zstd" or None. If "infer", "lz4" is used.
+
+    chunk_rows : int, default 100000
+        Number of rows to encode at once when writing a single dataframe into CSV,
+        and maximum number of rows in each record batch of an Arrow IPC file.
 
     Returns
     -------
@@ -311,19 +908,161 @@ def log_df(df: pd.DataFrame, path: str, fmt: str = "csv") -> None:
     --------
     >>> with mlflow.start_run() as run:
     ...     mlflow.log_df(pd.DataFrame({'a': [0]}), 'df.csv')
+    ...     batches = (pd.DataFrame({'a': [i, i + 1]}) for i in range(0, 6, 2))
+    ...     mlflow.log_df(batches, 'batches.csv.gz')
     >>> list_artifacts(run.info.run_id)
-    ['df.csv']
+    ['batches.csv.gz', 'df.csv']
+    >>> mlflow.load_df(run.info.run_id, 'batches.csv.gz')['a'].tolist()
+    [0, 1, 2, 3, 4, 5]
 
     """
     with _artifact_context(path) as tmp_path:
         if fmt == "csv":
-            df.to_csv(tmp_path, index=False)
-        elif fmt == "feather":
-            df.to_feather(tmp_path)
+            if compression == "infer":
+                ext = os.path.splitext(path)[-1].lower()
+                compression = _CSV_COMPRESSIONS.get(ext)
+            dfs = (
+                _iter_row_chunks(df, chunk_rows) if isinstance(df, pd.DataFrame) else df
+            )
+            _write_csv_stream(dfs, tmp_path, compression)
+        elif not isinstance(df, pd.DataFrame):
+            raise ValueError("Only CSV supports iterables of dataframes.")
+        elif fmt in ["feather", "arrow"]:
+            if compression == "infer":
+                compression = _ARROW_COMPRESSION
+            _write_arrow(df, tmp_path, compression, chunk_rows)
+        elif fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
         else:
             raise ValueError("Invalid file format: {}.".format(fmt))
 
 
+def log_data_profile(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame], DataProfile],
+    path: str = "data_profile.json",
+    histogram_path: Optional[str] = "data_profile_histograms.png",
+    quantiles: Tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    bins: int = 30,
+    max_histograms: int = 20,
+) -> None:
+    """
+    Log a profile of dataframe columns (see `mlflow_extend.profiling.DataProfile`):
+    counts, nulls, approximate distinct counts, min, max, mean, variance and
+    approximate quantiles, computed in a single streaming pass over chunks.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, iterable of pandas.DataFrame or DataProfile
+        Dataframe, chunks of a dataframe (e.g. from ``pandas.read_csv`` with
+        `chunksize`), or a profile, e.g. merged from profiles of parallel workers.
+    path : str, default "data_profile.json"
+        Path of the profile in the artifact store. The format ("json" or "parquet")
+        is inferred from the extension. In JSON, the profile is a mapping from column
+        names to statistics.
+    histogram_path : str, default "data_profile_histograms.png"
+        Path of the histograms of numeric columns in the artifact store. If ``None``,
+        histograms aren't logged.
+    quantiles : tuple of float, default (0.05, 0.25, 0.5, 0.75, 0.95)
+        Quantiles to compute.
+    bins : int, default 30
+        Number of histogram bins.
+    max_histograms : int, default 20
+        Maximum number of histograms to plot. The first numeric columns are plotted.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> chunks = (pd.DataFrame({'a': np.random.randn(100)}) for _ in range(3))
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_data_profile(chunks)
+    >>> list_artifacts(run.info.run_id)
+    ['data_profile.json', 'data_profile_histograms.png']
+
+    """
+    if isinstance(data, DataProfile):
+        profile = data
+    else:
+        profile = DataProfile()
+        for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+            profile.update(chunk)
+
+    df = profile.to_frame(quantiles)
+    fmt = os.path.splitext(path)[-1].lstrip(".")
+    if fmt == "json":
+        # NaN isn't valid JSON, so inapplicable statistics are written as null.
+        records = df.astype(object).where(df.notna(), None)
+        log_dict({str(k): v for k, v in records.to_dict("index").items()}, path)
+    elif fmt == "parquet":
+        log_df(df.rename_axis("column").reset_index(), path, fmt)
+    else:
+        raise ValueError("Invalid file format: {}.".format(fmt))
+
+    hists = profile.histograms(bins)
+    if histogram_path is not None and len(hists) > 0:
+        hists = dict(list(hists.items())[:max_histograms])
+        log_figure(mplt.histograms(hists), histogram_path)
+
+
+def log_drift_report(
+    ref: pd.DataFrame,
+    cur: pd.DataFrame,
+    bins: int = 10,
+    parent_key: str = "drift",
+    path: Optional[str] = "drift_report.png",
+    block_size: int = 64,
+    max_workers: int = 1,
+) -> None:
+    """
+    Log PSI, KS statistic and Jensen-Shannon divergence of each column between
+    reference and current data (see `mlflow_extend.stats.drift`) as metrics in
+    batches with keys like "drift.psi.<column>", and as a heatmap.
+
+    Parameters
+    ----------
+    ref : pandas.DataFrame
+        Reference data (e.g. training data).
+    cur : pandas.DataFrame
+        Current data (e.g. serving data).
+    bins : int, default 10
+        Number of quantile bins of numeric columns.
+    parent_key : str, default "drift"
+        Parent key of the metrics.
+    path : str, default "drift_report.png"
+        Path of the heatmap in the artifact store. If ``None``, the heatmap isn't
+        logged.
+    block_size : int, default 64
+        Number of numeric columns to process at once.
+    max_workers : int, default 1
+        Number of processes to compute the statistics in.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> ref = pd.DataFrame({'x': np.random.randn(100)})
+    >>> cur = pd.DataFrame({'x': np.random.randn(100) + 1})
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_drift_report(ref, cur)
+    >>> list_artifacts(run.info.run_id)
+    ['drift_report.png']
+    >>> sorted(mlflow.get_run(run.info.run_id).data.metrics)
+    ['drift.js.x', 'drift.ks.x', 'drift.psi.x']
+
+    """
+    report = stats.drift(ref, cur, bins, block_size, max_workers)
+    # NaN (e.g. the KS statistic of a categorical column) can't be logged as a metric.
+    log_metrics_flatten(report.T.stack().dropna(), parent_key=parent_key)
+    if path is not None:
+        log_figure(mplt.drift_heatmap(report), path)
+
+
 def log_text(text: str, path: str) -> None:
     """
     Log a text as an artifact.
@@ -381,6 +1120,124 @@ def log_numpy(arr: np.ndarray, path: str) -> None:
         np.save(tmp_path, arr)
 
 
+def log_numpy_sharded(arr: np.ndarray, path: str, shard_rows: int = 100000) -> None:
+    """
+    Log a large numpy array as a directory of compressed shards of rows. Shards are
+    read and written one at a time, so a `numpy.memmap` larger than memory can be
+    logged.
+
+    The directory contains "index.json" with the shape, the dtype and the shard file
+    names, and the shards saved with `numpy.savez_compressed` as "00000.npz",
+    "00001.npz" and so on. Use `mlflow_extend.loading.load_numpy_sharded` to load it.
+
+    Parameters
+    ----------
+    arr : numpy.ndarray
+        Numpy array to log.
+    path : str
+        Directory path in the artifact store.
+    shard_rows : int, default 100000
+        Number of rows in each shard.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_numpy_sharded(np.zeros((5, 2)), 'array', shard_rows=3)
+    >>> list_artifacts(run.info.run_id)
+    ['array/00000.npz', 'array/00001.npz', 'array/index.json']
+
+    """
+    shards: List[str] = []
+    for start in range(0, max(len(arr), 1), shard_rows):
+        shard = "{:05d}.npz".format(len(shards))
+        rows = slice(start, start + shard_rows)
+        with _artifact_context(os.path.join(path, shard)) as tmp_path:
+            np.savez_compressed(tmp_path, arr=arr[rows])
+        shards.append(shard)
+
+    index = {"shape": list(arr.shape), "dtype": arr.dtype.str, "shards": shards}
+    log_dict(index, os.path.join(path, "index.json"))
+
+
+def log_corr_matrix(
+    df: pd.DataFrame,
+    path: str = "corr_matrix.png",
+    cluster: bool = False,
+    tile_size: int = 500,
+    block_size: int = 1024,
+) -> None:
+    """
+    Compute the correlation matrix of a dataframe and log it as an artifact.
+
+    If the dataframe has more than `tile_size` numeric columns, the matrix is split
+    into tiles which are logged in "<path stem>_tiles/", and the matrix itself and
+    the column names are logged as "<path stem>.npy" and "<path stem>_columns.json".
+    Tile "<i>_<j>" covers the i-th block of rows and the j-th block of columns. Since
+    the matrix is symmetric, only the tiles on and above the diagonal (i <= j) are
+    logged; tile "<j>_<i>" is the transpose of tile "<i>_<j>". Read the full matrix
+    from "<path stem>.npy" instead of assembling it from the tiles.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataframe to compute the correlation matrix of. Non-numeric columns are ignored.
+    path : str, default "corr_matrix.png"
+        Path in the artifact store.
+    cluster : bool, default False
+        Reorder columns by hierarchical clustering. Requires scipy.
+    tile_size : int, default 500
+        Maximum number of columns in a single image.
+    block_size : int, default 1024
+        Number of columns to process at once when computing the matrix.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     df = pd.DataFrame({'a': [1, 2, 3], 'b': [3, 1, 2], 'c': [2, 3, 1]})
+    ...     mlflow.log_corr_matrix(df)
+    ...     mlflow.log_corr_matrix(df, 'tiled.png', tile_size=2)
+    >>> list_artifacts(run.info.run_id)  # doctest: +NORMALIZE_WHITESPACE
+    ['corr_matrix.png', 'tiled.npy', 'tiled_columns.json',
+     'tiled_tiles/0_0.png', 'tiled_tiles/0_1.png', 'tiled_tiles/1_1.png']
+
+    """
+    columns = df.select_dtypes("number").columns
+    corr = stats.corr(df[columns], block_size)
+
+    if cluster:
+        order = stats.cluster_order(corr)
+        corr = corr[np.ix_(order, order)]
+        columns = columns[order]
+
+    num_cols = len(columns)
+    if num_cols <= tile_size:
+        fig = mplt.corr_matrix(pd.DataFrame(corr, index=columns, columns=columns))
+        log_figure(fig, path)
+        return
+
+    root, ext = os.path.splitext(path)
+    for i in range(0, num_cols, tile_size):
+        for j in range(i, num_cols, tile_size):
+            rows, cols = slice(i, i + tile_size), slice(j, j + tile_size)
+            tile = pd.DataFrame(corr[rows, cols], columns[rows], columns[cols])
+            fig = mplt.corr_matrix(tile, raster=True)
+            tile_path = "{}_{}{}".format(i // tile_size, j // tile_size, ext)
+            log_figure(fig, os.path.join(root + "_tiles", tile_path))
+
+    log_numpy(corr, root + ".npy")
+    log_dict({"columns": [str(c) for c in columns]}, root + "_columns.json")
+
+
 def log_confusion_matrix(cm: ArrayLike, path: str = "confusion_matrix.png") -> None:
     """
     Log a confusion matrix as an artifact.
@@ -409,6 +1266,84 @@ def log_confusion_matrix(cm: ArrayLike, path: str = "confusion_matrix.png") -> N
     log_figure(fig, path)
 
 
+def log_classification_report(
+    cm: Optional[Any] = None,
+    y_true: Optional[ArrayLike] = None,
+    y_pred: Optional[ArrayLike] = None,
+    labels: Optional[ArrayLike] = None,
+    sparse: bool = False,
+    parent_key: str = "",
+    path: str = "classification_report.csv",
+    cm_path: Optional[str] = "confusion_matrix.png",
+) -> None:
+    """
+    Log precision, recall and F1 score of each class and their averages computed from
+    a confusion matrix (see `mlflow_extend.stats.classification_report`).
+
+    The scores are logged as metrics in batches with keys like "precision.<label>" and
+    "f1.macro_avg", and as a CSV table artifact with one row per label. The confusion
+    matrix is also logged as a figure unless it has too many labels to be readable.
+
+    Parameters
+    ----------
+    cm : array-like or scipy.sparse matrix, default None
+        Confusion matrix with rows for true labels and columns for predicted labels.
+        Computed from `y_true` and `y_pred` if unspecified.
+    y_true : array-like, default None
+        True labels.
+    y_pred : array-like, default None
+        Predicted labels.
+    labels : array-like, default None
+        Label names. If `cm` is unspecified, the sorted union of `y_true` and `y_pred`
+        is used. Otherwise, the positions are used.
+    sparse : bool, default False
+        Compute a sparse confusion matrix from `y_true` and `y_pred` for huge label
+        spaces. Requires scipy.
+    parent_key : str, default ""
+        Parent key of the metrics.
+    path : str, default "classification_report.csv"
+        Path of the table in the artifact store.
+    cm_path : str, default "confusion_matrix.png"
+        Path of the confusion matrix figure in the artifact store. If ``None``, the
+        figure isn't logged.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_classification_report(y_true=[0, 1, 1], y_pred=[0, 0, 1])
+    >>> list_artifacts(run.info.run_id)
+    ['classification_report.csv', 'confusion_matrix.png']
+    >>> r = mlflow.get_run(run.info.run_id)
+    >>> r.data.metrics["recall.1"], r.data.metrics["f1.micro_avg"]
+    (0.5, 0.6666666666666666)
+
+    """
+    if cm is None:
+        if y_true is None or y_pred is None:
+            raise ValueError("Either `cm` or both `y_true` and `y_pred` must be given.")
+        if labels is None:
+            labels = np.union1d(np.asarray(y_true), np.asarray(y_pred))
+        cm = stats.confusion_matrix(y_true, y_pred, labels, sparse)
+    elif not hasattr(cm, "toarray"):
+        cm = np.asarray(cm)
+
+    report = stats.classification_report(cm, labels)
+    scores = report.drop(columns="support").T.stack()
+    log_metrics_flatten(scores, parent_key=parent_key)
+    log_df(report.rename_axis("label").reset_index(), path)
+
+    # An annotated heatmap is unreadable and expensive to draw for many labels.
+    if cm_path is not None and cm.shape[0] <= mplt._MAX_HEATMAP_SIZE:
+        dense = cm.toarray() if hasattr(cm, "toarray") else cm
+        fig = mplt.confusion_matrix(dense, labels)
+        log_figure(fig, cm_path)
+
+
 def log_feature_importance(
     features: ArrayLike,
     importances: ArrayLike,
@@ -454,11 +1389,85 @@ def log_feature_importance(
     log_figure(fig, path)
 
 
+def log_attribution_summary(
+    values: np.ndarray,
+    features: Optional[ArrayLike] = None,
+    limit: int = 20,
+    sample_size: int = 10000,
+    path: str = "attribution_summary.png",
+    table_path: str = "attribution_summary.csv",
+    array_path: Optional[str] = "attributions",
+    chunk_size: int = 65536,
+    shard_rows: int = 100000,
+) -> None:
+    """
+    Log a summary of a per-sample attribution matrix (e.g. SHAP values).
+
+    The matrix is summarized in a single chunked pass (see
+    `mlflow_extend.stats.attribution_summary`), so it can be a `numpy.memmap` larger
+    than memory. This logs a beeswarm-style plot drawn from a stratified subsample,
+    a table with the mean absolute attribution and quantiles of each feature, and
+    the full matrix as compressed shards (see `log_numpy_sharded`).
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2D attribution matrix (rows x features).
+    features : array-like, default None
+        Feature names. If unspecified, the column positions are used.
+    limit : int, default 20
+        Maximum number of features to plot.
+    sample_size : int, default 10000
+        Number of rows in the subsample used for the quantiles and the plot.
+    path : str, default "attribution_summary.png"
+        Path of the plot in the artifact store.
+    table_path : str, default "attribution_summary.csv"
+        Path of the table in the artifact store.
+    array_path : str, default "attributions"
+        Directory path of the full matrix in the artifact store. If ``None``, the
+        matrix isn't logged.
+    chunk_size : int, default 65536
+        Number of rows to summarize at once.
+    shard_rows : int, default 100000
+        Number of rows in each shard of the logged matrix.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     values = np.random.randn(100, 3)
+    ...     mlflow.log_attribution_summary(values, ['a', 'b', 'c'])
+    >>> list_artifacts(run.info.run_id)  # doctest: +NORMALIZE_WHITESPACE
+    ['attribution_summary.csv', 'attribution_summary.png',
+     'attributions/00000.npz', 'attributions/index.json']
+
+    """
+    summary, sample = stats.attribution_summary(
+        values, features, sample_size=sample_size, chunk_size=chunk_size
+    )
+    log_df(summary.rename_axis("feature").reset_index(), table_path)
+    log_figure(mplt.attribution_summary(summary, sample, limit), path)
+    if array_path is not None:
+        log_numpy_sharded(values, array_path, shard_rows)
+
+
+def _log_curve_data(path: str, **arrays: Any) -> None:
+    with _artifact_context(path) as tmp_path:
+        # Open the file explicitly because numpy appends ".npz" to paths without it.
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **{k: v for k, v in arrays.items() if v is not None})
+
+
 def log_roc_curve(
     fpr: ArrayLike,
     tpr: ArrayLike,
     auc: Optional[float] = None,
     path: str = "roc_curve.png",
+    data_path: Optional[str] = None,
 ) -> None:
     """
     Log ROC curve as an artifact.
@@ -473,6 +1482,10 @@ def log_roc_curve(
         Area under the curve.
     path : str, default "roc_curve.png"
         Path in the artifact store.
+    data_path : str, default None
+        If specified, the arrays ("fpr", "tpr" and "auc") are also logged to this
+        path as a ".npz" file, which `mlflow_extend.loading.load_curves` loads to
+        compare runs.
 
     Returns
     -------
@@ -482,13 +1495,15 @@ def log_roc_curve(
     Examples
     --------
     >>> with mlflow.start_run() as run:
-    ...     mlflow.log_roc_curve([0, 1], [0, 1])
+    ...     mlflow.log_roc_curve([0, 1], [0, 1], data_path='roc_curve.npz')
     >>> list_artifacts(run.info.run_id)
-    ['roc_curve.png']
+    ['roc_curve.npz', 'roc_curve.png']
 
     """
     fig = mplt.roc_curve(fpr, tpr, auc)
     log_figure(fig, path)
+    if data_path is not None:
+        _log_curve_data(data_path, fpr=fpr, tpr=tpr, auc=auc)
 
 
 def log_pr_curve(
@@ -496,6 +1511,7 @@ def log_pr_curve(
     rec: ArrayLike,
     auc: Optional[float] = None,
     path: str = "pr_curve.png",
+    data_path: Optional[str] = None,
 ) -> None:
     """
     Log precision-recall curve as an artifact.
@@ -510,6 +1526,10 @@ def log_pr_curve(
         Area under the curve.
     path : str, default "pr_curve.png"
         Path in the artifact store.
+    data_path : str, default None
+        If specified, the arrays ("pre", "rec" and "auc") are also logged to this
+        path as a ".npz" file, which `mlflow_extend.loading.load_curves` loads to
+        compare runs.
 
     Returns
     -------
@@ -526,3 +1546,278 @@ def log_pr_curve(
     """
     fig = mplt.pr_curve(pre, rec, auc)
     log_figure(fig, path)
+    if data_path is not None:
+        _log_curve_data(data_path, pre=pre, rec=rec, auc=auc)
+
+
+def log_roc_curves(
+    curves: Mapping[Any, Tuple[ArrayLike, ArrayLike]], path: str = "roc_curves.png"
+) -> None:
+    """
+    Log ROC curves of many runs in a single figure as an artifact. To log them to a
+    parent run, call this in the parent run, e.g. ``mlflow.start_run(run_id=...)``.
+
+    Parameters
+    ----------
+    curves : mapping
+        Mapping from labels (e.g. run IDs) to pairs of false and true positive rates.
+    path : str, default "roc_curves.png"
+        Path in the artifact store.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> run_ids = []
+    >>> for i in range(3):
+    ...     with mlflow.start_run() as run:
+    ...         mlflow.log_roc_curve([0, 0.5, 1], [0, 0.5 + i / 10, 1],
+    ...                              data_path='roc_curve.npz')
+    ...     run_ids.append(run.info.run_id)
+    >>> data = mlflow.load_curves(run_ids, 'roc_curve.npz')
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_roc_curves({k: (d['fpr'], d['tpr']) for k, d in data.items()})
+    >>> list_artifacts(run.info.run_id)
+    ['roc_curves.png']
+
+    """
+    log_figure(mplt.roc_curves(curves), path)
+
+
+def log_pr_curves(
+    curves: Mapping[Any, Tuple[ArrayLike, ArrayLike]], path: str = "pr_curves.png"
+) -> None:
+    """
+    Log precision-recall curves of many runs in a single figure as an artifact.
+
+    Parameters
+    ----------
+    curves : mapping
+        Mapping from labels (e.g. run IDs) to pairs of precision and recall.
+    path : str, default "pr_curves.png"
+        Path in the artifact store.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_pr_curves({'a': ([1, 0.5], [0, 1]), 'b': ([1, 0.8], [0, 1])})
+    >>> list_artifacts(run.info.run_id)
+    ['pr_curves.png']
+
+    """
+    log_figure(mplt.pr_curves(curves), path)
+
+
+def log_threshold_sweep(
+    y_true: ArrayLike,
+    y_score: ArrayLike,
+    pos_label: Any = 1,
+    fp_cost: float = 1.0,
+    fn_cost: float = 1.0,
+    max_rows: Optional[int] = 1000,
+    path: str = "threshold_sweep.csv",
+    plot_path: Optional[str] = "threshold_sweep.png",
+) -> None:
+    """
+    Log precision, recall, F1 score and cost at every decision threshold of a binary
+    classifier (see `mlflow_extend.stats.threshold_sweep`) as a table and a plot.
+
+    Parameters
+    ----------
+    y_true : array-like
+        True labels.
+    y_score : array-like
+        Scores of the positive class (e.g. probabilities).
+    pos_label : Any, default 1
+        Label of the positive class.
+    fp_cost : float, default 1.0
+        Cost of a false positive.
+    fn_cost : float, default 1.0
+        Cost of a false negative.
+    max_rows : int, default 1000
+        Maximum number of thresholds in the table. Thresholds are picked at even
+        intervals, always including the ones with the best F1 score and the lowest
+        cost. If ``None``, all thresholds are logged.
+    path : str, default "threshold_sweep.csv"
+        Path of the table in the artifact store.
+    plot_path : str, default "threshold_sweep.png"
+        Path of the plot in the artifact store. If ``None``, the plot isn't logged.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_threshold_sweep([0, 1, 1, 0], [0.1, 0.8, 0.4, 0.3])
+    >>> list_artifacts(run.info.run_id)
+    ['threshold_sweep.csv', 'threshold_sweep.png']
+
+    """
+    sweep = stats.threshold_sweep(y_true, y_score, pos_label, fp_cost, fn_cost)
+
+    if max_rows is not None and len(sweep) > max_rows:
+        rows = np.linspace(0, len(sweep) - 1, max_rows).round().astype(int)
+        best = [sweep["f1"].idxmax(), sweep["cost"].idxmin()]
+        sweep = sweep.loc[np.union1d(rows, best)].reset_index(drop=True)
+
+    log_df(sweep, path)
+    if plot_path is not None:
+        log_figure(mplt.threshold_sweep(sweep), plot_path)
+
+
+def log_calibration_curve(
+    y_true: Optional[ArrayLike] = None,
+    y_prob: Optional[ArrayLike] = None,
+    n_bins: int = 10,
+    bins: Optional[stats.CalibrationBins] = None,
+    parent_key: str = "",
+    path: str = "calibration_curve.png",
+) -> None:
+    """
+    Log calibration curve as an artifact, and expected calibration error and Brier
+    score as metrics "ece" and "brier" in a single batch.
+
+    Parameters
+    ----------
+    y_true : array-like, default None
+        Binary labels.
+    y_prob : array-like, default None
+        Predicted probabilities of the positive class.
+    n_bins : int, default 10
+        Number of bins.
+    bins : mlflow_extend.stats.CalibrationBins, default None
+        Binned predictions. Use this to log predictions streamed in batches that don't
+        fit in memory at once. If given, `y_true`, `y_prob` and `n_bins` are ignored.
+    parent_key : str, default ""
+        Parent key of the metrics.
+    path : str, default "calibration_curve.png"
+        Path in the artifact store.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> from mlflow_extend.stats import CalibrationBins
+    >>> bins = CalibrationBins()
+    >>> for _ in range(3):
+    ...     y_prob = np.random.rand(1000)
+    ...     _ = bins.update(np.random.rand(1000) < y_prob, y_prob)
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_calibration_curve(bins=bins)
+    >>> list_artifacts(run.info.run_id)
+    ['calibration_curve.png']
+    >>> sorted(mlflow.get_run(run.info.run_id).data.metrics)
+    ['brier', 'ece']
+
+    """
+    bins = mplt._calibration_bins(y_true, y_prob, n_bins, bins)
+    log_metrics_flatten({"ece": bins.ece, "brier": bins.brier}, parent_key=parent_key)
+    log_figure(mplt.calibration_curve(bins=bins), path)
+
+
+def log_manifest(path: str = MANIFEST_PATH) -> None:
+    """
+    Log the manifest of the artifacts recorded in the active run so far (see
+    `record_manifest`).
+
+    The manifest is a compact JSON file with an entry for each artifact: "path",
+    "bytes", "sha256", "seconds" (time taken to serialize the artifact) and "format".
+    Readers can verify the artifacts and plan downloads from it without listing the
+    artifacts (see `mlflow_extend.loading.load_manifest`). An artifact logged more
+    than once keeps the latest entry, and entries of the manifest the run already has
+    at `path` (e.g. logged by another process) are kept.
+
+    Parameters
+    ----------
+    path : str, default "manifest.json"
+        Path in the artifact store.
+
+    Returns
+    -------
+    None
+        None
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     with mlflow.record_manifest():
+    ...         mlflow.log_dict({'a': 0}, 'dict.json')
+    ...         mlflow.log_manifest('checkpoint.json')
+    ...         mlflow.log_text('text', 'dir/text.txt')
+    >>> manifest = mlflow.load_manifest(run.info.run_id, 'checkpoint.json')
+    >>> manifest[['path', 'bytes', 'format']]
+            path  bytes format
+    0  dict.json     12   json
+
+    """
+    run_id = _current_run_id()
+    # Fetch the existing manifest without holding the lock, which all artifacts take.
+    existing = _load_json_artifact(run_id, path)
+    entries = {} if existing is None else {e["path"]: e for e in existing["artifacts"]}
+    with _manifests_lock:
+        entries.update(_manifests.get(run_id, {}))
+
+    artifacts = sorted(entries.values(), key=lambda e: e["path"])
+    manifest = {"version": 1, "artifacts": artifacts}
+    with _artifact_context(path, record=False) as tmp_path:
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+
+
+@contextmanager
+def record_manifest(path: str = MANIFEST_PATH) -> Generator[None, None, None]:
+    """
+    Record the artifacts logged by `mlflow_extend.logging` in the active run (from any
+    thread) and log their manifest with `log_manifest` on exit if any were logged.
+
+    Artifacts are only hashed while a manifest is recorded, so logging artifacts
+    outside of this context doesn't pay for it.
+
+    Parameters
+    ----------
+    path : str, default "manifest.json"
+        Path of the manifest in the artifact store.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     with mlflow.record_manifest():
+    ...         mlflow.log_dict({'a': 0}, 'dict.json')
+    ...         mlflow.log_text('text', 'dir/text.txt')
+    >>> manifest = mlflow.load_manifest(run.info.run_id)
+    >>> manifest[['path', 'bytes', 'format']]
+               path  bytes format
+    0     dict.json     12   json
+    1  dir/text.txt      4    txt
+
+    """
+    run_id = _current_run_id()
+    with _manifests_lock:
+        # A nested context leaves the recording to the outer one.
+        owner = run_id not in _manifests
+        if owner:
+            _manifests[run_id] = {}
+    try:
+        yield
+        with _manifests_lock:
+            recorded = len(_manifests[run_id]) > 0
+        if recorded:
+            log_manifest(path)
+    finally:
+        if owner:
+            with _manifests_lock:
+                del _manifests[run_id]
@@ -1,3 +1,8 @@
 from mlflow import *
 from mlflow_extend.experiment import *
 from mlflow_extend.logging import *
+from mlflow_extend.loading import *
+from mlflow_extend.run_index import *
+from mlflow_extend.streams import *
+from mlflow_extend.sweep import *
+from mlflow_extend.system_metrics import *
@@ -1,23 +1,37 @@
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import numpy as np
+import pandas as pd
 import seaborn as sns
 from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
+from mlflow_extend import stats
 from mlflow_extend.typing import ArrayLike
 
 sns.set()
 
+# Matrices wider than this are drawn as a raster image without gridlines and labels.
+_MAX_HEATMAP_SIZE = 50
+
 __all__ = [
     "corr_matrix",
     "confusion_matrix",
     "feature_importance",
     "roc_curve",
     "pr_curve",
+    "threshold_sweep",
+    "calibration_curve",
+    "attribution_summary",
+    "histograms",
+    "drift_heatmap",
+    "roc_curves",
+    "pr_curves",
 ]
 
 
-def corr_matrix(corr: ArrayLike) -> plt.Figure:
+def corr_matrix(corr: ArrayLike, raster: Optional[bool] = None) -> plt.Figure:
     """
     Plot correlation matrix.
 
@@ -25,6 +39,10 @@ def corr_matrix(corr: ArrayLike) -> plt.Figure:
     ----------
     corr : array-like
         Correlation matrix.
+    raster : bool, default None
+        Draw the full matrix as an image without gridlines and annotations, which stays
+        fast for wide matrices. If ``None``, enabled when the matrix has more than 50
+        columns.
 
     Returns
     -------
@@ -42,6 +60,12 @@ def corr_matrix(corr: ArrayLike) -> plt.Figure:
         <Figure ... with 2 Axes>
 
     """
+    if raster is None:
+        raster = len(corr) > _MAX_HEATMAP_SIZE
+
+    if raster:
+        return _corr_matrix_raster(corr)
+
     fig, ax = plt.subplots()
     mask = np.zeros_like(corr, dtype=np.bool)
     mask[np.triu_indices_from(mask, k=1)] = True
@@ -61,6 +85,32 @@ def corr_matrix(corr: ArrayLike) -> plt.Figure:
     return fig
 
 
+def _corr_matrix_raster(corr: ArrayLike) -> plt.Figure:
+    labels = (corr.index, corr.columns) if isinstance(corr, pd.DataFrame) else None
+    corr = np.asarray(corr)
+
+    fig, ax = plt.subplots()
+    img = ax.imshow(
+        corr,
+        vmin=-1,
+        vmax=1,
+        cmap=sns.diverging_palette(220, 10, as_cmap=True),
+        interpolation="nearest",
+    )
+    ax.grid(False)
+    fig.colorbar(img, ax=ax)
+
+    if labels is not None and max(corr.shape) <= _MAX_HEATMAP_SIZE:
+        ax.set_yticks(np.arange(corr.shape[0]))
+        ax.set_yticklabels(labels[0])
+        ax.set_xticks(np.arange(corr.shape[1]))
+        ax.set_xticklabels(labels[1], rotation=90)
+
+    ax.set_title("Correlation Matrix")
+    fig.tight_layout()
+    return fig
+
+
 def confusion_matrix(
     cm: ArrayLike, labels: Optional[ArrayLike] = None, normalize: bool = True
 ) -> plt.Figure:
@@ -94,7 +144,9 @@ def confusion_matrix(
 
     """
     cm = np.array(cm)
-    cm_norm = cm / cm.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cm_norm = cm / cm.sum(axis=1, keepdims=True)
+    ticklabels = "auto" if labels is None else list(labels)
     fig, ax = plt.subplots()
     sns.heatmap(
         cm_norm,
@@ -107,6 +159,8 @@ def confusion_matrix(
         linewidths=0.2,
         cbar=True,
         square=True,
+        xticklabels=ticklabels,
+        yticklabels=ticklabels,
         ax=ax,
     )
     ax.set_xlabel("Predicted")
@@ -267,3 +321,418 @@ def pr_curve(pre: ArrayLike, rec: ArrayLike, auc: Optional[float] = None) -> plt
     ax.set_title("Precision-Recall Curve " + auc_str)
     fig.tight_layout()
     return fig
+
+
+def threshold_sweep(sweep: pd.DataFrame) -> plt.Figure:
+    """
+    Plot precision, recall, F1 score and cost against the decision threshold.
+
+    Parameters
+    ----------
+    sweep : pandas.DataFrame
+        Dataframe returned by `mlflow_extend.stats.threshold_sweep`.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> from mlflow_extend import stats
+        >>> y_true = [0, 0, 1, 1, 0, 1]
+        >>> y_score = [0.1, 0.4, 0.35, 0.8, 0.2, 0.6]
+        >>> sweep = stats.threshold_sweep(y_true, y_score)
+        >>> threshold_sweep(sweep)  # doctest: +ELLIPSIS
+        <Figure ... with 2 Axes>
+
+    """
+    fig, ax = plt.subplots()
+    for name in ["precision", "recall", "f1"]:
+        ax.plot(sweep["threshold"], sweep[name], label=name)
+    best_threshold = sweep.loc[sweep["f1"].idxmax(), "threshold"]
+    ax.axvline(best_threshold, color="k", linestyle=":")
+    ax.set_xlabel("Threshold")
+    ax.set_ylabel("Score")
+    ax.set_ylim(0, 1.05)
+
+    # Cost has a different scale, so it gets its own axis.
+    cost_ax = ax.twinx()
+    cost_ax.plot(sweep["threshold"], sweep["cost"], "C3--", label="cost")
+    cost_ax.set_ylabel("Cost")
+
+    lines = ax.get_lines()[:3] + cost_ax.get_lines()
+    ax.legend(lines, [line.get_label() for line in lines], loc="best")
+    ax.set_title("Threshold Sweep (best F1 at {:.3f})".format(best_threshold))
+    fig.tight_layout()
+    return fig
+
+
+def _calibration_bins(
+    y_true: Optional[ArrayLike],
+    y_prob: Optional[ArrayLike],
+    n_bins: int,
+    bins: Optional[stats.CalibrationBins],
+) -> stats.CalibrationBins:
+    if bins is not None:
+        return bins
+    if y_true is None or y_prob is None:
+        raise ValueError("Either `bins` or both `y_true` and `y_prob` must be given.")
+    return stats.CalibrationBins(n_bins).update(y_true, y_prob)
+
+
+def calibration_curve(
+    y_true: Optional[ArrayLike] = None,
+    y_prob: Optional[ArrayLike] = None,
+    n_bins: int = 10,
+    bins: Optional[stats.CalibrationBins] = None,
+) -> plt.Figure:
+    """
+    Plot calibration curve (reliability diagram) and histogram of probabilities.
+
+    Parameters
+    ----------
+    y_true : array-like, default None
+        Binary labels.
+    y_prob : array-like, default None
+        Predicted probabilities of the positive class.
+    n_bins : int, default 10
+        Number of bins.
+    bins : mlflow_extend.stats.CalibrationBins, default None
+        Binned predictions, e.g. accumulated from batches. If given, `y_true`,
+        `y_prob` and `n_bins` are ignored.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> y_prob = np.linspace(0, 1, 101)
+        >>> y_true = y_prob > 0.5
+        >>> calibration_curve(y_true, y_prob)  # doctest: +ELLIPSIS
+        <Figure ... with 2 Axes>
+
+    """
+    bins = _calibration_bins(y_true, y_prob, n_bins, bins)
+    df = bins.to_frame()
+
+    fig, (ax, hist_ax) = plt.subplots(
+        2, sharex=True, gridspec_kw={"height_ratios": [3, 1]}
+    )
+    ax.plot(df["mean_prob"], df["frac_pos"], "o-")
+    ax.plot([0, 1], [0, 1], "k:")
+    ax.set_ylabel("Fraction of positives")
+    title = "Calibration Curve (ECE: {:.3f}, Brier: {:.3f})"
+    ax.set_title(title.format(bins.ece, bins.brier))
+
+    hist_ax.bar(df["lower"], df["count"], width=df["upper"] - df["lower"], align="edge")
+    hist_ax.set_xlabel("Mean predicted probability")
+    hist_ax.set_ylabel("Count")
+    hist_ax.set_xlim(0, 1)
+    fig.tight_layout()
+    return fig
+
+
+def _swarm_offsets(values: np.ndarray, num_bins: int = 50) -> np.ndarray:
+    """
+    Compute vertical offsets that spread points in dense regions like a beeswarm plot.
+    """
+    valid = ~np.isnan(values)
+    offsets = np.zeros(len(values))
+    if not valid.any():
+        return offsets
+
+    edges = np.histogram_bin_edges(values[valid], num_bins)
+    bins = np.digitize(values, edges[1:-1])
+    order = np.argsort(bins, kind="mergesort")
+    counts = np.bincount(bins, minlength=num_bins)
+    starts = np.cumsum(counts) - counts
+    # Rank of each point within its bin, alternating above and below the center.
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(len(values)) - starts[bins[order]]
+    signs = np.where(ranks % 2 == 0, 1, -1)
+    offsets = signs * ((ranks + 1) // 2) / max(counts.max(), 1)
+    return np.where(valid, offsets, 0)
+
+
+def attribution_summary(
+    summary: pd.DataFrame, sample: np.ndarray, limit: int = 20, max_points: int = 1000
+) -> plt.Figure:
+    """
+    Plot a beeswarm-style summary of per-sample attributions of the features with the
+    largest mean absolute attributions.
+
+    Parameters
+    ----------
+    summary : pandas.DataFrame
+        Summary returned by `mlflow_extend.stats.attribution_summary`.
+    sample : numpy.ndarray
+        Subsample of the attribution matrix returned together with `summary`.
+    limit : int, default 20
+        Maximum number of features to plot.
+    max_points : int, default 1000
+        Maximum number of points to plot per feature.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> from mlflow_extend import stats
+        >>> values = np.random.RandomState(0).randn(1000, 3) * [1, 2, 3]
+        >>> summary, sample = stats.attribution_summary(values, ["a", "b", "c"])
+        >>> attribution_summary(summary, sample)  # doctest: +ELLIPSIS
+        <Figure ... with 1 Axes>
+
+    """
+    # Plot the most important feature at the top.
+    order = np.argsort(summary["mean_abs"].to_numpy())[-limit:]
+    # The sample is stratified by row position, and evenly spaced rows keep it so.
+    rows = np.linspace(0, len(sample) - 1, min(max_points, len(sample))).astype(int)
+    sample = sample[rows]
+
+    num_features = len(order)
+    w, h = plt.rcParams["figure.figsize"]
+    h += 0.3 * num_features if num_features > 10 else 0
+
+    fig, ax = plt.subplots(figsize=(w, h))
+    for pos, col in enumerate(order):
+        values = sample[:, col]
+        y = pos + 0.4 * _swarm_offsets(values)
+        ax.scatter(values, y, c=values, cmap="coolwarm", s=6, alpha=0.7, linewidths=0)
+    ax.axvline(0, color="k", linewidth=0.5)
+    ax.set_yticks(np.arange(num_features))
+    ax.set_yticklabels(summary.index[order].astype(str))
+    ax.set_xlabel("Attribution")
+    ax.set_title("Attribution Summary")
+    fig.tight_layout()
+    return fig
+
+
+def histograms(
+    hists: Dict[Any, Tuple[np.ndarray, np.ndarray]], ncols: int = 4
+) -> plt.Figure:
+    """
+    Plot precomputed histograms in a grid.
+
+    Parameters
+    ----------
+    hists : dict
+        Mapping from names to pairs of counts and bin edges like the result of
+        `numpy.histogram`.
+    ncols : int, default 4
+        Number of columns of the grid.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> x = np.random.RandomState(0).randn(1000)
+        >>> hists = {"x": np.histogram(x), "exp(x)": np.histogram(np.exp(x))}
+        >>> histograms(hists)  # doctest: +ELLIPSIS
+        <Figure ... with 2 Axes>
+
+    """
+    ncols = max(min(ncols, len(hists)), 1)
+    nrows = max(-(-len(hists) // ncols), 1)
+    w, h = plt.rcParams["figure.figsize"]
+    fig, axes = plt.subplots(
+        nrows, ncols, figsize=(w / 2 * ncols, h / 2 * nrows), squeeze=False
+    )
+    for ax, (name, (counts, edges)) in zip(axes.flat, hists.items()):
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+        ax.set_title(str(name))
+    # Remove unused axes in the last row.
+    for i, ax in enumerate(axes.flat):
+        if i >= len(hists):
+            fig.delaxes(ax)
+    fig.tight_layout()
+    return fig
+
+
+def drift_heatmap(report: pd.DataFrame, limit: int = 30) -> plt.Figure:
+    """
+    Plot drift statistics of the columns with the largest drift as a heatmap.
+
+    Each statistic is colored relative to its maximum because the statistics have
+    different scales, and the cells are annotated with the values.
+
+    Parameters
+    ----------
+    report : pandas.DataFrame
+        Drift statistics (columns x statistics) returned by
+        `mlflow_extend.stats.drift`.
+    limit : int, default 30
+        Maximum number of columns to plot. Columns are ranked by the first statistic.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> report = pd.DataFrame(
+        ...     {"psi": [0.02, 0.4], "ks": [0.05, 0.3], "js": [0.01, 0.2]},
+        ...     index=["a", "b"],
+        ... )
+        >>> drift_heatmap(report)  # doctest: +ELLIPSIS
+        <Figure ... with 2 Axes>
+
+    """
+    report = report.sort_values(report.columns[0], ascending=False).head(limit)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        colors = report / report.max()
+
+    num_rows = len(report)
+    w, h = plt.rcParams["figure.figsize"]
+    h = max(h, 0.3 * num_rows + 1)
+
+    fig, ax = plt.subplots(figsize=(w, h))
+    sns.heatmap(
+        colors,
+        cmap="Reds",
+        vmin=0,
+        vmax=1,
+        annot=report.round(3).astype(str).to_numpy(),
+        fmt="s",
+        linewidths=0.2,
+        cbar_kws={"label": "Relative to max"},
+        yticklabels=report.index.astype(str),
+        ax=ax,
+    )
+    ax.set_title("Drift")
+    fig.tight_layout()
+    return fig
+
+
+# Curves are labeled in a legend only up to this number of curves.
+_MAX_LEGEND_ITEMS = 10
+
+
+def _plot_curves(
+    ax: plt.Axes, curves: Mapping[Any, Tuple[ArrayLike, ArrayLike]], cmap: str
+) -> None:
+    """
+    Draw (x, y) curves as a single `LineCollection`, which renders hundreds of curves
+    much faster than one `plot` call per curve.
+    """
+    segments = [
+        np.column_stack([np.asarray(x), np.asarray(y)]) for x, y in curves.values()
+    ]
+    colors = plt.get_cmap(cmap)(np.linspace(0, 1, max(len(segments), 1)))
+    alpha = 0.8 if len(segments) <= _MAX_LEGEND_ITEMS else 0.4
+    ax.add_collection(
+        LineCollection(segments, colors=colors, linewidths=1, alpha=alpha)
+    )
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1.05)
+
+    if 0 < len(segments) <= _MAX_LEGEND_ITEMS:
+        handles = [Line2D([], [], color=c) for c in colors]
+        ax.legend(
+            handles, [str(k) for k in curves], loc="lower right", fontsize="small"
+        )
+
+
+def roc_curves(
+    curves: Mapping[Any, Tuple[ArrayLike, ArrayLike]], cmap: str = "viridis"
+) -> plt.Figure:
+    """
+    Plot many ROC curves (e.g. of runs in a sweep) in a single axes.
+
+    Parameters
+    ----------
+    curves : mapping
+        Mapping from labels (e.g. run IDs) to pairs of false and true positive rates.
+        Labels are shown in a legend if there are at most 10 curves.
+    cmap : str, default "viridis"
+        Colormap to pick the curve colors from.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> fpr = np.linspace(0, 1, 11)
+        >>> curves = {i: (fpr, fpr ** (1 / i)) for i in range(1, 6)}
+        >>> roc_curves(curves)  # doctest: +ELLIPSIS
+        <Figure ... with 1 Axes>
+
+    """
+    fig, ax = plt.subplots()
+    _plot_curves(ax, curves, cmap)
+    ax.plot([0, 1], [0, 1], "k:")
+    ax.set_xlabel("FPR")
+    ax.set_ylabel("TPR")
+    ax.set_title("ROC Curves ({} curves)".format(len(curves)))
+    fig.tight_layout()
+    return fig
+
+
+def pr_curves(
+    curves: Mapping[Any, Tuple[ArrayLike, ArrayLike]], cmap: str = "viridis"
+) -> plt.Figure:
+    """
+    Plot many precision-recall curves (e.g. of runs in a sweep) in a single axes.
+
+    Parameters
+    ----------
+    curves : mapping
+        Mapping from labels (e.g. run IDs) to pairs of precision and recall. Labels are
+        shown in a legend if there are at most 10 curves.
+    cmap : str, default "viridis"
+        Colormap to pick the curve colors from.
+
+    Returns
+    -------
+    matplotlib.pyplot.Figure
+        Figure object.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        >>> rec = np.linspace(0, 1, 11)
+        >>> curves = {i: (1 - rec ** i, rec) for i in range(1, 6)}
+        >>> pr_curves(curves)  # doctest: +ELLIPSIS
+        <Figure ... with 1 Axes>
+
+    """
+    # Recall goes on the x-axis as in `pr_curve`.
+    curves = {k: (rec, pre) for k, (pre, rec) in curves.items()}
+    fig, ax = plt.subplots()
+    _plot_curves(ax, curves, cmap)
+    ax.set_xlabel("Recall")
+    ax.set_ylabel("Precision")
+    ax.set_title("Precision-Recall Curves ({} curves)".format(len(curves)))
+    fig.tight_layout()
+    return fig
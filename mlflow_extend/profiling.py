@@ -0,0 +1,351 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "QuantileSketch",
+    "HyperLogLog",
+    "DataProfile",
+]
+
+
+def _add_counts(counts: pd.Series, keys: np.ndarray) -> pd.Series:
+    if len(keys) == 0:
+        return counts
+    uniq, num = np.unique(keys, return_counts=True)
+    return counts.add(pd.Series(num, index=uniq), fill_value=0).astype(np.int64)
+
+
+class QuantileSketch:
+    """
+    Mergeable sketch of approximate quantiles with a bounded relative error.
+
+    Values are counted in buckets with logarithmically growing widths (as in
+    DDSketch), so every quantile is accurate to within `relative_accuracy` of the true
+    value, and the number of buckets grows only with the logarithm of the value range.
+    Sketches of disjoint data are merged by adding the bucket counts.
+
+    Parameters
+    ----------
+    relative_accuracy : float, default 0.01
+        Maximum relative error of quantiles.
+
+    Examples
+    --------
+    >>> sketch = QuantileSketch().update(np.arange(1, 1001))
+    >>> sketch.quantile([0.5, 0.99]).round()
+    array([498., 983.])
+
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.count = 0
+        self.zero_count = 0
+        self.positive = pd.Series(dtype=np.int64)
+        self.negative = pd.Series(dtype=np.int64)
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(values) / np.log(self.gamma)).astype(np.int64)
+
+    def update(self, values: Any) -> "QuantileSketch":
+        """
+        Add values. NaNs and infinite values are ignored.
+        """
+        x = np.asarray(values, dtype=np.float64)
+        x = x[np.isfinite(x)]
+        tiny = np.finfo(np.float64).tiny
+        pos = x[x > tiny]
+        neg = -x[x < -tiny]
+        self.positive = _add_counts(self.positive, self._keys(pos))
+        self.negative = _add_counts(self.negative, self._keys(neg))
+        self.zero_count += len(x) - len(pos) - len(neg)
+        self.count += len(x)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Add the counts of another sketch with the same relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies.")
+
+        self.positive = self.positive.add(other.positive, fill_value=0).astype(np.int64)
+        self.negative = self.negative.add(other.negative, fill_value=0).astype(np.int64)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _buckets(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return representative values and counts of the buckets in ascending order.
+        """
+
+        def to_values(keys: np.ndarray) -> np.ndarray:
+            return 2 * self.gamma ** keys.astype(np.float64) / (self.gamma + 1)
+
+        # Negative buckets are ordered by descending magnitude.
+        neg = self.negative.iloc[::-1]
+        values = np.concatenate(
+            [-to_values(neg.index.to_numpy()), [0.0], to_values(self.positive.index)]
+        )
+        counts = np.concatenate([neg.to_numpy(), [self.zero_count], self.positive])
+        return values, counts
+
+    def quantile(self, q: Any) -> Any:
+        """
+        Return approximate quantiles, or NaN if the sketch is empty.
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)
+
+        values, counts = self._buckets()
+        ranks = np.asarray(q) * (self.count - 1)
+        idx = np.searchsorted(np.cumsum(counts), ranks, side="right")
+        return values[idx]
+
+    def histogram(
+        self, bins: int = 30, range: Optional[Tuple[float, float]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return approximate histogram counts and bin edges like `numpy.histogram`.
+        """
+        values, counts = self._buckets()
+        if range is not None:
+            values = np.clip(values, *range)
+        return np.histogram(values, bins, range, weights=counts)
+
+
+class HyperLogLog:
+    """
+    Mergeable sketch of the approximate number of distinct values (HyperLogLog).
+
+    The memory usage is ``2 ** precision`` bytes regardless of the number of values,
+    and the standard error is about ``1.04 / sqrt(2 ** precision)``. Sketches are
+    merged by taking the element-wise maximum of the registers.
+
+    Parameters
+    ----------
+    precision : int, default 14
+        Number of bits used to select a register.
+
+    Examples
+    --------
+    >>> hll = HyperLogLog().update(pd.Series(np.arange(10000) % 3000))
+    >>> round(hll.estimate(), -2)
+    3000.0
+
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values: Any) -> "HyperLogLog":
+        """
+        Add values of any type hashable by pandas. Pass non-null values only.
+        """
+        h = pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+        if len(h) == 0:
+            return self
+
+        p = self.precision
+        idx = (h >> np.uint64(64 - p)).astype(np.int64)
+        w = h << np.uint64(p)
+
+        # Count the leading zeros of the remaining bits. Each 32-bit half is exactly
+        # representable as a float, so log2 gives the exact position of the top bit.
+        hi = (w >> np.uint64(32)).astype(np.float64)
+        lo = (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        with np.errstate(divide="ignore"):
+            zeros = np.where(
+                hi > 0,
+                31 - np.floor(np.log2(hi)),
+                np.where(lo > 0, 63 - np.floor(np.log2(lo)), 64),
+            )
+        rank = np.minimum(zeros + 1, 64 - p + 1).astype(np.int64)
+
+        # Keys are sorted, so the last key of each register holds its maximum rank.
+        keys = np.unique(idx * 64 + rank)
+        last = np.r_[keys[1:] // 64 != keys[:-1] // 64, True]
+        reg, rank = keys[last] // 64, keys[last] % 64
+        self.registers[reg] = np.maximum(self.registers[reg], rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Add the registers of another sketch with the same precision.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precisions.")
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        """
+        Return the approximate number of distinct values.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m ** 2 / np.sum(2.0 ** -self.registers.astype(np.float64))
+        num_zeros = np.count_nonzero(self.registers == 0)
+        # Use linear counting for small cardinalities where HyperLogLog is biased.
+        if estimate <= 2.5 * m and num_zeros > 0:
+            estimate = m * np.log(m / num_zeros)
+        return float(estimate)
+
+
+def _ordered_union(a: pd.Index, b: pd.Index) -> pd.Index:
+    # `Index.union` sorts the result, which would reorder the columns.
+    return a.append(b[~b.isin(a)])
+
+
+class DataProfile:
+    """
+    Mergeable profile of dataframe columns computed in a single streaming pass.
+
+    Each call of `update` processes a chunk with vectorized operations and only keeps
+    fixed-size summaries: counts, nulls, min, max, mean and variance (merged with
+    Chan's parallel algorithm), a `QuantileSketch` of each numeric column and a
+    `HyperLogLog` of each column. Profiles built by parallel workers (e.g. returned
+    from a process pool) are combined with `merge`.
+
+    Parameters
+    ----------
+    relative_accuracy : float, default 0.01
+        Relative accuracy of quantiles.
+    precision : int, default 14
+        Precision of distinct counts.
+
+    Examples
+    --------
+    >>> df = pd.DataFrame({'a': [1.0, 2.0, None, 4.0], 'b': ['x', 'y', 'x', 'z']})
+    >>> left = DataProfile().update(df.iloc[:2])
+    >>> right = DataProfile().update(df.iloc[2:])
+    >>> left.merge(right).to_frame(quantiles=[0.5]).round(1)
+       count  nulls  distinct  min  max  mean  var  q50
+    a      3      1       3.0  1.0  4.0   2.3  2.3  2.0
+    b      4      0       3.0  NaN  NaN   NaN  NaN  NaN
+
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, precision: int = 14):
+        self.relative_accuracy = relative_accuracy
+        self.precision = precision
+        self.counts = pd.DataFrame(columns=["count", "nulls"], dtype=np.int64)
+        self.moments = pd.DataFrame(columns=["count", "min", "max", "mean", "m2"])
+        self.sketches: Dict[Any, QuantileSketch] = {}
+        self.distinct: Dict[Any, HyperLogLog] = {}
+
+    def update(self, df: pd.DataFrame) -> "DataProfile":
+        """
+        Add a chunk of rows.
+        """
+        chunk = DataProfile(self.relative_accuracy, self.precision)
+        chunk.counts = pd.DataFrame({"count": df.count(), "nulls": df.isna().sum()})
+
+        num = df.select_dtypes("number")
+        count = num.count()
+        chunk.moments = pd.DataFrame(
+            {
+                "count": count,
+                "min": num.min(),
+                "max": num.max(),
+                "mean": num.mean(),
+                "m2": num.var(ddof=0) * count,
+            }
+        )
+        for col in num.columns:
+            sketch = QuantileSketch(self.relative_accuracy)
+            chunk.sketches[col] = sketch.update(num[col].to_numpy())
+        for col in df.columns:
+            hll = HyperLogLog(self.precision)
+            chunk.distinct[col] = hll.update(df[col].dropna())
+
+        return self.merge(chunk)
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """
+        Add another profile of disjoint rows.
+        """
+        columns = _ordered_union(self.counts.index, other.counts.index)
+        self.counts = self.counts.reindex(columns, fill_value=0) + other.counts.reindex(
+            columns, fill_value=0
+        )
+
+        index = _ordered_union(self.moments.index, other.moments.index)
+        a = self.moments.reindex(index).astype(np.float64)
+        b = other.moments.reindex(index).astype(np.float64)
+        na, nb = a["count"].fillna(0), b["count"].fillna(0)
+        n = na + nb
+        delta = (b["mean"] - a["mean"]).fillna(0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.moments = pd.DataFrame(
+                {
+                    "count": n,
+                    "min": np.fmin(a["min"], b["min"]),
+                    "max": np.fmax(a["max"], b["max"]),
+                    "mean": (na * a["mean"].fillna(0) + nb * b["mean"].fillna(0)) / n,
+                    "m2": a["m2"].fillna(0)
+                    + b["m2"].fillna(0)
+                    + delta ** 2 * na * nb / n,
+                }
+            )
+
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = sketch
+        for col, hll in other.distinct.items():
+            if col in self.distinct:
+                self.distinct[col].merge(hll)
+            else:
+                self.distinct[col] = hll
+        return self
+
+    def histograms(self, bins: int = 30) -> Dict[Any, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Return approximate histogram counts and bin edges of numeric columns.
+        """
+        return {
+            col: sketch.histogram(bins, tuple(self.moments.loc[col, ["min", "max"]]))
+            for col, sketch in self.sketches.items()
+            if sketch.count > 0
+        }
+
+    def to_frame(
+        self, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)
+    ) -> pd.DataFrame:
+        """
+        Return the profile as a dataframe with one row per column. Statistics that
+        don't apply to a column (e.g. the mean of a string column) are NaN.
+        """
+        columns = self.counts.index
+        moments = self.moments.reindex(columns)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = moments["m2"] / (moments["count"] - 1)
+
+        profile = pd.DataFrame(
+            {
+                "count": self.counts["count"],
+                "nulls": self.counts["nulls"],
+                "distinct": [self.distinct[col].estimate() for col in columns],
+                "min": moments["min"],
+                "max": moments["max"],
+                "mean": moments["mean"],
+                "var": var,
+            },
+            index=columns,
+        )
+        qs = np.asarray(quantiles)
+        values = np.full((len(columns), len(qs)), np.nan)
+        for i, col in enumerate(columns):
+            if col in self.sketches:
+                values[i] = self.sketches[col].quantile(qs)
+        for q, value in zip(qs, values.T):
+            profile["q{:g}".format(q * 100)] = value
+        return profile
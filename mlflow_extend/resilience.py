@@ -0,0 +1,346 @@
+import concurrent.futures
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import mlflow
+import numpy as np
+
+from mlflow_extend import spool
+from mlflow_extend.utils import call_with_retries, is_transient_error
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "UploadTimeoutError",
+    "UploadStats",
+    "ResilientUploader",
+    "configure_uploads",
+    "get_uploader",
+]
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because the circuit breaker is open.
+    """
+
+
+class UploadTimeoutError(TimeoutError):
+    """
+    Raised when an upload attempt exceeds the timeout.
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that stops calling a degraded service.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected for `reset_timeout` seconds. Then a single trial call is let through
+    (half-open): the circuit closes if it succeeds and opens again if it fails.
+
+    Parameters
+    ----------
+    failure_threshold : int, default 5
+        Number of consecutive failures that opens the circuit.
+    reset_timeout : float, default 60.0
+        Number of seconds to wait before letting a trial call through.
+
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._num_failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """
+        One of "closed", "open" and "half-open".
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """
+        Return whether a call is allowed. In the half-open state, only the first
+        caller is allowed until it reports the result.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Let a single trial call through and keep the others out until it ends.
+            self._opened_at = time.monotonic()
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._num_failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._num_failures += 1
+            threshold_reached = self._num_failures >= self.failure_threshold
+            if self._opened_at is not None or threshold_reached:
+                self._opened_at = time.monotonic()
+
+
+class UploadStats:
+    """
+    Thread-safe counters and latency samples of artifact uploads.
+
+    Parameters
+    ----------
+    max_samples : int, default 10000
+        Number of most recent latency samples to keep for percentiles.
+
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=max_samples)
+        self.uploads = 0
+        self.failures = 0
+        self.retries = 0
+        self.fallbacks = 0
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Return the counters and the 50th, 90th and 99th percentiles of the upload
+        latency in seconds. The result can be logged with `log_metrics_flatten`.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            summary: Dict[str, float] = {
+                "uploads": self.uploads,
+                "failures": self.failures,
+                "retries": self.retries,
+                "fallbacks": self.fallbacks,
+            }
+        for q in [50, 90, 99]:
+            value = np.percentile(latencies, q) if len(latencies) > 0 else 0.0
+            summary["latency_p{}".format(q)] = float(value)
+        return summary
+
+
+def _call_with_timeout(func: Callable[[], T], timeout: Optional[float]) -> T:
+    if timeout is None:
+        return func()
+
+    # A thread can't be killed, so a timed out call keeps running in the background.
+    executor = ThreadPoolExecutor(1)
+    try:
+        return executor.submit(func).result(timeout)
+    except concurrent.futures.TimeoutError:
+        raise UploadTimeoutError("Timed out after {} seconds.".format(timeout))
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _upload_private_copy(
+    client: mlflow.tracking.MlflowClient,
+    run_id: str,
+    local_path: str,
+    artifact_path: Optional[str],
+) -> None:
+    """
+    Upload a hard link (or a copy) of a file that is removed when the upload ends, so
+    that an upload that timed out can keep reading it after the caller removes the
+    original file.
+    """
+    tmpdir = tempfile.mkdtemp()
+    try:
+        private_path = os.path.join(tmpdir, os.path.basename(local_path))
+        try:
+            os.link(local_path, private_path)
+        except OSError:
+            shutil.copy2(local_path, private_path)
+        client.log_artifact(run_id, private_path, artifact_path)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _should_retry(error: Exception) -> bool:
+    # A timed out upload may still be running, so it's not retried to avoid two
+    # concurrent uploads of the same file.
+    return is_transient_error(error) and not isinstance(error, UploadTimeoutError)
+
+
+class ResilientUploader:
+    """
+    Upload artifacts with retries, per-call timeouts and a circuit breaker.
+
+    Only transient errors (see `mlflow_extend.utils.is_transient_error`) are retried.
+    An upload that times out keeps running in the background on a private link to the
+    file, and isn't retried.
+
+    When an upload still fails after all retries, or the circuit breaker is open, the
+    artifact is written to a local journal in `fallback_dir` (see
+    `mlflow_extend.spool`) that can be uploaded later with ``mlflow_extend replay``.
+    Without `fallback_dir`, the error is raised instead.
+
+    Parameters
+    ----------
+    max_retries : int, default 3
+        Maximum number of retries for each upload.
+    backoff : float, default 0.5
+        Upper bound of the first backoff in seconds. Doubles on every retry.
+    timeout : float, default None
+        Timeout of each upload attempt in seconds. If ``None``, no timeout is set.
+    breaker : CircuitBreaker, default None
+        Circuit breaker. If unspecified, a breaker with the default settings is used
+        when `fallback_dir` is specified, and no breaker is used otherwise, so that
+        uploads are never rejected without a fallback.
+    fallback_dir : str, default None
+        Journal directory to spool artifacts to when uploads fail.
+
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        fallback_dir: Optional[str] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        if breaker is None and fallback_dir is not None:
+            breaker = CircuitBreaker()
+        self.breaker = breaker
+        self.fallback_dir = fallback_dir
+        self.stats = UploadStats()
+        self._fallback: Optional[spool.Journal] = None
+        self._lock = threading.Lock()
+
+    def _spool(
+        self,
+        run_id: str,
+        local_path: str,
+        artifact_path: Optional[str],
+        error: Exception,
+    ) -> None:
+        if self.fallback_dir is None:
+            raise error
+
+        with self._lock:
+            if self._fallback is None:
+                self._fallback = spool.Journal(self.fallback_dir, fsync_every=1)
+        self._fallback.log_artifact(run_id, local_path, artifact_path)
+        self.stats.increment("fallbacks")
+
+    def upload(
+        self, run_id: str, local_path: str, artifact_path: Optional[str] = None
+    ) -> None:
+        """
+        Upload a local file to the artifact store of the given run.
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            error = CircuitOpenError("Artifact store is unavailable.")
+            return self._spool(run_id, local_path, artifact_path, error)
+
+        client = mlflow.tracking.MlflowClient()
+
+        def upload_once() -> None:
+            start = time.perf_counter()
+            if self.timeout is None:
+                client.log_artifact(run_id, local_path, artifact_path)
+            else:
+                _call_with_timeout(
+                    lambda: _upload_private_copy(
+                        client, run_id, local_path, artifact_path
+                    ),
+                    self.timeout,
+                )
+            self.stats.record_latency(time.perf_counter() - start)
+
+        def on_retry(attempt: int, error: Exception) -> None:
+            self.stats.increment("retries")
+
+        try:
+            call_with_retries(
+                upload_once,
+                self.max_retries,
+                self.backoff,
+                on_retry=on_retry,
+                retry_on=_should_retry,
+            )
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            self.stats.increment("failures")
+            return self._spool(run_id, local_path, artifact_path, e)
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self.stats.increment("uploads")
+
+    def close(self) -> None:
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+_uploader = ResilientUploader()
+
+
+def configure_uploads(**kwargs: Any) -> ResilientUploader:
+    """
+    Replace the uploader used by the artifact logging functions.
+
+    Parameters
+    ----------
+    **kwargs : dict
+        Keyword arguments passed to `ResilientUploader`.
+
+    Returns
+    -------
+    ResilientUploader
+        New uploader.
+
+    Examples
+    --------
+    >>> uploader = configure_uploads(max_retries=5, timeout=30)
+    >>> get_uploader() is uploader
+    True
+    >>> _ = configure_uploads()
+
+    """
+    global _uploader
+
+    _uploader.close()
+    _uploader = ResilientUploader(**kwargs)
+    return _uploader
+
+
+def get_uploader() -> ResilientUploader:
+    """
+    Get the uploader used by the artifact logging functions.
+    """
+    return _uploader
@@ -0,0 +1,310 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import mlflow
+import pandas as pd
+from mlflow.entities import Run
+
+from mlflow_extend.utils import flatten_dict
+
+__all__ = ["RunIndex"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_time INTEGER,
+    end_time INTEGER
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS runs_experiment ON runs (experiment_id, start_time);
+CREATE INDEX IF NOT EXISTS params_key ON params (key, value);
+CREATE INDEX IF NOT EXISTS metrics_key ON metrics (key, value);
+"""
+
+_ACTIVE_STATUSES = ("RUNNING", "SCHEDULED")
+
+MetricRange = Tuple[Optional[float], Optional[float]]
+
+
+def _search_runs_since(
+    client: mlflow.tracking.MlflowClient, experiment_id: str, start_time: Optional[int]
+) -> List[Run]:
+    """
+    Search runs started at or after `start_time`. Runs are ordered from the newest, so
+    paging stops at the first run older than `start_time`.
+    """
+    runs: List[Run] = []
+    page_token = None
+    while True:
+        page = client.search_runs(
+            [experiment_id],
+            order_by=["attributes.start_time DESC"],
+            page_token=page_token,
+        )
+        for run in page:
+            if start_time is not None and run.info.start_time < start_time:
+                return runs
+            runs.append(run)
+        page_token = page.token
+        if not page_token:
+            return runs
+
+
+class RunIndex:
+    """
+    Local SQLite index of the params and latest metrics of the runs in experiments.
+
+    Querying the index takes milliseconds even on experiments with many runs, unlike
+    `mlflow.search_runs`. Params and metrics are stored with their flattened keys
+    (see `log_params_flatten`), so runs can be queried by the parent keys as well.
+
+    `refresh` fetches runs started since the last refresh and runs that were still
+    active, so it only needs to be called again when new runs are expected. Deleted
+    runs stay in the index.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database. Created if it doesn't exist.
+    experiment_ids : list of str
+        Experiments to index.
+    sep : str, default "."
+        Key separator used to flatten the params and metrics.
+
+    Examples
+    --------
+    >>> expr_id = mlflow.get_or_create_experiment('run_index')
+    >>> with mlflow.start_run(experiment_id=expr_id) as run:
+    ...     mlflow.log_params_flatten({'model': {'objective': 'binary', 'depth': 3}})
+    ...     mlflow.log_metrics_flatten({'valid': {'auc': 0.9}})
+    >>> index = RunIndex(':memory:', [expr_id])
+    >>> index.refresh() >= 1
+    True
+    >>> run.info.run_id in index.query(params={'model': {'objective': 'binary'}})
+    True
+    >>> run.info.run_id in index.query(prefix='model', metrics={'valid.auc': (0.95, None)})
+    False
+    >>> index.to_frame(prefix='model').columns.tolist()
+    ['run_id', 'params.model.depth', 'params.model.objective']
+    >>> index.close()
+
+    """
+
+    def __init__(self, path: str, experiment_ids: List[str], sep: str = "."):
+        self.path = path
+        self.experiment_ids = experiment_ids
+        self.sep = sep
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, args: Iterable[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, list(args)).fetchall()
+
+    def refresh(self, max_workers: int = 8) -> int:
+        """
+        Update the index and return the number of fetched runs.
+
+        Parameters
+        ----------
+        max_workers : int, default 8
+            Maximum number of concurrent requests to re-fetch active runs.
+
+        Returns
+        -------
+        int
+            Number of fetched runs.
+
+        """
+        client = mlflow.tracking.MlflowClient()
+        runs: Dict[str, Run] = {}
+        for experiment_id in self.experiment_ids:
+            ((start_time,),) = self._execute(
+                "SELECT MAX(start_time) FROM runs WHERE experiment_id = ?",
+                [experiment_id],
+            )
+            # Runs started at the same time as the newest indexed run are fetched
+            # again because they may not have been created at the last refresh.
+            for run in _search_runs_since(client, experiment_id, start_time):
+                runs[run.info.run_id] = run
+
+        # Params and metrics of active runs may have changed since the last refresh.
+        active = self._execute(
+            "SELECT run_id FROM runs WHERE status IN (?, ?)", _ACTIVE_STATUSES
+        )
+        active_ids = [run_id for (run_id,) in active if run_id not in runs]
+        with ThreadPoolExecutor(max_workers) as executor:
+            for run in executor.map(client.get_run, active_ids):
+                runs[run.info.run_id] = run
+
+        self._upsert(list(runs.values()))
+        return len(runs)
+
+    def _upsert(self, runs: List[Run]) -> None:
+        run_rows = []
+        param_rows: List[Tuple[str, str, str]] = []
+        metric_rows: List[Tuple[str, str, float]] = []
+        for run in runs:
+            info = run.info
+            run_rows.append(
+                (
+                    info.run_id,
+                    info.experiment_id,
+                    info.status,
+                    info.start_time,
+                    info.end_time,
+                )
+            )
+            param_rows.extend((info.run_id, k, v) for k, v in run.data.params.items())
+            metric_rows.extend((info.run_id, k, v) for k, v in run.data.metrics.items())
+
+        run_ids = [(row[0],) for row in run_rows]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM params WHERE run_id = ?", run_ids)
+            self._conn.executemany("DELETE FROM metrics WHERE run_id = ?", run_ids)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)", run_rows
+            )
+            self._conn.executemany("INSERT INTO params VALUES (?, ?, ?)", param_rows)
+            self._conn.executemany("INSERT INTO metrics VALUES (?, ?, ?)", metric_rows)
+
+    def _prefix_condition(self, prefix: str) -> Tuple[str, List[str]]:
+        # A range on the key uses the index, unlike LIKE, and excludes keys that only
+        # share the leading characters (e.g. "model_name" for "model").
+        upper = self.sep[:-1] + chr(ord(self.sep[-1]) + 1)
+        condition = "key = ? OR (key >= ? AND key < ?)"
+        return condition, [prefix, prefix + self.sep, prefix + upper]
+
+    def query(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Dict[str, MetricRange]] = None,
+        prefix: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Return the IDs of runs that match all the conditions, newest first.
+
+        Parameters
+        ----------
+        params : dict, default None
+            (Nested) dictionary of params. Runs must have the same values. A value of
+            ``None`` only requires the param to exist.
+        metrics : dict, default None
+            Mapping from metric keys to inclusive ranges ``(min, max)``. Either bound
+            can be ``None``.
+        prefix : str, default None
+            Runs must have a param or metric with this key or a key under it.
+
+        Returns
+        -------
+        list of str
+            Run IDs.
+
+        """
+        conditions = []
+        args: List[Any] = []
+        for key, value in flatten_dict(params or {}, sep=self.sep).items():
+            if value is None:
+                conditions.append("run_id IN (SELECT run_id FROM params WHERE key = ?)")
+                args.append(key)
+            else:
+                conditions.append(
+                    "run_id IN (SELECT run_id FROM params WHERE key = ? AND value = ?)"
+                )
+                args.extend([key, str(value)])
+
+        for key, (low, high) in (metrics or {}).items():
+            condition = "key = ?"
+            args.append(key)
+            if low is not None:
+                condition += " AND value >= ?"
+                args.append(low)
+            if high is not None:
+                condition += " AND value <= ?"
+                args.append(high)
+            conditions.append(
+                "run_id IN (SELECT run_id FROM metrics WHERE {})".format(condition)
+            )
+
+        if prefix is not None:
+            condition, prefix_args = self._prefix_condition(prefix)
+            conditions.append(
+                "run_id IN (SELECT run_id FROM params WHERE {0} "
+                "UNION SELECT run_id FROM metrics WHERE {0})".format(condition)
+            )
+            args.extend(prefix_args * 2)
+
+        sql = "SELECT run_id FROM runs"
+        if len(conditions) > 0:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY start_time DESC, run_id"
+        return [run_id for (run_id,) in self._execute(sql, args)]
+
+    def to_frame(
+        self, run_ids: Optional[List[str]] = None, prefix: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Return params and metrics as a wide dataframe like `mlflow.search_runs`.
+
+        Parameters
+        ----------
+        run_ids : list of str, default None
+            Runs to include (e.g. the result of `query`). If unspecified, all the
+            indexed runs are included.
+        prefix : str, default None
+            If specified, only params and metrics with this key or a key under it are
+            included.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Dataframe with the "run_id" column, params prefixed with "params." and
+            metrics prefixed with "metrics.".
+
+        """
+        if run_ids is None:
+            run_ids = [
+                row[0]
+                for row in self._execute(
+                    "SELECT run_id FROM runs ORDER BY start_time DESC, run_id"
+                )
+            ]
+
+        condition = "1"
+        args: List[str] = []
+        if prefix is not None:
+            condition, args = self._prefix_condition(prefix)
+
+        frames = [pd.DataFrame({"run_id": run_ids})]
+        for table in ["params", "metrics"]:
+            sql = "SELECT run_id, key, value FROM {} WHERE {}".format(table, condition)
+            with self._lock:
+                long = pd.read_sql_query(sql, self._conn, params=args)
+            long = long[long["run_id"].isin(run_ids)]
+            wide = long.pivot(index="run_id", columns="key", values="value")
+            wide = wide.add_prefix(table + ".").reindex(run_ids)
+            frames.append(wide.reset_index(drop=True))
+
+        df = pd.concat(frames, axis=1)
+        df.columns.name = None
+        return df
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,350 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.utils.validation import MAX_METRICS_PER_BATCH, MAX_PARAMS_TAGS_PER_BATCH
+
+from mlflow_extend.utils import call_with_retries, chunks, is_transient_error
+
+__all__ = [
+    "Journal",
+    "start_spool",
+    "stop_spool",
+    "get_spool",
+    "spool",
+    "replay",
+]
+
+JOURNAL_FILE = "journal.jsonl"
+REPLAYED_FILE = "replayed.txt"
+ARTIFACTS_DIR = "artifacts"
+
+
+class Journal:
+    """
+    Append-only write-ahead journal of params, metrics and artifacts.
+
+    The journal is a directory that contains "journal.jsonl" (one JSON record per line)
+    and the logged artifact files. Writes are flushed to the disk with ``fsync`` once
+    every `fsync_every` records or `fsync_interval` seconds, whichever comes first.
+    There is no timer: the interval is checked when a record is appended, so records
+    written before an idle period are synced by the next append or `close`.
+
+    Parameters
+    ----------
+    path : str
+        Journal directory. Created if it doesn't exist.
+    fsync_every : int, default 100
+        Maximum number of records to write between two fsync calls.
+    fsync_interval : float, default 1.0
+        Maximum number of seconds between two fsync calls.
+
+    """
+
+    def __init__(self, path: str, fsync_every: int = 100, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(os.path.join(path, ARTIFACTS_DIR), exist_ok=True)
+        self._file = open(os.path.join(path, JOURNAL_FILE), "a")
+        self._lock = threading.Lock()
+        self._num_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._num_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record: Dict[str, Any]) -> str:
+        """
+        Append a record to the journal and return its ID.
+        """
+        record = dict(record, id=uuid.uuid4().hex, timestamp=int(time.time() * 1000))
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._num_unsynced += 1
+            if (
+                self._num_unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+        return record["id"]
+
+    def log_params(self, run_id: str, params: Dict[str, Any]) -> None:
+        data = {k: str(v) for k, v in params.items()}
+        self.append({"type": "params", "run_id": run_id, "data": data})
+
+    def log_metrics(
+        self, run_id: str, metrics: Dict[str, float], step: Optional[int] = None
+    ) -> None:
+        data = {"metrics": {k: float(v) for k, v in metrics.items()}, "step": step or 0}
+        self.append({"type": "metrics", "run_id": run_id, "data": data})
+
+    def log_artifact(
+        self, run_id: str, local_path: str, artifact_path: Optional[str] = None
+    ) -> None:
+        # Give each artifact its own directory to keep the original file name.
+        dst_dir = os.path.join(self.path, ARTIFACTS_DIR, uuid.uuid4().hex)
+        os.makedirs(dst_dir)
+        dst = os.path.join(dst_dir, os.path.basename(local_path))
+        shutil.copy2(local_path, dst)
+        data = {
+            "local_path": os.path.relpath(dst, self.path),
+            "artifact_path": artifact_path,
+        }
+        self.append({"type": "artifact", "run_id": run_id, "data": data})
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over records in a journal directory.
+    """
+    with open(os.path.join(path, JOURNAL_FILE)) as f:
+        for line in f:
+            # The last line can be incomplete if the process crashed while writing it.
+            if line.endswith("\n"):
+                yield json.loads(line)
+
+
+_active_spool: Optional[Journal] = None
+
+
+def start_spool(path: str, **kwargs: Any) -> Journal:
+    """
+    Start spooling params, metrics and artifacts logged by `mlflow_extend.logging` to
+    a local journal instead of sending them to the tracking server. Use `replay` or
+    ``mlflow_extend replay`` to upload the journal later.
+
+    Parameters
+    ----------
+    path : str
+        Journal directory.
+    **kwargs : dict
+        Keyword arguments passed to `Journal`.
+
+    Returns
+    -------
+    Journal
+        Active journal.
+
+    """
+    global _active_spool
+
+    stop_spool()
+    _active_spool = Journal(path, **kwargs)
+    return _active_spool
+
+
+def stop_spool() -> None:
+    """
+    Stop spooling and close the active journal.
+    """
+    global _active_spool
+
+    if _active_spool is not None:
+        _active_spool.close()
+        _active_spool = None
+
+
+def get_spool() -> Optional[Journal]:
+    """
+    Get the active journal, or ``None`` if spooling is disabled.
+    """
+    return _active_spool
+
+
+@contextmanager
+def spool(path: str, **kwargs: Any) -> Generator[Journal, None, None]:
+    """
+    Context manager version of `start_spool`.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> path = tempfile.mkdtemp()
+    >>> with mlflow.start_run() as run:
+    ...     with spool(path):
+    ...         mlflow.log_params_flatten({'a': {'b': 0}})
+    >>> mlflow.get_run(run.info.run_id).data.params
+    {}
+    >>> replay(path)
+    1
+    >>> mlflow.get_run(run.info.run_id).data.params
+    {'a.b': '0'}
+
+    """
+    journal = start_spool(path, **kwargs)
+    try:
+        yield journal
+    finally:
+        stop_spool()
+
+
+def _replay_batch(
+    client: mlflow.tracking.MlflowClient,
+    run_id: str,
+    records: List[Dict[str, Any]],
+    sent: Dict[str, int],
+    mark_replayed: Callable[[List[str]], None],
+    max_retries: int,
+    backoff: float,
+) -> None:
+    """
+    Send params and metrics records in requests within the server limits, and mark
+    progress after each request. `sent` maps the IDs of partially sent records to the
+    number of their params or metrics already sent, which are skipped.
+    """
+    # (record ID, number of items in the record, item) of items left to send.
+    params: List[Tuple[str, int, Any]] = []
+    metrics: List[Tuple[str, int, Any]] = []
+    for record in records:
+        data = record["data"]
+        if record["type"] == "params":
+            items: List[Any] = [Param(k, v) for k, v in data.items()]
+            entities = params
+        else:
+            items = [
+                Metric(k, v, record["timestamp"], data["step"])
+                for k, v in data["metrics"].items()
+            ]
+            entities = metrics
+        total = len(items)
+        offset = sent.get(record["id"], 0)
+        items = items[offset:]
+        # Records without items left are completed by an empty entry.
+        entities.extend((record["id"], total, item) for item in items or [None])
+
+    for kind, entities, size in [
+        ("params", params, MAX_PARAMS_TAGS_PER_BATCH),
+        ("metrics", metrics, MAX_METRICS_PER_BATCH),
+    ]:
+        for batch in chunks(entities, size):
+            batch_items = [item for _, _, item in batch if item is not None]
+            if len(batch_items) > 0:
+                call_with_retries(
+                    lambda: client.log_batch(run_id, **{kind: batch_items}),
+                    max_retries,
+                    backoff,
+                    retry_on=is_transient_error,
+                )
+
+            num_items = {}
+            for record_id, total, item in batch:
+                if item is not None:
+                    sent[record_id] = sent.get(record_id, 0) + 1
+                num_items[record_id] = total
+            # A record split across requests is marked with the number of its items
+            # sent so far ("<id>:<count>"), and with its ID once all of them are sent.
+            mark_replayed(
+                [
+                    record_id
+                    if sent.get(record_id, 0) >= total
+                    else "{}:{}".format(record_id, sent[record_id])
+                    for record_id, total in num_items.items()
+                ]
+            )
+
+
+def replay(
+    path: str,
+    tracking_uri: Optional[str] = None,
+    max_retries: int = 5,
+    backoff: float = 1.0,
+) -> int:
+    """
+    Upload a journal to the tracking server.
+
+    Params and metrics are uploaded in batches. The progress is stored in
+    "replayed.txt" in the journal directory after every request, so replaying the
+    same journal again (e.g. after a failure) doesn't log anything twice. The runs
+    must exist on the tracking server.
+
+    Parameters
+    ----------
+    path : str
+        Journal directory.
+    tracking_uri : str, default None
+        Tracking URI to upload to. If unspecified, the current tracking URI is used.
+    max_retries : int, default 5
+        Maximum number of retries for each request. Only transient errors (e.g.
+        connection errors and 5xx responses) are retried.
+    backoff : float, default 1.0
+        Initial backoff in seconds between retries. Doubles on every retry.
+
+    Returns
+    -------
+    int
+        Number of replayed records.
+
+    """
+    client = mlflow.tracking.MlflowClient(tracking_uri)
+    replayed_path = os.path.join(path, REPLAYED_FILE)
+    replayed = set()
+    sent: Dict[str, int] = {}
+    if os.path.exists(replayed_path):
+        with open(replayed_path) as f:
+            for line in f.read().split():
+                if ":" in line:
+                    record_id, count = line.split(":")
+                    sent[record_id] = max(sent.get(record_id, 0), int(count))
+                else:
+                    replayed.add(line)
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in read_journal(path):
+        if record["id"] not in replayed:
+            groups.setdefault(record["run_id"], []).append(record)
+
+    num_replayed = 0
+    with open(replayed_path, "a") as replayed_file:
+
+        def mark_replayed(lines: List[str]) -> None:
+            nonlocal num_replayed
+
+            replayed_file.write("".join(line + "\n" for line in lines))
+            replayed_file.flush()
+            os.fsync(replayed_file.fileno())
+            num_replayed += sum(":" not in line for line in lines)
+
+        for run_id, records in groups.items():
+            batch: List[Dict[str, Any]] = []
+            # Artifacts split params and metrics into batches to keep the logging order.
+            for record in records + [{"type": "end"}]:
+                if record["type"] in ["params", "metrics"]:
+                    batch.append(record)
+                    continue
+
+                _replay_batch(
+                    client, run_id, batch, sent, mark_replayed, max_retries, backoff
+                )
+                batch = []
+
+                if record["type"] == "artifact":
+                    data = record["data"]
+                    local_path = os.path.join(path, data["local_path"])
+                    call_with_retries(
+                        lambda: client.log_artifact(
+                            run_id, local_path, data["artifact_path"]
+                        ),
+                        max_retries,
+                        backoff,
+                        retry_on=is_transient_error,
+                    )
+                    mark_replayed([record["id"]])
+
+    return num_replayed
@@ -0,0 +1,702 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from mlflow_extend.typing import ArrayLike
+from mlflow_extend.utils import chunks
+
+__all__ = [
+    "CalibrationBins",
+    "corr",
+    "cluster_order",
+    "confusion_matrix",
+    "classification_report",
+    "threshold_sweep",
+    "attribution_summary",
+    "drift",
+]
+
+
+def corr(data: Union[pd.DataFrame, np.ndarray], block_size: int = 1024) -> np.ndarray:
+    """
+    Compute the Pearson correlation matrix of columns in float32.
+
+    The matrix is computed block by block with matrix multiplication, which is much
+    faster and lighter than `pandas.DataFrame.corr` on wide data. Missing values are
+    replaced with the column mean, and constant columns get NaN correlations.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        2D data (rows x columns). Non-numeric columns of a dataframe are ignored.
+    block_size : int, default 1024
+        Number of columns to process at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        Correlation matrix (columns x columns).
+
+    Examples
+    --------
+    >>> df = pd.DataFrame({'a': [1, 2, 3], 'b': [3, 1, 2]})
+    >>> corr(df).round(2)
+    array([[ 1. , -0.5],
+           [-0.5,  1. ]], dtype=float32)
+
+    """
+    if isinstance(data, pd.DataFrame):
+        data = data.select_dtypes("number")
+    else:
+        data = np.asarray(data)
+
+    # Normalize the columns block by block into a float32 matrix, so that only one
+    # block is held in float64 (to avoid losing precision when centering) at a time.
+    num_rows, num_cols = data.shape
+    x = np.empty((num_rows, num_cols), dtype=np.float32)
+    norm = np.empty(num_cols, dtype=np.float64)
+    for i in range(0, num_cols, block_size):
+        bi = slice(i, i + block_size)
+        if isinstance(data, pd.DataFrame):
+            block = data.iloc[:, bi].to_numpy(dtype=np.float64)
+        else:
+            block = data[:, bi].astype(np.float64)
+        mean = np.nanmean(block, axis=0)
+        block -= mean
+        block[np.isnan(block)] = 0
+        norm[bi] = np.sqrt((block ** 2).sum(axis=0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x[:, bi] = block / norm[bi]
+
+    num_cols = x.shape[1]
+    result = np.empty((num_cols, num_cols), dtype=np.float32)
+    for i in range(0, num_cols, block_size):
+        bi = slice(i, i + block_size)
+        for j in range(i, num_cols, block_size):
+            bj = slice(j, j + block_size)
+            # The matrix is symmetric, so only the upper blocks need to be computed.
+            block = x[:, bi].T @ x[:, bj]
+            result[bi, bj] = block
+            result[bj, bi] = block.T
+
+    np.clip(result, -1, 1, out=result)
+    result[np.diag_indices(num_cols)] = np.where(norm > 0, 1, np.nan)
+    return result
+
+
+def cluster_order(corr: np.ndarray, method: str = "average") -> np.ndarray:
+    """
+    Compute a column order that places correlated columns next to each other by
+    hierarchical clustering. Requires scipy.
+
+    Parameters
+    ----------
+    corr : numpy.ndarray
+        Correlation matrix.
+    method : str, default "average"
+        Linkage method passed to `scipy.cluster.hierarchy.linkage`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Column indices in the clustered order.
+
+    Examples
+    --------
+    >>> c = np.array([[1.0, 0.0, 0.9],
+    ...               [0.0, 1.0, 0.0],
+    ...               [0.9, 0.0, 1.0]])
+    >>> cluster_order(c)
+    array([1, 0, 2], dtype=int32)
+
+    """
+    try:
+        from scipy.cluster import hierarchy
+        from scipy.spatial.distance import squareform
+    except ImportError:
+        raise ImportError("scipy is required to cluster a correlation matrix.")
+
+    corr = np.nan_to_num(np.asarray(corr, dtype=np.float64))
+    dist = 1 - np.abs((corr + corr.T) / 2)
+    np.fill_diagonal(dist, 0)
+    linkage = hierarchy.linkage(squareform(dist, checks=False), method=method)
+    return hierarchy.leaves_list(linkage)
+
+
+def confusion_matrix(
+    y_true: ArrayLike,
+    y_pred: ArrayLike,
+    labels: Optional[ArrayLike] = None,
+    sparse: bool = False,
+) -> Any:
+    """
+    Compute a confusion matrix with rows for true labels and columns for predicted
+    labels.
+
+    Parameters
+    ----------
+    y_true : array-like
+        True labels.
+    y_pred : array-like
+        Predicted labels.
+    labels : array-like, default None
+        Labels in the order of rows and columns. Samples with other labels are ignored.
+        If unspecified, the sorted union of `y_true` and `y_pred` is used.
+    sparse : bool, default False
+        If True, return a `scipy.sparse.csr_matrix`, which keeps the memory usage
+        proportional to the number of distinct (true, predicted) pairs for huge label
+        spaces. Requires scipy.
+
+    Returns
+    -------
+    numpy.ndarray or scipy.sparse.csr_matrix
+        Confusion matrix (labels x labels).
+
+    Examples
+    --------
+    >>> confusion_matrix(["a", "b", "b"], ["a", "a", "b"])
+    array([[1, 0],
+           [1, 1]])
+
+    """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    if labels is None:
+        labels = np.union1d(y_true, y_pred)
+
+    index = pd.Index(labels)
+    rows = index.get_indexer(y_true)
+    cols = index.get_indexer(y_pred)
+    valid = (rows >= 0) & (cols >= 0)
+    rows, cols = rows[valid], cols[valid]
+    n = len(index)
+
+    if sparse:
+        try:
+            from scipy import sparse as sp
+        except ImportError:
+            raise ImportError("scipy is required to create a sparse confusion matrix.")
+
+        counts = np.ones(len(rows), dtype=np.int64)
+        # Duplicate entries are summed when converting to CSR.
+        return sp.coo_matrix((counts, (rows, cols)), shape=(n, n)).tocsr()
+
+    return np.bincount(rows * n + cols, minlength=n * n).reshape(n, n)
+
+
+def _safe_divide(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # Follow scikit-learn and use zero for undefined ratios (e.g. no predictions).
+    out = np.zeros(np.broadcast(a, b).shape, dtype=np.float64)
+    return np.divide(a, b, out=out, where=b != 0)
+
+
+def classification_report(cm: Any, labels: Optional[ArrayLike] = None) -> pd.DataFrame:
+    """
+    Compute precision, recall and F1 score of each class and their macro, micro and
+    weighted averages from a confusion matrix.
+
+    Parameters
+    ----------
+    cm : array-like or scipy.sparse matrix
+        Confusion matrix with rows for true labels and columns for predicted labels.
+    labels : array-like, default None
+        Label names. If unspecified, the positions are used.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with columns "precision", "recall", "f1" and "support" indexed by
+        the labels followed by "macro_avg", "micro_avg" and "weighted_avg".
+
+    Examples
+    --------
+    >>> classification_report([[1, 0], [1, 1]], labels=["a", "b"]).round(2)
+                  precision  recall    f1  support
+    a                  0.50    1.00  0.67        1
+    b                  1.00    0.50  0.67        2
+    macro_avg          0.75    0.75  0.67        3
+    micro_avg          0.67    0.67  0.67        3
+    weighted_avg       0.83    0.67  0.67        3
+
+    """
+    if hasattr(cm, "tocsr"):
+        # Avoid densifying a sparse matrix: only the diagonal and the sums are needed.
+        cm = cm.tocsr()
+        tp = cm.diagonal()
+        true_counts = np.asarray(cm.sum(axis=1)).ravel()
+        pred_counts = np.asarray(cm.sum(axis=0)).ravel()
+    else:
+        cm = np.asarray(cm)
+        tp = np.diagonal(cm)
+        true_counts = cm.sum(axis=1)
+        pred_counts = cm.sum(axis=0)
+
+    tp = tp.astype(np.float64)
+    precision = _safe_divide(tp, pred_counts)
+    recall = _safe_divide(tp, true_counts)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    scores = np.stack([precision, recall, f1], axis=1)
+
+    total = true_counts.sum()
+    micro_precision = _safe_divide(tp.sum(), pred_counts.sum())
+    micro_recall = _safe_divide(tp.sum(), total)
+    micro_f1 = _safe_divide(
+        2 * micro_precision * micro_recall, micro_precision + micro_recall
+    )
+    averages = np.array(
+        [
+            scores.mean(axis=0),
+            [micro_precision, micro_recall, micro_f1],
+            _safe_divide(true_counts @ scores, total),
+        ]
+    )
+
+    if labels is None:
+        labels = np.arange(len(tp))
+    index = list(labels) + ["macro_avg", "micro_avg", "weighted_avg"]
+    columns = ["precision", "recall", "f1"]
+    report = pd.DataFrame(np.vstack([scores, averages]), index=index, columns=columns)
+    report["support"] = np.append(true_counts, [total] * 3).astype(np.int64)
+    return report
+
+
+def threshold_sweep(
+    y_true: ArrayLike,
+    y_score: ArrayLike,
+    pos_label: Any = 1,
+    fp_cost: float = 1.0,
+    fn_cost: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Compute confusion counts, precision, recall, F1 score and cost of a binary
+    classifier at every decision threshold.
+
+    The scores are sorted once and the counts of all thresholds are obtained with
+    cumulative sums, which takes O(n log n) time in total. A sample is predicted
+    positive when its score is greater than or equal to the threshold.
+
+    Parameters
+    ----------
+    y_true : array-like
+        True labels.
+    y_score : array-like
+        Scores of the positive class (e.g. probabilities).
+    pos_label : Any, default 1
+        Label of the positive class.
+    fp_cost : float, default 1.0
+        Cost of a false positive.
+    fn_cost : float, default 1.0
+        Cost of a false negative.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with columns "threshold", "tp", "fp", "fn", "tn", "precision",
+        "recall", "f1" and "cost", one row per distinct score in descending order.
+
+    Examples
+    --------
+    >>> threshold_sweep([0, 1, 1, 0], [0.1, 0.8, 0.4, 0.4]).round(2)
+       threshold  tp  fp  fn  tn  precision  recall    f1  cost
+    0        0.8   1   0   1   2       1.00     0.5  0.67   1.0
+    1        0.4   2   1   0   1       0.67     1.0  0.80   1.0
+    2        0.1   2   2   0   0       0.50     1.0  0.67   2.0
+
+    """
+    y_true = np.asarray(y_true) == pos_label
+    y_score = np.asarray(y_score)
+    if y_true.shape != y_score.shape:
+        raise ValueError("`y_true` and `y_score` must have the same shape.")
+    if len(y_score) == 0:
+        raise ValueError("`y_true` and `y_score` must not be empty.")
+
+    order = np.argsort(y_score, kind="mergesort")[::-1]
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    # Tied scores share a threshold, so only the last index of each run is kept.
+    last = np.r_[np.flatnonzero(np.diff(y_score)), len(y_score) - 1]
+    tp = np.cumsum(y_true)[last]
+    fp = last + 1 - tp
+    num_pos = y_true.sum()
+    fn = num_pos - tp
+    tn = len(y_true) - num_pos - fp
+
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, num_pos)
+    return pd.DataFrame(
+        {
+            "threshold": y_score[last],
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "tn": tn,
+            "precision": precision,
+            "recall": recall,
+            "f1": _safe_divide(2 * precision * recall, precision + recall),
+            "cost": fp_cost * fp + fn_cost * fn,
+        }
+    )
+
+
+class CalibrationBins:
+    """
+    Mergeable per-bin statistics of predicted probabilities for calibration curves,
+    expected calibration error (ECE) and Brier score.
+
+    Predictions are binned into `n_bins` equal-width bins with `numpy.bincount`, chunk
+    by chunk, so the memory usage doesn't depend on the number of predictions. Call
+    `update` with each batch to process predictions streamed in batches.
+
+    Parameters
+    ----------
+    n_bins : int, default 10
+        Number of bins between 0 and 1.
+    chunk_size : int, default 1048576
+        Number of predictions to bin at once.
+
+    Examples
+    --------
+    >>> bins = CalibrationBins(n_bins=2)
+    >>> bins = bins.update([0, 1], [0.2, 0.6]).update([1, 1], [0.4, 0.9])
+    >>> bins.to_frame()
+       lower  upper  count  mean_prob  frac_pos
+    0    0.0    0.5      2       0.30       0.5
+    1    0.5    1.0      2       0.75       1.0
+    >>> round(bins.ece, 3), round(bins.brier, 3)
+    (0.225, 0.143)
+
+    """
+
+    def __init__(self, n_bins: int = 10, chunk_size: int = 2 ** 20):
+        self.n_bins = n_bins
+        self.chunk_size = chunk_size
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.prob_sums = np.zeros(n_bins)
+        self.pos_sums = np.zeros(n_bins)
+        self.squared_error_sum = 0.0
+
+    def update(self, y_true: ArrayLike, y_prob: ArrayLike) -> "CalibrationBins":
+        """
+        Add a batch of binary labels and predicted probabilities of the positive class.
+        """
+        y_true = np.asarray(y_true)
+        y_prob = np.asarray(y_prob)
+        if y_true.shape != y_prob.shape:
+            raise ValueError("`y_true` and `y_prob` must have the same shape.")
+
+        for start in range(0, len(y_prob), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            prob = y_prob[chunk].astype(np.float64)
+            pos = y_true[chunk].astype(np.float64)
+            # Probabilities of exactly 1 belong to the last bin.
+            idx = np.clip((prob * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+            self.counts += np.bincount(idx, minlength=self.n_bins)
+            self.prob_sums += np.bincount(idx, prob, minlength=self.n_bins)
+            self.pos_sums += np.bincount(idx, pos, minlength=self.n_bins)
+            self.squared_error_sum += float(((prob - pos) ** 2).sum())
+        return self
+
+    def merge(self, other: "CalibrationBins") -> "CalibrationBins":
+        """
+        Add the statistics of another instance with the same number of bins.
+        """
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge bins with different `n_bins`.")
+
+        self.counts += other.counts
+        self.prob_sums += other.prob_sums
+        self.pos_sums += other.pos_sums
+        self.squared_error_sum += other.squared_error_sum
+        return self
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def ece(self) -> float:
+        """
+        Expected calibration error: the average gap between the mean probability and
+        the fraction of positives of each bin, weighted by the bin size.
+        """
+        if self.num_samples == 0:
+            return 0.0
+        gaps = np.abs(self.prob_sums - self.pos_sums)
+        return float(gaps.sum() / self.num_samples)
+
+    @property
+    def brier(self) -> float:
+        """
+        Brier score: mean squared error between probabilities and labels.
+        """
+        if self.num_samples == 0:
+            return 0.0
+        return self.squared_error_sum / self.num_samples
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the bin edges, sizes, mean probabilities and fractions of positives.
+        Empty bins have NaN means.
+        """
+        edges = np.linspace(0, 1, self.n_bins + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame(
+                {
+                    "lower": edges[:-1],
+                    "upper": edges[1:],
+                    "count": self.counts,
+                    "mean_prob": self.prob_sums / self.counts,
+                    "frac_pos": self.pos_sums / self.counts,
+                }
+            )
+
+
+def attribution_summary(
+    values: np.ndarray,
+    features: Optional[ArrayLike] = None,
+    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    sample_size: int = 10000,
+    chunk_size: int = 65536,
+    random_state: Optional[int] = 0,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Summarize a per-sample attribution matrix (e.g. SHAP values) in a single pass over
+    chunks of rows, so a `numpy.memmap` larger than memory can be summarized.
+
+    The mean absolute attribution is exact. The quantiles are computed from a
+    subsample stratified by row position: each chunk contributes rows in proportion
+    to its size.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2D attribution matrix (rows x features). NaNs are ignored.
+    features : array-like, default None
+        Feature names. If unspecified, the column positions are used.
+    quantiles : sequence of float, default (0.05, 0.25, 0.5, 0.75, 0.95)
+        Quantiles of the attributions to compute.
+    sample_size : int, default 10000
+        Number of rows in the subsample.
+    chunk_size : int, default 65536
+        Number of rows to process at once.
+    random_state : int, default 0
+        Seed of the subsampling.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe indexed by the features with columns "mean_abs", "mean" and one
+        column per quantile (e.g. "q50" for 0.5).
+    numpy.ndarray
+        Subsample of rows in the original order.
+
+    Examples
+    --------
+    >>> values = np.array([[1.0, -2.0], [-3.0, 2.0], [2.0, 2.0]])
+    >>> summary, sample = attribution_summary(values, ["a", "b"], quantiles=[0.5])
+    >>> summary
+       mean_abs      mean  q50
+    a       2.0  0.000000  1.0
+    b       2.0  0.666667  2.0
+    >>> sample.shape
+    (3, 2)
+
+    """
+    num_rows, num_features = values.shape
+    if features is None:
+        features = np.arange(num_features)
+
+    rs = np.random.RandomState(random_state)
+    abs_sums = np.zeros(num_features)
+    sums = np.zeros(num_features)
+    counts = np.zeros(num_features, dtype=np.int64)
+    samples: List[np.ndarray] = []
+    sampling_rate = min(sample_size / max(num_rows, 1), 1.0)
+
+    for start in range(0, num_rows, chunk_size):
+        rows = slice(start, start + chunk_size)
+        chunk = np.asarray(values[rows], dtype=np.float64)
+        abs_sums += np.nansum(np.abs(chunk), axis=0)
+        sums += np.nansum(chunk, axis=0)
+        counts += (~np.isnan(chunk)).sum(axis=0)
+
+        # Round stochastically so that the expected sample size is exact.
+        expected = len(chunk) * sampling_rate
+        num_samples = int(expected) + int(rs.rand() < expected % 1)
+        picked = np.sort(rs.choice(len(chunk), num_samples, replace=False))
+        samples.append(chunk[picked])
+
+    sample = np.concatenate(samples) if samples else np.empty((0, num_features))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary = pd.DataFrame(
+            {"mean_abs": abs_sums / counts, "mean": sums / counts},
+            index=pd.Index(features),
+        )
+    for q in quantiles:
+        value = np.nanquantile(sample, q, axis=0) if len(sample) > 0 else np.nan
+        summary["q{:g}".format(q * 100)] = value
+    return summary, sample
+
+
+# Floor of bin probabilities in PSI to keep the log finite for empty bins.
+_PSI_EPS = 1e-4
+
+
+def _divergences(p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute PSI and Jensen-Shannon divergence (base 2) between the bin probabilities
+    in the rows of `p` and `q` (bins x columns).
+    """
+    p_eps, q_eps = np.maximum(p, _PSI_EPS), np.maximum(q, _PSI_EPS)
+    psi = ((q_eps - p_eps) * np.log(q_eps / p_eps)).sum(axis=0)
+
+    m = (p + q) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kl_p = np.where(p > 0, p * np.log2(p / m), 0).sum(axis=0)
+        kl_q = np.where(q > 0, q * np.log2(q / m), 0).sum(axis=0)
+    return psi, (kl_p + kl_q) / 2
+
+
+def _bin_probs(x: np.ndarray, inner_edges: np.ndarray) -> np.ndarray:
+    """
+    Compute the fractions of values of each column in bins split by `inner_edges`
+    (bins - 1 x columns). NaNs are ignored.
+    """
+    num_edges, num_cols = inner_edges.shape
+    cum = np.zeros((num_edges, num_cols))
+    # Compare in row chunks to bound the size of the (rows x edges x columns) mask.
+    chunk_rows = max(2 ** 22 // max(num_edges * num_cols, 1), 1)
+    for start in range(0, len(x), chunk_rows):
+        chunk = x[slice(start, start + chunk_rows)]
+        cum += (chunk[:, None, :] <= inner_edges[None]).sum(axis=0)
+
+    total = (~np.isnan(x)).sum(axis=0)
+    counts = np.diff(np.vstack([np.zeros(num_cols), cum, total]), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return counts / total
+
+
+def _sorted_columns(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sort the values of each column of `x` into the rows of a (columns x rows) array,
+    NaNs last, and count the non-NaN values of each column.
+    """
+    # Sort contiguous memory, which is much faster than sorting along axis 0.
+    values = np.ascontiguousarray(x.T)
+    values.sort(axis=1)
+    return values, (~np.isnan(values)).sum(axis=1)
+
+
+def _ks(ref: np.ndarray, cur: np.ndarray) -> np.ndarray:
+    """
+    Compute the two-sample Kolmogorov-Smirnov statistic of each column.
+
+    Each sample is sorted on its own, so the memory used is about the size of the
+    inputs, and the empirical CDFs are compared at the values of one column at a time.
+    """
+    ref_values, ref_counts = _sorted_columns(ref)
+    cur_values, cur_counts = _sorted_columns(cur)
+    ks = np.full(len(ref_values), np.nan)
+    for i, (n_ref, n_cur) in enumerate(zip(ref_counts, cur_counts)):
+        if n_ref == 0 or n_cur == 0:
+            continue
+        r, c = ref_values[i, :n_ref], cur_values[i, :n_cur]
+        # The largest gap between the CDFs is at one of the values of either sample.
+        points = np.concatenate([r, c])
+        cdf_ref = np.searchsorted(r, points, side="right") / n_ref
+        cdf_cur = np.searchsorted(c, points, side="right") / n_cur
+        ks[i] = np.abs(cdf_ref - cdf_cur).max()
+    return ks
+
+
+def _numeric_drift(ref: np.ndarray, cur: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Compute PSI, KS and Jensen-Shannon divergence of a block of numeric columns.
+    """
+    ref = ref.astype(np.float64)
+    cur = cur.astype(np.float64)
+    levels = np.linspace(0, 1, bins + 1)[1:-1]
+    with np.errstate(invalid="ignore"):
+        inner_edges = np.nanquantile(ref, levels, axis=0).reshape(len(levels), -1)
+    psi, js = _divergences(_bin_probs(ref, inner_edges), _bin_probs(cur, inner_edges))
+    return np.stack([psi, _ks(ref, cur), js], axis=1)
+
+
+def drift(
+    ref: pd.DataFrame,
+    cur: pd.DataFrame,
+    bins: int = 10,
+    block_size: int = 64,
+    max_workers: int = 1,
+) -> pd.DataFrame:
+    """
+    Compute the population stability index (PSI), Kolmogorov-Smirnov statistic (KS)
+    and Jensen-Shannon divergence (JS, base 2) of each column between a reference
+    and a current dataframe.
+
+    Numeric columns are binned at the quantiles of the reference data, and blocks of
+    columns are processed at once with vectorized operations. Other columns are
+    compared by the frequencies of their values and get NaN KS statistics.
+
+    Parameters
+    ----------
+    ref : pandas.DataFrame
+        Reference data (e.g. training data).
+    cur : pandas.DataFrame
+        Current data (e.g. serving data). Only columns in `ref` are compared.
+    bins : int, default 10
+        Number of quantile bins of numeric columns.
+    block_size : int, default 64
+        Number of numeric columns to process at once.
+    max_workers : int, default 1
+        Number of processes to compute blocks in. Values greater than 1 only pay
+        off for wide tables because the data of each block is copied to a process.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe indexed by the columns with columns "psi", "ks" and "js".
+
+    Examples
+    --------
+    >>> ref = pd.DataFrame({'x': np.arange(100.0), 'c': ['a', 'b'] * 50})
+    >>> cur = pd.DataFrame({'x': np.arange(100.0) + 50, 'c': ['a'] * 100})
+    >>> drift(ref, cur).round(2)
+        psi   ks    js
+    x  4.35  0.5  0.39
+    c  4.60  NaN  0.31
+
+    """
+    columns = [c for c in ref.columns if c in cur.columns]
+    is_numeric = pd.api.types.is_numeric_dtype
+    numeric = [c for c in columns if is_numeric(ref[c]) and is_numeric(cur[c])]
+    blocks = list(chunks(numeric, block_size))
+    args = [(ref[b].to_numpy(), cur[b].to_numpy(), bins) for b in blocks]
+
+    if max_workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(_numeric_drift, *zip(*args)))
+    else:
+        results = [_numeric_drift(*a) for a in args]
+
+    report = pd.DataFrame(np.nan, index=pd.Index(columns), columns=["psi", "ks", "js"])
+    for block, result in zip(blocks, results):
+        report.loc[block] = result
+
+    for col in columns:
+        if col in numeric:
+            continue
+        freqs = pd.concat(
+            [
+                ref[col].value_counts(normalize=True),
+                cur[col].value_counts(normalize=True),
+            ],
+            axis=1,
+        ).fillna(0)
+        probs = freqs.to_numpy()
+        psi, js = _divergences(probs[:, [0]], probs[:, [1]])
+        report.loc[col, ["psi", "js"]] = [psi[0], js[0]]
+    return report
@@ -0,0 +1,485 @@
+import io
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Deque, Generator, List, Optional, TextIO, Union
+
+import mlflow
+import pyarrow as pa
+
+from mlflow_extend import logging as lg
+from mlflow_extend import spool
+
+__all__ = ["TextStream", "OutputCapture", "capture_output"]
+
+# File extension of segments for each compression codec.
+_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+SEGMENT_PATTERN = re.compile(r"^(\d+)\.txt(\.gz|\.zst)?$")
+
+
+def _next_segment_index(run_id: str, path: str) -> int:
+    # Continue the numbering of segments that were logged to the same path before.
+    client = mlflow.tracking.MlflowClient()
+    indices = [
+        int(match.group(1))
+        for f in client.list_artifacts(run_id, path)
+        for match in [SEGMENT_PATTERN.match(os.path.basename(f.path))]
+        if match is not None
+    ]
+    return max(indices) + 1 if len(indices) > 0 else 0
+
+
+class TextStream(io.TextIOBase):
+    """
+    Write-only text file logged as an artifact in size-bounded segments.
+
+    Writes are buffered in a local segment file. When the segment exceeds
+    `segment_bytes`, it's closed and uploaded to "<path>/<index>.txt" in a background
+    thread, so memory usage stays bounded regardless of the length of the text. A
+    segment is closed after the write that makes it exceed `segment_bytes`, so lines
+    written at once are never split into two segments. Writing to a path that already
+    contains segments appends new segments to them.
+
+    When spooling (see `mlflow_extend.spool`), the segments already in the artifact
+    store can't be listed, so numbering starts at 0 and replaying the journal
+    overwrites the segments previously logged to the same path. Use a new path for
+    each spooled stream.
+
+    Use `mlflow_extend.loading.load_text_stream` to read the text back.
+
+    Parameters
+    ----------
+    path : str
+        Directory in the artifact store to log segments in.
+    segment_bytes : int, default 1048576
+        Size of uncompressed text in bytes after which a segment is completed.
+    compression : str, default None
+        Compression codec of segments ("gzip", "zstd" or None).
+    max_pending : int, default 4
+        Maximum number of completed segments waiting to be uploaded. Writes block when
+        it's reached.
+    encoding : str, default "utf-8"
+        Text encoding.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     with mlflow.TextStream('logs', segment_bytes=8) as f:
+    ...         for i in range(3):
+    ...             _ = f.write('line {}\\n'.format(i))
+    >>> list_artifacts(run.info.run_id, 'logs')
+    ['logs/00000.txt', 'logs/00001.txt']
+    >>> print(mlflow.load_text_stream(run.info.run_id, 'logs'), end='')
+    line 0
+    line 1
+    line 2
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        segment_bytes: int = 2 ** 20,
+        compression: Optional[str] = None,
+        max_pending: int = 4,
+        encoding: str = "utf-8",
+    ):
+        if compression not in _EXTENSIONS:
+            raise ValueError("Invalid compression: {}.".format(compression))
+
+        super().__init__()
+        self.path = os.path.normpath(path)
+        self.segment_bytes = segment_bytes
+        self.compression = compression
+        self._encoding = encoding
+        if spool.get_spool() is None:
+            self.run_id = lg._get_or_start_run_id()
+            self._index = _next_segment_index(self.run_id, self.path)
+        else:
+            self.run_id = lg._active_run_id()
+            self._index = 0
+
+        self._lock = threading.RLock()
+        self._tmpdir = tempfile.mkdtemp()
+        self._executor = ThreadPoolExecutor(1)
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._futures: List[Future] = []
+        self._sink: Any = None
+        self._segment_path = ""
+        self._segment_size = 0
+
+    @property
+    def encoding(self) -> str:  # type: ignore
+        return self._encoding
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def segment_size(self) -> int:
+        """
+        Size of uncompressed text in bytes written to the current segment.
+        """
+        return self._segment_size
+
+    def _raise_upload_error(self) -> None:
+        futures = []
+        for future in self._futures:
+            if not future.done():
+                futures.append(future)
+            elif future.exception() is not None:
+                raise future.exception()  # type: ignore
+        self._futures = futures
+
+    def write(self, s: str) -> int:
+        data = s.encode(self._encoding)
+        if len(data) == 0:
+            return 0
+
+        with self._lock:
+            if self.closed:
+                raise ValueError("I/O operation on closed stream.")
+            if self._sink is None:
+                self._open_segment()
+            self._sink.write(data)
+            self._segment_size += len(data)
+            if self._segment_size >= self.segment_bytes:
+                self.rotate()
+        return len(s)
+
+    def _open_segment(self) -> None:
+        name = "{:05d}.txt{}".format(self._index, _EXTENSIONS[self.compression])
+        self._segment_path = os.path.join(self._tmpdir, name)
+        if self.compression is None:
+            self._sink = open(self._segment_path, "wb", buffering=2 ** 16)
+        else:
+            self._sink = pa.CompressedOutputStream(self._segment_path, self.compression)
+
+    def _upload(self, local_path: str) -> None:
+        try:
+            path = os.path.join(self.path, os.path.basename(local_path))
+            with lg._artifact_context(path, run_id=self.run_id) as tmp_path:
+                shutil.move(local_path, tmp_path)
+        finally:
+            self._pending.release()
+
+    def rotate(self) -> None:
+        """
+        Complete the current segment, if it's not empty, and upload it in the
+        background.
+        """
+        with self._lock:
+            self._raise_upload_error()
+            if self._sink is None:
+                return
+
+            self._sink.close()
+            self._sink = None
+            self._segment_size = 0
+            self._index += 1
+            self._pending.acquire()
+            self._futures.append(
+                self._executor.submit(self._upload, self._segment_path)
+            )
+
+    def flush(self) -> None:
+        """
+        Flush buffered writes into the local segment file. Use `rotate` to upload them.
+        """
+        with self._lock:
+            if self._sink is not None and self.compression is None:
+                self._sink.flush()
+
+    def close(self) -> None:
+        """
+        Upload the last segment and wait for all the uploads to finish.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self.rotate()
+                self._executor.shutdown(wait=True)
+                self._raise_upload_error()
+            finally:
+                shutil.rmtree(self._tmpdir, ignore_errors=True)
+                super().close()
+
+
+class _Tee:
+    """
+    Write to a text file and append the written text to a ring buffer.
+    """
+
+    def __init__(self, file: TextIO, ring: Deque[Any], capture: "OutputCapture"):
+        self._file = file
+        self._ring = ring
+        self._capture = capture
+
+    def write(self, s: str) -> int:
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self._capture._num_dropped += 1
+        ring.append(s)
+        return self._file.write(s)
+
+    def __getattr__(self, name: str) -> Any:
+        # Delegate everything else (e.g. `flush`, `fileno` and `isatty`) to the file.
+        return getattr(self._file, name)
+
+
+class _RingHandler(logging.Handler):
+    """
+    Logging handler that appends records to a ring buffer. Records are formatted in
+    the background thread to keep the logging call fast, but their message and
+    traceback are rendered on the calling thread like `logging.handlers.QueueHandler`
+    does, since the arguments may change or be freed before the record is formatted.
+    """
+
+    def __init__(self, ring: Deque[Any], capture: "OutputCapture", level: int):
+        super().__init__(level)
+        self._ring = ring
+        self._capture = capture
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Appending to a deque is thread-safe, so the handler lock isn't needed.
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Copy the record, which other handlers may still use. This is much faster
+        # than `copy.copy`.
+        frozen = logging.LogRecord.__new__(logging.LogRecord)
+        frozen.__dict__.update(record.__dict__)
+        record = frozen
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                formatter = self._capture.formatter
+                record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self._capture._num_dropped += 1
+        ring.append(record)
+
+
+class OutputCapture:
+    """
+    Capture stdout, stderr and logging records into a `TextStream`.
+
+    Captured text and records are appended to a ring buffer of `buffer_size` entries,
+    which costs about a microsecond per write and a few microseconds per record on the
+    calling thread. A background thread moves them into the local segment of the
+    stream every `flush_interval` seconds. It uploads the segment if it isn't empty
+    and `upload_interval` seconds have passed since the last upload, so captured
+    output shows up in the artifact store with bounded latency without logging a
+    tiny segment on every flush. Segments reaching `segment_bytes` are uploaded right
+    away (see `TextStream`). If the background thread falls behind, the oldest entries
+    are dropped and a line with the number of dropped entries is written instead.
+
+    Parameters
+    ----------
+    path : str, default "output"
+        Directory in the artifact store to log segments in (see `TextStream`).
+    stdout : bool, default True
+        Whether to capture stdout. It's still written to the original stdout.
+    stderr : bool, default True
+        Whether to capture stderr. It's still written to the original stderr.
+    logger : str or logging.Logger, default ""
+        Logger to capture records of. The root logger ("") captures all loggers that
+        propagate. If ``None``, no records are captured.
+    level : int, default logging.NOTSET
+        Minimum level of captured records.
+    formatter : logging.Formatter, default None
+        Formatter of captured records. If unspecified, records are formatted as
+        "<time> <level> <logger>: <message>".
+    flush_interval : float, default 5.0
+        Number of seconds between moves of captured entries into the local segment.
+    upload_interval : float, default 60.0
+        Minimum number of seconds between uploads of segments by the background
+        thread, which bounds the number of segments of a long job.
+    buffer_size : int, default 100000
+        Maximum number of entries in the ring buffer.
+    **kwargs : dict
+        Keyword arguments passed to `TextStream`.
+
+    """
+
+    def __init__(
+        self,
+        path: str = "output",
+        stdout: bool = True,
+        stderr: bool = True,
+        logger: Union[str, logging.Logger, None] = "",
+        level: int = logging.NOTSET,
+        formatter: Optional[logging.Formatter] = None,
+        flush_interval: float = 5.0,
+        upload_interval: float = 60.0,
+        buffer_size: int = 100000,
+        **kwargs: Any
+    ):
+        self.path = path
+        self.stdout = stdout
+        self.stderr = stderr
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+        self.formatter = formatter or logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"
+        )
+        self.flush_interval = flush_interval
+        self.upload_interval = upload_interval
+        self.stream_kwargs = kwargs
+        self._ring: Deque[Any] = deque(maxlen=buffer_size)
+        self._num_dropped = 0
+        self._num_reported = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._last_upload = 0.0
+        self._stream: Optional[TextStream] = None
+        self._handler: Optional[_RingHandler] = None
+        self._stdout_tee: Optional[_Tee] = None
+        self._stderr_tee: Optional[_Tee] = None
+
+    @property
+    def num_dropped(self) -> int:
+        """
+        Number of entries dropped because the ring buffer was full. It's approximate
+        when multiple threads write at the same time.
+        """
+        return self._num_dropped
+
+    def start(self) -> "OutputCapture":
+        """
+        Start capturing.
+        """
+        self._stream = TextStream(self.path, **self.stream_kwargs)
+        if self.stdout:
+            self._stdout_tee = _Tee(sys.stdout, self._ring, self)
+            sys.stdout = self._stdout_tee  # type: ignore
+        if self.stderr:
+            self._stderr_tee = _Tee(sys.stderr, self._ring, self)
+            sys.stderr = self._stderr_tee  # type: ignore
+        if self.logger is not None:
+            self._handler = _RingHandler(self._ring, self, self.level)
+            self.logger.addHandler(self._handler)
+
+        self._last_upload = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _drain(self) -> None:
+        assert self._stream is not None
+        # Dropped entries are the oldest ones, so they precede the remaining entries.
+        num_dropped = self._num_dropped
+        if num_dropped > self._num_reported:
+            self._stream.write(
+                "[{} entries dropped]\n".format(num_dropped - self._num_reported)
+            )
+            self._num_reported = num_dropped
+
+        # Entries appended while draining are left for the next drain, so a busy
+        # writer can't delay the upload.
+        for _ in range(len(self._ring)):
+            entry = self._ring.popleft()
+            if isinstance(entry, logging.LogRecord):
+                entry = self.formatter.format(entry) + "\n"
+            self._stream.write(entry)
+
+        # The last segment is uploaded when the stream is closed.
+        now = time.monotonic()
+        if (
+            self._stream.segment_size > 0
+            and now - self._last_upload >= self.upload_interval
+        ):
+            self._stream.rotate()
+            self._last_upload = now
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._drain()
+        except BaseException as e:
+            self._error = e
+
+    def stop(self) -> None:
+        """
+        Stop capturing, upload the rest of the captured output and wait for all the
+        uploads to finish.
+        """
+        # Leave streams replaced after `start` (e.g. by another capture) alone. Our tee
+        # then keeps writing through to the original stream.
+        if self._stdout_tee is not None:
+            if sys.stdout is self._stdout_tee:
+                sys.stdout = self._stdout_tee._file
+            self._stdout_tee = None
+        if self._stderr_tee is not None:
+            if sys.stderr is self._stderr_tee:
+                sys.stderr = self._stderr_tee._file
+            self._stderr_tee = None
+        if self._handler is not None:
+            assert self.logger is not None
+            self.logger.removeHandler(self._handler)
+            self._handler = None
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._stream is not None:
+            try:
+                if self._error is None:
+                    self._drain()
+            finally:
+                self._stream.close()
+                self._stream = None
+        if self._error is not None:
+            raise self._error
+
+
+@contextmanager
+def capture_output(**kwargs: Any) -> Generator[OutputCapture, None, None]:
+    """
+    Context manager version of `OutputCapture`.
+
+    Parameters
+    ----------
+    **kwargs : dict
+        Keyword arguments passed to `OutputCapture`.
+
+    Examples
+    --------
+    >>> import logging
+    >>> with mlflow.start_run() as run:
+    ...     with mlflow.capture_output(formatter=logging.Formatter('%(message)s')):
+    ...         print('hello')
+    ...         logging.getLogger('train').warning('loss: %.1f', 0.5)
+    hello
+    >>> print(mlflow.load_text_stream(run.info.run_id, 'output'), end='')
+    hello
+    loss: 0.5
+
+    """
+    capture = OutputCapture(**kwargs).start()
+    try:
+        yield capture
+    finally:
+        capture.stop()
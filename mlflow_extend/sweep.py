@@ -0,0 +1,251 @@
+import itertools
+import shutil
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import mlflow
+import numpy as np
+import pandas as pd
+from mlflow.entities import RunStatus
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
+
+from mlflow_extend import logging as lg
+from mlflow_extend import spool
+from mlflow_extend.experiment import get_or_create_experiment
+from mlflow_extend.utils import flatten_dict
+
+__all__ = ["expand_grid", "sweep"]
+
+ParamGrid = Union[Mapping[str, Sequence[Any]], Iterable[Dict[str, Any]]]
+
+
+def expand_grid(param_grid: ParamGrid) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into a list of parameter sets.
+
+    Parameters
+    ----------
+    param_grid : dict or iterable of dict
+        Mapping from parameter names to candidate values, whose cartesian product is
+        taken, or an iterable of parameter sets, which is returned as a list.
+
+    Returns
+    -------
+    list of dict
+        Parameter sets.
+
+    Examples
+    --------
+    >>> expand_grid({'a': [1, 2], 'b': ['x']})
+    [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'x'}]
+    >>> expand_grid([{'a': 1}, {'a': 2, 'b': 'x'}])
+    [{'a': 1}, {'a': 2, 'b': 'x'}]
+
+    """
+    if isinstance(param_grid, Mapping):
+        keys = list(param_grid.keys())
+        values = itertools.product(*[param_grid[k] for k in keys])
+        return [dict(zip(keys, v)) for v in values]
+
+    return [dict(params) for params in param_grid]
+
+
+def _init_worker() -> None:
+    # Forked workers inherit the caller's journal, which only the caller may write to.
+    # Drop it without closing it, so trials buffer to their own journal instead.
+    spool._active_spool = None
+
+
+def _run_trial(
+    func: Callable[[Dict[str, Any]], Optional[dict]],
+    params: Dict[str, Any],
+    run_id: str,
+    tracking_uri: str,
+) -> Dict[str, Any]:
+    """
+    Run a single trial in an existing child run and return its flattened metrics.
+    Params and metrics logged by `mlflow_extend.logging` during the trial are buffered
+    in a temporary journal and uploaded in batches when the trial ends.
+    """
+    mlflow.set_tracking_uri(tracking_uri)
+    # Don't replace a journal the caller is already spooling to.
+    buffer_dir = tempfile.mkdtemp() if spool.get_spool() is None else None
+    if buffer_dir is not None:
+        spool.start_spool(buffer_dir, fsync_every=2 ** 31, fsync_interval=float("inf"))
+
+    result: Dict[str, Any] = {"run_id": run_id, "metrics": {}, "error": None}
+    mlflow.start_run(run_id=run_id, nested=True)
+    try:
+        with lg.record_manifest():
+            try:
+                lg.log_params_flatten(params)
+                metrics = func(params)
+                if metrics is not None and not isinstance(metrics, dict):
+                    msg = 'The trial function must return a dict or None, got "{}"'
+                    raise TypeError(msg.format(type(metrics)))
+                if metrics is not None:
+                    lg.log_metrics_flatten(metrics)
+                    result["metrics"] = flatten_dict(metrics)
+            except Exception:
+                result["error"] = traceback.format_exc()
+                lg.log_text(result["error"], "error.txt")
+        if buffer_dir is not None:
+            spool.stop_spool()
+            spool.replay(buffer_dir, tracking_uri)
+    except Exception:
+        # Part of what the trial logged is missing, so the trial fails.
+        result["error"] = (result["error"] or "") + traceback.format_exc()
+    finally:
+        if buffer_dir is not None:
+            spool.stop_spool()
+            shutil.rmtree(buffer_dir, ignore_errors=True)
+        status = RunStatus.FINISHED if result["error"] is None else RunStatus.FAILED
+        mlflow.end_run(RunStatus.to_string(status))
+
+    return result
+
+
+def sweep(
+    func: Callable[[Dict[str, Any]], Optional[dict]],
+    param_grid: ParamGrid,
+    metric: Optional[str] = None,
+    mode: str = "max",
+    experiment_name: Optional[str] = None,
+    run_name: Optional[str] = None,
+    max_workers: int = 1,
+) -> pd.DataFrame:
+    """
+    Run a hyperparameter sweep. Each trial runs in its own child run nested under a
+    parent run, and the best trial is rolled up to the parent run.
+
+    For each parameter set, the params are logged to a child run, `func` is called
+    with them, and the (nested) metrics dictionary it returns is logged with
+    `log_metrics_flatten`. Params, metrics and artifacts logged with
+    `mlflow_extend.logging` inside `func` go to the child run and are buffered until
+    the trial ends. A trial that raises an exception is marked as failed, and its
+    traceback is logged as "error.txt". Trials that log artifacts also log their
+    manifest (see `record_manifest`).
+
+    When all trials are done, the metrics and params of the best trial are logged to
+    the parent run under the "best" key, and its ID is set to the "best_run_id" tag.
+
+    Parameters
+    ----------
+    func : callable
+        Function that takes a parameter set and returns a metrics dictionary (or
+        ``None``). Must be picklable (e.g. defined at the module level) if
+        `max_workers` is greater than 1.
+    param_grid : dict or iterable of dict
+        Parameter grid (see `expand_grid`).
+    metric : str, default None
+        Flattened metric key to select the best trial by. If unspecified, nothing is
+        rolled up to the parent run.
+    mode : {"max", "min"}, default "max"
+        Whether larger or smaller values of `metric` are better.
+    experiment_name : str, default None
+        Experiment to create the runs in. Created if it doesn't exist. If unspecified,
+        the active experiment is used.
+    run_name : str, default None
+        Name of the parent run.
+    max_workers : int, default 1
+        Number of trials to run in parallel in a process pool. If 1, trials run
+        sequentially in the current process.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per trial with the "run_id" and "status" columns, the params prefixed
+        with "params." and the metrics prefixed with "metrics.", like
+        `mlflow.search_runs`.
+
+    Examples
+    --------
+    >>> def train(params):
+    ...     return {'score': params['a'] * params['b']}
+    >>> trials = mlflow.sweep(train, {'a': [1, 2], 'b': [3, 4]}, metric='score')
+    >>> trials[['params.a', 'params.b', 'status', 'metrics.score']]
+      params.a params.b    status  metrics.score
+    0        1        3  FINISHED              3
+    1        1        4  FINISHED              4
+    2        2        3  FINISHED              6
+    3        2        4  FINISHED              8
+    >>> parent_id = mlflow.get_run(trials['run_id'][0]).data.tags['mlflow.parentRunId']
+    >>> parent = mlflow.get_run(parent_id)
+    >>> parent.data.metrics
+    {'best.score': 8.0}
+    >>> parent.data.tags['best_run_id'] == trials['run_id'][3]
+    True
+
+    """
+    if mode not in ["max", "min"]:
+        raise ValueError('`mode` must be either "max" or "min", got "{}"'.format(mode))
+
+    param_sets = expand_grid(param_grid)
+    experiment_id = (
+        None if experiment_name is None else get_or_create_experiment(experiment_name)
+    )
+    tracking_uri = mlflow.get_tracking_uri()
+    client = mlflow.tracking.MlflowClient()
+
+    with mlflow.start_run(experiment_id=experiment_id, run_name=run_name, nested=True):
+        parent = mlflow.active_run()
+        run_ids = []
+        for i in range(len(param_sets)):
+            tags = {
+                MLFLOW_PARENT_RUN_ID: parent.info.run_id,
+                MLFLOW_RUN_NAME: "trial-{}".format(i),
+            }
+            child = client.create_run(parent.info.experiment_id, tags=tags)
+            run_ids.append(child.info.run_id)
+
+        args = (
+            [func] * len(param_sets),
+            param_sets,
+            run_ids,
+            [tracking_uri] * len(run_ids),
+        )
+        if max_workers <= 1:
+            results = list(map(_run_trial, *args))
+        else:
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker) as executor:
+                results = list(executor.map(_run_trial, *args))
+
+        trials = pd.DataFrame(
+            {
+                "run_id": run_ids,
+                "status": ["FAILED" if r["error"] else "FINISHED" for r in results],
+            }
+        )
+        params = pd.DataFrame([flatten_dict(p) for p in param_sets], index=trials.index)
+        metrics = pd.DataFrame([r["metrics"] for r in results], index=trials.index)
+        trials = pd.concat(
+            [
+                trials,
+                params.astype(str).add_prefix("params."),
+                metrics.add_prefix("metrics."),
+            ],
+            axis=1,
+        )
+
+        if metric is not None and metric in metrics and metrics[metric].notna().any():
+            scores = metrics[metric].to_numpy(dtype=np.float64)
+            best = np.nanargmax(scores) if mode == "max" else np.nanargmin(scores)
+            lg.log_metrics_flatten(
+                metrics.iloc[best].dropna().to_dict(), parent_key="best"
+            )
+            lg.log_params_flatten(param_sets[best], parent_key="best")
+            mlflow.set_tag("best_run_id", run_ids[best])
+
+    return trials
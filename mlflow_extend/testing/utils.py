@@ -1,15 +1,20 @@
+import fnmatch
 import inspect
-import json
 import os
 import subprocess
-from typing import Any, Callable, Dict, List
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import mlflow
-import yaml
 from matplotlib import pyplot as plt
 from mlflow.entities.run import Run
+from mlflow.store.artifact import artifact_repository_registry
+from mlflow.store.artifact.local_artifact_repo import LocalArtifactRepository
 from plotly import graph_objects as go
 
+from mlflow_extend.loading import _read_data  # noqa: F401
+
 
 def _get_default_args(func: Callable[..., Any]) -> Dict[str, Any]:
     """
@@ -33,33 +38,81 @@ def _run_python_script(path: str) -> int:
     return child.returncode
 
 
-def _list_artifacts(run_id: str, root: str = "") -> List[str]:
-    """
-    List all artifacts in the specified run.
+def iter_artifacts(
+    run_id: str,
+    root: str = "",
+    pattern: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    max_workers: int = 8,
+) -> Iterator[str]:
+    """
+    Lazily iterate over artifact paths in the specified run.
+
+    Directories are listed concurrently and paths are yielded as soon as their
+    directory listing arrives, so the order is not deterministic.
+
+    Parameters
+    ----------
+    run_id : str
+        Run ID.
+    root : str, default ""
+        Directory to start listing from.
+    pattern : str, default None
+        Glob pattern (e.g. "plots/*.png") the artifact paths must match.
+    max_depth : int, default None
+        Maximum number of directory levels to descend below `root`. If ``None``,
+        all directories are listed.
+    max_workers : int, default 8
+        Maximum number of concurrent directory listings.
+
+    Yields
+    ------
+    str
+        Artifact path.
+
+    Examples
+    --------
+    >>> with mlflow.start_run() as run:
+    ...     mlflow.log_text('a', 'a.txt')
+    ...     mlflow.log_text('b', 'dir/b.txt')
+    >>> sorted(iter_artifacts(run.info.run_id))
+    ['a.txt', 'dir/b.txt']
+    >>> list(iter_artifacts(run.info.run_id, max_depth=0))
+    ['a.txt']
+
     """
     client = mlflow.tracking.MlflowClient()
-    artifacts = []
-    for artifact in client.list_artifacts(run_id, None if root == "" else root):
-        if artifact.is_dir:
-            next_root = os.path.join(artifact.path)
-            artifacts += _list_artifacts(run_id, next_root)
-        else:
-            artifacts += [artifact.path]
-    return artifacts
 
+    def list_dir(path: str) -> list:
+        return client.list_artifacts(run_id, None if path == "" else path)
+
+    executor = ThreadPoolExecutor(max_workers)
+    pending: Dict[Future, int] = {executor.submit(list_dir, root): 0}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                for artifact in future.result():
+                    if artifact.is_dir:
+                        if max_depth is None or depth < max_depth:
+                            next_future = executor.submit(list_dir, artifact.path)
+                            pending[next_future] = depth + 1
+                    elif pattern is None or fnmatch.fnmatch(artifact.path, pattern):
+                        yield artifact.path
+    finally:
+        # If the consumer stops early, don't wait for the remaining listings.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
 
-def _read_data(path: str) -> Dict[str, Any]:
+
+def list_artifacts(run_id: str, root: str = "", **kwargs: Any) -> List[str]:
     """
-    Read data from JSON and YAML files.
+    List all artifacts in the specified run in sorted order. `kwargs` are passed to
+    `iter_artifacts`.
     """
-    with open(path, "r") as f:
-        ext = os.path.splitext(path)[-1]
-        if ext == ".json":
-            return json.load(f)
-        elif ext in [".yaml", ".yml"]:
-            return yaml.load(f, Loader=yaml.SafeLoader)
-        else:
-            raise ValueError("Invalid file type: `{}`".format(ext))
+    return sorted(iter_artifacts(run_id, root, **kwargs))
 
 
 def assert_is_figure(obj: Any) -> None:
@@ -82,7 +135,7 @@ def assert_file_exists_in_artifacts(run: Run, path: str) -> None:
     """
     Assert the specified file exists in the artifact store of the given run.
     """
-    artifacts = _list_artifacts(run.info.run_id)
+    artifacts = list_artifacts(run.info.run_id)
     assert path in artifacts
 
 
@@ -91,3 +144,35 @@ def assert_not_conflict_with_fluent_apis(new_apis: List[str]) -> None:
     Assert new APIs mlflow_extend provides don't conflict the MLflow native APIs.
     """
     assert all(new_api not in mlflow.__all__ for new_api in new_apis)
+
+
+class FaultInjectingArtifactRepository(LocalArtifactRepository):
+    """
+    Local artifact repository for "faulty://<path>" URIs that fails or delays uploads
+    on demand. Call `register_fault_injecting_artifact_repository` before using it.
+    """
+
+    # Number of upcoming `log_artifact` calls that raise `ConnectionError`.
+    num_failures = 0
+    # Seconds to sleep in every `log_artifact` call.
+    delay = 0.0
+
+    def __init__(self, artifact_uri: str) -> None:
+        super().__init__(artifact_uri.replace("faulty://", "file://", 1))
+
+    def log_artifact(
+        self, local_file: str, artifact_path: Optional[str] = None
+    ) -> None:
+        time.sleep(type(self).delay)
+        if type(self).num_failures > 0:
+            type(self).num_failures -= 1
+            raise ConnectionError("Injected fault")
+        super().log_artifact(local_file, artifact_path)
+
+
+def register_fault_injecting_artifact_repository() -> None:
+    """
+    Register `FaultInjectingArtifactRepository` for the "faulty" URI scheme.
+    """
+    registry = artifact_repository_registry._artifact_repository_registry
+    registry.register("faulty", FaultInjectingArtifactRepository)
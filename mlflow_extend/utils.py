@@ -1,3 +1,17 @@
+import concurrent.futures
+import hashlib
+import os
+import random
+import re
+import time
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+import requests
+from mlflow.exceptions import MlflowException, RestException
+
+T = TypeVar("T")
+
+
 def flatten_dict(dct: dict, parent_key: str = "", sep: str = ".") -> dict:
     """
     Flatten a nested dictionary.
@@ -31,3 +45,171 @@ def flatten_dict(dct: dict, parent_key: str = "", sep: str = ".") -> dict:
         else:
             items.append((new_key, v))
     return dict(items)
+
+
+def chunks(seq: List[T], size: int) -> Iterator[List[T]]:
+    """
+    Split a list into chunks of the given size.
+
+    Parameters
+    ----------
+    seq : list
+        List to split.
+    size : int
+        Maximum size of each chunk.
+
+    Examples
+    --------
+    >>> list(chunks([1, 2, 3, 4, 5], 2))
+    [[1, 2], [3, 4], [5]]
+
+    """
+    for start in range(0, len(seq), size):
+        end = start + size
+        yield seq[start:end]
+
+
+def file_sha256(path: str, chunk_size: int = 2 ** 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file without reading it into memory at once.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile(delete=False) as f:
+    ...     _ = f.write(b'abc')
+    >>> file_sha256(f.name)[:16]
+    'ba7816bf8f01cfea'
+    >>> os.remove(f.name)
+
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def file_format(path: str) -> str:
+    """
+    Infer the file format of a path from its extension. Compressed CSV files
+    (e.g. "df.csv.gz") have the format before the compression codec.
+
+    Examples
+    --------
+    >>> file_format("dir/df.csv.gz")
+    'csv'
+    >>> file_format("fig.PNG")
+    'png'
+
+    """
+    root, ext = os.path.splitext(path)
+    if ext.lower() in [".gz", ".zst"]:
+        ext = os.path.splitext(root)[-1]
+    return ext.lstrip(".").lower()
+
+
+def call_with_retries(
+    func: Callable[[], T],
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    max_backoff: float = 60.0,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+    retry_on: Optional[Callable[[Exception], bool]] = None,
+) -> T:
+    """
+    Call a function and retry it with exponential backoff and full jitter if it
+    raises an exception.
+
+    Parameters
+    ----------
+    func : callable
+        Function to call without arguments.
+    max_retries : int, default 3
+        Maximum number of retries.
+    backoff : float, default 1.0
+        Upper bound of the first backoff in seconds. Doubles on every retry.
+    max_backoff : float, default 60.0
+        Maximum backoff in seconds.
+    on_retry : callable, default None
+        Called with the attempt number and the exception before each retry.
+    retry_on : callable, default None
+        Called with the exception to decide whether to retry (e.g.
+        `is_transient_error`). If unspecified, every exception is retried.
+
+    Returns
+    -------
+    object
+        Return value of `func`.
+
+    Examples
+    --------
+    >>> attempts = []
+    >>> def flaky():
+    ...     attempts.append(None)
+    ...     if len(attempts) < 3:
+    ...         raise ConnectionError()
+    ...     return len(attempts)
+    >>> call_with_retries(flaky, backoff=0)
+    3
+
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or (retry_on is not None and not retry_on(e)):
+                raise
+            if on_retry is not None:
+                on_retry(attempt, e)
+            time.sleep(random.uniform(0, min(max_backoff, backoff * 2 ** attempt)))
+            attempt += 1
+
+
+# Error codes of REST API responses that may succeed when retried.
+_TRANSIENT_ERROR_CODES = ["INTERNAL_ERROR", "TEMPORARILY_UNAVAILABLE"]
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Return whether an error may go away when the call is retried: connection errors,
+    timeouts and server errors (HTTP 5xx).
+
+    Parameters
+    ----------
+    error : Exception
+        Error to check.
+
+    Returns
+    -------
+    bool
+        Whether the error is transient.
+
+    Examples
+    --------
+    >>> is_transient_error(ConnectionError())
+    True
+    >>> is_transient_error(ValueError())
+    False
+
+    """
+    if isinstance(
+        error,
+        (
+            ConnectionError,
+            TimeoutError,
+            concurrent.futures.TimeoutError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ),
+    ):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    if isinstance(error, RestException):
+        return error.error_code in _TRANSIENT_ERROR_CODES
+    if isinstance(error, MlflowException):
+        # Responses that aren't JSON only have the status code in the message.
+        return re.search(r"error code 5\d\d != 200", error.message) is not None
+    return False
@@ -29,6 +29,7 @@ setup(
     packages=find_packages(),
     python_requires=">=3.6",
     install_requires=get_install_requires(),
+    entry_points={"console_scripts": ["mlflow_extend=mlflow_extend.cli:main"]},
     maintainer="harupy",
     maintainer_email="hkawamura0130@gmail.com",
     url=GITHUB_REPO_URL,
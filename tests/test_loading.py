@@ -0,0 +1,294 @@
+import os
+from typing import Any, Optional
+
+import mlflow
+import numpy as np
+import pandas as pd
+import py
+import pytest
+
+from mlflow_extend import loading as ld
+from mlflow_extend import logging as lg
+from mlflow_extend.testing.utils import assert_not_conflict_with_fluent_apis
+
+
+def test_new_apis_do_not_conflict_native_apis() -> None:
+    assert_not_conflict_with_fluent_apis(ld.__all__)
+
+
+@pytest.fixture
+def cache(tmpdir: py.path.local) -> ld.ArtifactCache:
+    return ld.ArtifactCache(tmpdir.join("cache").strpath)
+
+
+def test_artifact_cache_get(cache: ld.ArtifactCache) -> None:
+    with mlflow.start_run() as run:
+        lg.log_text("text", "dir/text.txt")
+
+    local_path = cache.get(run.info.run_id, "dir/text.txt")
+    assert local_path == os.path.join(cache.cache_dir, run.info.run_id, "dir/text.txt")
+    with open(local_path) as f:
+        assert f.read() == "text"
+    assert cache.total_bytes == 4
+
+    # A cached artifact must not be downloaded again.
+    os.remove(
+        os.path.join(run.info.artifact_uri.replace("file://", ""), "dir/text.txt")
+    )
+    assert cache.get(run.info.run_id, "dir/text.txt") == local_path
+
+
+def test_artifact_cache_evicts_least_recently_used(tmpdir: py.path.local) -> None:
+    cache = ld.ArtifactCache(tmpdir.strpath, max_bytes=10)
+    with mlflow.start_run() as run:
+        for name in "abc":
+            lg.log_text(name * 4, "{}.txt".format(name))
+
+    run_id = run.info.run_id
+    path_a = cache.get(run_id, "a.txt")
+    path_b = cache.get(run_id, "b.txt")
+    cache.get(run_id, "a.txt")
+    path_c = cache.get(run_id, "c.txt")
+
+    assert os.path.exists(path_a)
+    assert not os.path.exists(path_b)
+    assert os.path.exists(path_c)
+    assert cache.total_bytes == 8
+
+
+def test_artifact_cache_keeps_artifacts_accessed_during_get(
+    tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ld.ArtifactCache(tmpdir.strpath, max_bytes=8)
+    with mlflow.start_run() as run:
+        for name in "abc":
+            lg.log_text(name * 4, "{}.txt".format(name))
+
+    run_id = run.info.run_id
+    path_a = cache.get(run_id, "a.txt")
+    path_b = cache.get(run_id, "b.txt")
+    cache.max_bytes = 4
+
+    download = mlflow.tracking.MlflowClient.download_artifacts
+
+    def download_artifacts(self: Any, *args: Any) -> str:
+        # Another thread gets "a.txt" while "c.txt" is being downloaded.
+        cache.get(run_id, "a.txt")
+        return download(self, *args)
+
+    monkeypatch.setattr(
+        mlflow.tracking.MlflowClient, "download_artifacts", download_artifacts
+    )
+    path_c = cache.get(run_id, "c.txt")
+
+    assert os.path.exists(path_a)
+    assert not os.path.exists(path_b)
+    assert os.path.exists(path_c)
+
+
+def test_artifact_cache_restores_existing_entries(tmpdir: py.path.local) -> None:
+    with mlflow.start_run() as run:
+        lg.log_text("text", "text.txt")
+
+    ld.ArtifactCache(tmpdir.strpath).get(run.info.run_id, "text.txt")
+    assert ld.ArtifactCache(tmpdir.strpath).total_bytes == 4
+
+
+def test_fetch_artifacts(cache: ld.ArtifactCache) -> None:
+    run_ids = []
+    for i in range(5):
+        with mlflow.start_run() as run:
+            lg.log_dict({"i": i}, "config.json")
+        run_ids.append(run.info.run_id)
+
+    local_paths = ld.fetch_artifacts(run_ids, "config.json", cache, max_workers=2)
+    assert list(local_paths) == run_ids
+    assert all(os.path.exists(p) for p in local_paths.values())
+
+
+@pytest.mark.parametrize("path", ["test.json", "test.yaml"])
+def test_load_dict(cache: ld.ArtifactCache, path: str) -> None:
+    with mlflow.start_run() as run:
+        lg.log_dict({"a": 0}, path)
+
+    assert ld.load_dict(run.info.run_id, path, cache) == {"a": 0}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "feather", "parquet"])
+def test_load_df(cache: ld.ArtifactCache, fmt: str) -> None:
+    df = pd.DataFrame({"a": [0]})
+    path = "test.{}".format(fmt)
+    with mlflow.start_run() as run:
+        lg.log_df(df, path, fmt)
+
+    pd.testing.assert_frame_equal(ld.load_df(run.info.run_id, path, cache=cache), df)
+
+
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+def test_load_arrow_df(
+    cache: ld.ArtifactCache, compression: Optional[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = pd.Index(["x", "y", "z"], name="key")
+    df = pd.DataFrame({"a": [0, 1, 2], "b": [0.5, np.nan, 1.5]}, index=index)
+    with mlflow.start_run() as run:
+        lg.log_df(df, "df.arrow", fmt="arrow", compression=compression, chunk_rows=2)
+        lg.log_df(df.reset_index(), "df.feather", fmt="feather")
+
+    # Arrow files in a local artifact store are read in place.
+    monkeypatch.setattr(ld.ArtifactCache, "get", None)
+    pd.testing.assert_frame_equal(
+        ld.load_df(run.info.run_id, "df.arrow", cache=cache), df
+    )
+    pd.testing.assert_frame_equal(
+        ld.load_df(run.info.run_id, "df.feather", cache=cache), df.reset_index()
+    )
+
+
+@pytest.mark.parametrize("path", ["test.csv.gz", "test.csv.zst"])
+def test_load_compressed_df(cache: ld.ArtifactCache, path: str) -> None:
+    df = pd.DataFrame({"a": [0, 1], "b": ["x", "y"]})
+    with mlflow.start_run() as run:
+        lg.log_df(df, path)
+
+    pd.testing.assert_frame_equal(ld.load_df(run.info.run_id, path, cache=cache), df)
+
+
+def test_load_df_with_invalid_format(cache: ld.ArtifactCache) -> None:
+    with mlflow.start_run() as run:
+        lg.log_text("", "test.abc")
+
+    with pytest.raises(ValueError, match="Invalid file format: abc."):
+        ld.load_df(run.info.run_id, "test.abc", cache=cache)
+
+
+def test_load_numpy(cache: ld.ArtifactCache) -> None:
+    array = np.array([0])
+    with mlflow.start_run() as run:
+        lg.log_numpy(array, "test.npy")
+
+    np.testing.assert_array_equal(
+        ld.load_numpy(run.info.run_id, "test.npy", cache), array
+    )
+
+
+def test_load_numpy_sharded(cache: ld.ArtifactCache) -> None:
+    array = np.arange(20, dtype=np.int16).reshape(10, 2)
+    with mlflow.start_run() as run:
+        lg.log_numpy_sharded(array, "arrays/test", shard_rows=4)
+
+    loaded = ld.load_numpy_sharded(run.info.run_id, "arrays/test", cache)
+    assert loaded.dtype == np.int16
+    np.testing.assert_array_equal(loaded, array)
+
+
+def test_load_curves(cache: ld.ArtifactCache) -> None:
+    run_ids = []
+    for i in range(3):
+        with mlflow.start_run() as run:
+            lg.log_roc_curve([0, 1], [0, i], auc=i / 2, data_path="roc.npz")
+        run_ids.append(run.info.run_id)
+
+    curves = ld.load_curves(run_ids, "roc.npz", cache)
+    assert list(curves) == run_ids
+    for i, run_id in enumerate(run_ids):
+        np.testing.assert_array_equal(curves[run_id]["fpr"], [0, 1])
+        np.testing.assert_array_equal(curves[run_id]["tpr"], [0, i])
+        assert curves[run_id]["auc"] == i / 2
+
+
+def test_load_metric_histories() -> None:
+    run_ids = []
+    for i in range(3):
+        with mlflow.start_run() as run:
+            for step in range(2):
+                lg.log_metrics_flatten({"a": {"b": i + step}, "c": 0.0}, step=step)
+        run_ids.append(run.info.run_id)
+
+    df = ld.load_metric_histories(run_ids)
+    assert list(df.columns) == [
+        "run_id",
+        "key",
+        "step",
+        "timestamp",
+        "value",
+        "level_0",
+        "level_1",
+    ]
+    assert len(df) == 3 * 2 * 2
+    ab = df[df["key"] == "a.b"]
+    assert ab[["level_0", "level_1"]].drop_duplicates().values.tolist() == [["a", "b"]]
+    assert ab.groupby("run_id")["value"].sum().to_dict() == {
+        run_id: 2 * i + 1.0 for i, run_id in enumerate(run_ids)
+    }
+
+
+def test_load_metric_histories_with_experiment_ids() -> None:
+    experiment_id = mlflow.create_experiment("load_metric_histories")
+    for i in range(2):
+        with mlflow.start_run(experiment_id=experiment_id):
+            lg.log_metrics_flatten({"a": i})
+
+    df = ld.load_metric_histories(experiment_ids=[experiment_id])
+    assert sorted(df["value"]) == [0.0, 1.0]
+
+    df = ld.load_metric_histories(
+        experiment_ids=[experiment_id], filter_string="metrics.a > 0"
+    )
+    assert df["value"].tolist() == [1.0]
+
+
+def test_load_metric_histories_without_runs() -> None:
+    with pytest.raises(ValueError, match="Either `run_ids` or `experiment_ids`"):
+        ld.load_metric_histories()
+
+
+def test_load_metric_histories_with_cache(
+    tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmpdir.strpath
+    with mlflow.start_run() as finished_run:
+        lg.log_metrics_flatten({"a": 0.0})
+
+    active_run = mlflow.start_run()
+    lg.log_metrics_flatten({"b": 0.0}, step=0)
+    run_ids = [finished_run.info.run_id, active_run.info.run_id]
+
+    try:
+        df = ld.load_metric_histories(run_ids, cache_dir=cache_dir)
+        assert len(df) == 2
+
+        fetched = []
+        get_metric_history = mlflow.tracking.MlflowClient.get_metric_history
+
+        def patched(self: mlflow.tracking.MlflowClient, run_id: str, key: str) -> list:
+            fetched.append((run_id, key))
+            return get_metric_history(self, run_id, key)
+
+        monkeypatch.setattr(mlflow.tracking.MlflowClient, "get_metric_history", patched)
+        lg.log_metrics_flatten({"b": 1.0}, step=1)
+        df = ld.load_metric_histories(run_ids, cache_dir=cache_dir)
+    finally:
+        mlflow.end_run()
+
+    # Only the active run is fetched again.
+    assert fetched == [(active_run.info.run_id, "b")]
+    assert len(df) == 3
+    assert df[df["key"] == "b"]["value"].tolist() == [0.0, 1.0]
+
+
+def test_verify_artifacts(cache: ld.ArtifactCache) -> None:
+    with mlflow.start_run() as run, lg.record_manifest():
+        lg.log_text("a", "a.txt")
+        lg.log_text("b", "dir/b.txt")
+
+    manifest = ld.load_manifest(run.info.run_id, cache=cache)
+    assert manifest.columns.tolist() == ["path", "bytes", "sha256", "seconds", "format"]
+    assert manifest["path"].tolist() == ["a.txt", "dir/b.txt"]
+
+    # Corrupt an artifact before it's cached.
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    with open(os.path.join(artifacts_dir, "dir", "b.txt"), "w") as f:
+        f.write("c")
+
+    verified = ld.verify_artifacts(run.info.run_id, cache=cache)
+    assert verified["ok"].tolist() == [True, False]
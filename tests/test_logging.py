@@ -1,19 +1,33 @@
+import json
+import math
 import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import mlflow
 import numpy as np
 import pandas as pd
+import py
+import pyarrow as pa
 import pytest
 from matplotlib import pyplot as plt
+from mlflow.utils.validation import (
+    MAX_METRICS_PER_BATCH,
+    MAX_PARAM_VAL_LENGTH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+)
 from plotly import graph_objects as go
 
 from mlflow_extend import logging as lg
+from mlflow_extend import spool, stats
+from mlflow_extend.profiling import DataProfile
 from mlflow_extend.testing.utils import (
     _get_default_args,
     _read_data,
     assert_file_exists_in_artifacts,
     assert_not_conflict_with_fluent_apis,
+    list_artifacts,
 )
+from mlflow_extend.utils import file_sha256
 
 
 def test_new_apis_do_not_conflict_native_apis() -> None:
@@ -39,6 +53,120 @@ def test_log_params_flatten() -> None:
     assert loaded_run.data.params == {"a.b": "0", "a_b": "0", "d.a.b": "0"}
 
 
+@pytest.fixture
+def log_batch_calls(monkeypatch: pytest.MonkeyPatch) -> List[dict]:
+    calls: List[dict] = []
+    log_batch = mlflow.tracking.MlflowClient.log_batch
+
+    def patched(*args: Any, **kwargs: Any) -> None:
+        calls.append(kwargs)
+        log_batch(*args, **kwargs)
+
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "log_batch", patched)
+    return calls
+
+
+def test_log_params_flatten_skips_logged_params(log_batch_calls: List[dict]) -> None:
+    with mlflow.start_run() as run:
+        lg.log_params_flatten({"a": 0, "b": 1})
+        lg.log_params_flatten({"a": 0, "b": 1})
+        lg.log_params_flatten({"a": 0, "b": 1, "c": 2})
+
+    logged_keys = [[p.key for p in c["params"]] for c in log_batch_calls]
+    assert logged_keys == [["a", "b"], ["c"]]
+    loaded_run = mlflow.get_run(run.info.run_id)
+    assert loaded_run.data.params == {"a": "0", "b": "1", "c": "2"}
+
+
+def test_log_params_flatten_seeds_logged_params_from_server(
+    log_batch_calls: List[dict],
+) -> None:
+    with mlflow.start_run() as run:
+        lg.log_params_flatten({"a": 0})
+
+    # Another process (or an evicted cache) only knows the run from the server.
+    lg._logged_params._runs.clear()
+    with mlflow.start_run(run_id=run.info.run_id):
+        lg.log_params_flatten({"a": 0, "b": 1})
+
+    logged_keys = [[p.key for p in c["params"]] for c in log_batch_calls]
+    assert logged_keys == [["a"], ["b"]]
+
+
+def test_log_params_flatten_bounds_cached_runs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lg, "_MAX_CACHED_RUNS", 2)
+    run_ids = []
+    for _ in range(3):
+        with mlflow.start_run() as run:
+            lg.log_params_flatten({"a": 0})
+        run_ids.append(run.info.run_id)
+
+    assert [run_id in lg._logged_params for run_id in run_ids] == [False, True, True]
+
+
+def test_log_params_flatten_in_batches(log_batch_calls: List[dict]) -> None:
+    params = {"p{}".format(i): i for i in range(MAX_PARAMS_TAGS_PER_BATCH * 2 + 1)}
+    with mlflow.start_run() as run:
+        lg.log_params_flatten(params, max_workers=2)
+
+    assert sorted(len(c["params"]) for c in log_batch_calls) == [
+        1,
+        MAX_PARAMS_TAGS_PER_BATCH,
+        MAX_PARAMS_TAGS_PER_BATCH,
+    ]
+    assert len(mlflow.get_run(run.info.run_id).data.params) == len(params)
+
+
+def test_log_params_flatten_truncates_long_values() -> None:
+    with mlflow.start_run() as run:
+        lg.log_params_flatten({"a": "x" * (MAX_PARAM_VAL_LENGTH + 1)})
+
+    loaded_run = mlflow.get_run(run.info.run_id)
+    assert loaded_run.data.params == {"a": "x" * MAX_PARAM_VAL_LENGTH}
+
+
+def test_log_params_flatten_logs_long_values_as_artifact() -> None:
+    long_value = "x" * (MAX_PARAM_VAL_LENGTH + 1)
+    with mlflow.start_run() as run:
+        lg.log_params_flatten({"a": long_value, "b": 0}, long_values="artifact")
+        lg.log_params_flatten({"c": long_value}, long_values="artifact")
+        assert_file_exists_in_artifacts(run, "long_params.json")
+
+    loaded_run = mlflow.get_run(run.info.run_id)
+    assert loaded_run.data.params == {"b": "0"}
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    loaded_data = _read_data(os.path.join(artifacts_dir, "long_params.json"))
+    assert loaded_data == {"a": long_value, "c": long_value}
+
+
+def test_log_params_flatten_seeds_long_params_from_artifact() -> None:
+    long_value = "x" * (MAX_PARAM_VAL_LENGTH + 1)
+    with mlflow.start_run() as run:
+        lg.log_params_flatten({"a": long_value}, long_values="artifact")
+        lg._long_params._runs.clear()
+        lg.log_params_flatten({"c": long_value}, long_values="artifact")
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    loaded_data = _read_data(os.path.join(artifacts_dir, "long_params.json"))
+    assert loaded_data == {"a": long_value, "c": long_value}
+
+
+def test_log_params_flatten_long_values_under_spool(tmpdir: py.path.local) -> None:
+    long_value = "x" * (MAX_PARAM_VAL_LENGTH + 1)
+    with spool.spool(tmpdir.strpath):
+        with pytest.raises(RuntimeError, match="No active run."):
+            lg.log_params_flatten({"a": long_value}, long_values="artifact")
+    assert mlflow.active_run() is None
+
+
+def test_log_params_flatten_with_invalid_long_values() -> None:
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Invalid value for `long_values`: abc."):
+            lg.log_params_flatten({"a": 0}, long_values="abc")
+
+
 def test_log_metrics_flatten() -> None:
     with mlflow.start_run() as run:
         metrics = {"a": {"b": 0.0}}
@@ -50,6 +178,149 @@ def test_log_metrics_flatten() -> None:
     assert loaded_run.data.metrics == {"a.b": 0.0, "a_b": 0.0, "d.a.b": 0.0}
 
 
+def _get_metric_history(run_id: str) -> Dict[str, List[Tuple[int, float]]]:
+    client = mlflow.tracking.MlflowClient()
+    return {
+        key: [(m.step, m.value) for m in client.get_metric_history(run_id, key)]
+        for key in mlflow.get_run(run_id).data.metrics
+    }
+
+
+def test_log_metrics_flatten_with_numpy_array() -> None:
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(np.array([0.1, 0.2]), step=1)
+        lg.log_metrics_flatten(np.array([0.3]), parent_key="f1", labels=["a"])
+
+    assert _get_metric_history(run.info.run_id) == {
+        "0": [(1, 0.1)],
+        "1": [(1, 0.2)],
+        "f1.a": [(0, 0.3)],
+    }
+
+
+def test_log_metrics_flatten_with_2d_numpy_array() -> None:
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Only 1D arrays are supported."):
+            lg.log_metrics_flatten(np.zeros((2, 2)))
+
+
+def test_log_metrics_flatten_with_series() -> None:
+    index = pd.MultiIndex.from_tuples([("a", "x"), ("a", "y")])
+    series = pd.Series([0.1, 0.2], index=index)
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(series, step=2, sep="_")
+
+    assert _get_metric_history(run.info.run_id) == {
+        "a_x": [(2, 0.1)],
+        "a_y": [(2, 0.2)],
+    }
+
+
+def test_log_metrics_flatten_with_series_with_step_level() -> None:
+    index = pd.MultiIndex.from_product([[0, 1], ["a", "b"]], names=["step", "key"])
+    series = pd.Series([0.0, 1.0, 2.0, 3.0], index=index)
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(series)
+
+    assert _get_metric_history(run.info.run_id) == {
+        "a": [(0, 0.0), (1, 2.0)],
+        "b": [(0, 1.0), (1, 3.0)],
+    }
+
+
+def test_log_metrics_flatten_with_series_with_only_step_level() -> None:
+    series = pd.Series([0.5, 0.4], index=pd.Index([0, 1], name="step"))
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(series, parent_key="loss")
+        lg.log_metrics_flatten(series.rename("acc"), parent_key="train")
+
+    assert _get_metric_history(run.info.run_id) == {
+        "loss": [(0, 0.5), (1, 0.4)],
+        "train.acc": [(0, 0.5), (1, 0.4)],
+    }
+
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="must have a name or `parent_key`"):
+            lg.log_metrics_flatten(series)
+
+
+def test_log_metrics_flatten_with_ragged_series() -> None:
+    index = pd.MultiIndex.from_tuples(
+        [(0, "a"), (0, "b"), (1, "a"), (2, "b")], names=["step", "key"]
+    )
+    series = pd.Series([0.0, 1.0, 2.0, 3.0], index=index)
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(series)
+
+    assert _get_metric_history(run.info.run_id) == {
+        "a": [(0, 0.0), (1, 2.0)],
+        "b": [(0, 1.0), (2, 3.0)],
+    }
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pd.Index(["x", "y"]),
+        pd.date_range("2020-01-01", periods=2),
+        pd.Index([0.0, 0.5]),
+    ],
+)
+def test_log_metrics_flatten_with_non_integer_steps(index: pd.Index) -> None:
+    df = pd.DataFrame({"loss": [1.0, 0.5]}, index=index)
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Steps must be integers"):
+            lg.log_metrics_flatten(df)
+
+
+@pytest.mark.parametrize("step_column", [True, False])
+def test_log_metrics_flatten_with_dataframe(step_column: bool) -> None:
+    df = pd.DataFrame({"loss": [1.0, 0.5], "acc": [0.1, 0.2]}, index=[3, 4])
+    if step_column:
+        df = df.reset_index(drop=True).assign(step=[3, 4])
+
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(df, parent_key="train")
+
+    assert _get_metric_history(run.info.run_id) == {
+        "train.loss": [(3, 1.0), (4, 0.5)],
+        "train.acc": [(3, 0.1), (4, 0.2)],
+    }
+
+
+def test_log_metrics_flatten_with_xarray_like() -> None:
+    class DataArray:
+        dims = ("class",)
+
+        def to_series(self) -> pd.Series:
+            return pd.Series([0.5], index=pd.Index(["cat"], name="class"))
+
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(DataArray())
+
+    assert _get_metric_history(run.info.run_id) == {"cat": [(0, 0.5)]}
+
+
+def test_log_metrics_flatten_with_invalid_type() -> None:
+    with mlflow.start_run():
+        with pytest.raises(TypeError, match="Invalid metrics type"):
+            lg.log_metrics_flatten([0.1])
+
+
+def test_log_metrics_flatten_in_batches(log_batch_calls: List[dict]) -> None:
+    metrics = {"m{}".format(i): i for i in range(MAX_METRICS_PER_BATCH * 2 + 1)}
+    with mlflow.start_run() as run:
+        lg.log_metrics_flatten(metrics, step=1, max_workers=2)
+
+    assert sorted(len(c["metrics"]) for c in log_batch_calls) == [
+        1,
+        MAX_METRICS_PER_BATCH,
+        MAX_METRICS_PER_BATCH,
+    ]
+    loaded_run = mlflow.get_run(run.info.run_id)
+    assert loaded_run.data.metrics == {k: float(v) for k, v in metrics.items()}
+
+
 def test_log_plt_figure() -> None:
     fig, ax = plt.subplots()
     ax.plot([0, 1], [0, 1])
@@ -59,6 +330,47 @@ def test_log_plt_figure() -> None:
         assert_file_exists_in_artifacts(run, path)
 
 
+@pytest.mark.parametrize("profile", ["default", "preview", "high"])
+@pytest.mark.parametrize("fmt", ["png", "webp", "svg", "pdf"])
+def test_log_plt_figure_with_profile(profile: str, fmt: str) -> None:
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    with mlflow.start_run() as run:
+        path = "test.{}".format(fmt)
+        lg.log_plt_figure(fig, path, profile=profile)
+        assert_file_exists_in_artifacts(run, path)
+
+
+def test_log_plt_figure_with_max_bytes() -> None:
+    fig, ax = plt.subplots()
+    ax.plot(np.random.rand(1000))
+    max_bytes = 10000
+    with mlflow.start_run() as run:
+        path = "test.png"
+        lg.log_plt_figure(fig, path, profile="high", max_bytes=max_bytes)
+        assert_file_exists_in_artifacts(run, path)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert os.path.getsize(os.path.join(artifacts_dir, path)) <= max_bytes
+
+
+def test_log_plt_figure_with_unreachable_max_bytes() -> None:
+    fig, ax = plt.subplots()
+    ax.plot(np.random.rand(1000))
+    with mlflow.start_run() as run:
+        with pytest.warns(UserWarning, match="exceeds `max_bytes`"):
+            lg.log_plt_figure(fig, "test.png", max_bytes=100)
+        # The figure is logged anyway.
+        assert_file_exists_in_artifacts(run, "test.png")
+
+
+def test_log_plt_figure_with_invalid_profile() -> None:
+    fig, ax = plt.subplots()
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Invalid profile: abc."):
+            lg.log_plt_figure(fig, "test.png", profile="abc")
+
+
 def test_log_plotly_figure() -> None:
     fig = go.Figure(data=[go.Bar(x=[1, 2, 3], y=[1, 3, 2])])
     with mlflow.start_run() as run:
@@ -141,7 +453,7 @@ def test_log_dict_with_invalid_format() -> None:
             lg.log_dict(data, path, fmt)
 
 
-@pytest.mark.parametrize("fmt", ["csv", "feather"])
+@pytest.mark.parametrize("fmt", ["csv", "feather", "parquet"])
 def test_log_df(fmt: str) -> None:
     df = pd.DataFrame({"a": [0]})
     path = "test.{}".format(fmt)
@@ -151,11 +463,30 @@ def test_log_df(fmt: str) -> None:
         assert_file_exists_in_artifacts(run, path)
 
     artifacts_dir = run.info.artifact_uri.replace("file://", "")
-    readers = {"csv": pd.read_csv, "feather": pd.read_feather}
+    readers = {
+        "csv": pd.read_csv,
+        "feather": pd.read_feather,
+        "parquet": pd.read_parquet,
+    }
     loaded_df = readers[fmt](os.path.join(artifacts_dir, path))
     pd.testing.assert_frame_equal(loaded_df, df)
 
 
+@pytest.mark.parametrize("compression", ["infer", None, "lz4", "zstd"])
+def test_log_df_arrow(compression: Optional[str]) -> None:
+    index = pd.MultiIndex.from_tuples([("a", 0), ("a", 1), ("b", 0)], names=["k", "i"])
+    df = pd.DataFrame({"x": [0.0, 1.0, 2.0], "s": ["p", "q", None]}, index=index)
+    with mlflow.start_run() as run:
+        lg.log_df(
+            df, "df.feather", fmt="feather", compression=compression, chunk_rows=2
+        )
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    reader = pa.ipc.open_file(os.path.join(artifacts_dir, "df.feather"))
+    assert reader.num_record_batches == 2
+    pd.testing.assert_frame_equal(reader.read_pandas(), df)
+
+
 def test_log_df_with_invalid_format() -> None:
     df = pd.DataFrame({"a": [0]})
     fmt = "abc"
@@ -166,6 +497,137 @@ def test_log_df_with_invalid_format() -> None:
             lg.log_df(df, path, fmt)
 
 
+@pytest.mark.parametrize(
+    "path, compression",
+    [("df.csv", None), ("df.csv.gz", "gzip"), ("df.csv.zst", "zstd")],
+)
+def test_log_df_with_iterable(path: str, compression: Optional[str]) -> None:
+    def batches() -> Iterator[Any]:
+        for i in range(3):
+            yield pd.DataFrame({"a": [i, i], "b": ["x", "y"]})
+        yield pa.RecordBatch.from_pandas(pd.DataFrame({"a": [3], "b": ["z"]}))
+
+    with mlflow.start_run() as run:
+        lg.log_df(batches(), path)
+        lg.log_df(batches(), "explicit.csv", compression=compression)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    expected = pd.DataFrame({"a": [0, 0, 1, 1, 2, 2, 3], "b": list("xyxyxyz")})
+    for name in [path, "explicit.csv"]:
+        local_path = os.path.join(artifacts_dir, name)
+        with pa.input_stream(local_path, compression=compression) as f:
+            pd.testing.assert_frame_equal(pd.read_csv(f), expected)
+
+
+def test_log_df_in_chunks() -> None:
+    df = pd.DataFrame({"a": np.arange(10), "b": np.arange(10) / 2})
+    with mlflow.start_run() as run:
+        lg.log_df(df, "df.csv", chunk_rows=3)
+        lg.log_df(df.iloc[:0], "empty.csv")
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    loaded_df = pd.read_csv(os.path.join(artifacts_dir, "df.csv"))
+    pd.testing.assert_frame_equal(loaded_df, df)
+    loaded_df = pd.read_csv(os.path.join(artifacts_dir, "empty.csv"))
+    assert loaded_df.columns.tolist() == ["a", "b"]
+    assert len(loaded_df) == 0
+
+
+def test_log_df_with_invalid_iterable() -> None:
+    df = pd.DataFrame({"a": [0]})
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Only CSV supports iterables"):
+            lg.log_df([df], "df.parquet", fmt="parquet")
+        with pytest.raises(ValueError, match="must have the same columns"):
+            lg.log_df([df, df.rename(columns={"a": "b"})], "df.csv")
+        with pytest.raises(ValueError, match="No dataframes to log"):
+            lg.log_df([], "df.csv")
+        with pytest.raises(ValueError, match="Invalid compression: abc"):
+            lg.log_df([df], "df.csv", compression="abc")
+
+
+def test_log_df_with_failing_sink(monkeypatch: pytest.MonkeyPatch) -> None:
+    def open_file(*args: Any, **kwargs: Any) -> None:
+        raise OSError("disk full")
+
+    def batches() -> Iterator[pd.DataFrame]:
+        # More chunks than the queue between the encoder and the writer holds.
+        for i in range(lg._CSV_QUEUE_SIZE * 3):
+            yield pd.DataFrame({"a": [i]})
+
+    monkeypatch.setattr(lg.pa, "OSFile", open_file)
+    with mlflow.start_run():
+        with pytest.raises(OSError, match="disk full"):
+            lg.log_df(batches(), "df.csv")
+
+
+def _profile_data() -> pd.DataFrame:
+    rs = np.random.RandomState(0)
+    return pd.DataFrame(
+        {
+            "x": rs.randn(1000),
+            "n": rs.randint(0, 10, 1000),
+            "s": rs.choice(["a", "b"], 1000),
+        }
+    )
+
+
+@pytest.mark.parametrize("as_chunks", [False, True])
+def test_log_data_profile(as_chunks: bool) -> None:
+    df = _profile_data()
+    data = np.array_split(df, 4) if as_chunks else df
+    with mlflow.start_run() as run:
+        lg.log_data_profile(data)
+        assert_file_exists_in_artifacts(run, "data_profile_histograms.png")
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    profile = _read_data(os.path.join(artifacts_dir, "data_profile.json"))
+    assert list(profile) == ["x", "n", "s"]
+    assert profile["x"]["count"] == 1000
+    assert profile["x"]["mean"] == pytest.approx(df["x"].mean())
+    assert profile["n"]["var"] == pytest.approx(df["n"].var())
+    assert profile["s"]["distinct"] == pytest.approx(2, rel=0.01)
+    assert profile["s"]["mean"] is None
+
+
+def test_log_data_profile_parquet() -> None:
+    df = _profile_data()
+    profile = DataProfile().update(df.iloc[:500])
+    profile.merge(DataProfile().update(df.iloc[500:]))
+    with mlflow.start_run() as run:
+        lg.log_data_profile(profile, "profile.parquet", histogram_path=None)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert os.listdir(artifacts_dir) == ["profile.parquet"]
+    result = pd.read_parquet(os.path.join(artifacts_dir, "profile.parquet"))
+    assert result["column"].tolist() == ["x", "n", "s"]
+    assert result["min"].iloc[0] == df["x"].min()
+
+
+def test_log_data_profile_with_invalid_format() -> None:
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Invalid file format: csv."):
+            lg.log_data_profile(_profile_data(), "profile.csv")
+
+
+def test_log_drift_report(log_batch_calls: List[dict]) -> None:
+    rs = np.random.RandomState(0)
+    ref = pd.DataFrame(rs.randn(100, 400)).add_prefix("f")
+    ref["c"] = "a"
+    cur = ref.copy()
+    cur["f0"] += 1
+    with mlflow.start_run() as run:
+        lg.log_drift_report(ref, cur)
+        assert_file_exists_in_artifacts(run, "drift_report.png")
+
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    # The KS statistic of the categorical column is NaN and isn't logged.
+    assert len(metrics) == 3 * 400 + 2
+    assert metrics["drift.ks.f0"] > 0.3
+    assert metrics["drift.psi.f1"] == 0
+    assert len(log_batch_calls) == math.ceil(len(metrics) / MAX_METRICS_PER_BATCH)
+
+
 @pytest.mark.parametrize("text", ["test", ""])
 def test_log_text(text: str) -> None:
     path = "test.txt"
@@ -192,6 +654,50 @@ def test_log_numpy() -> None:
     np.testing.assert_array_equal(loaded_array, array)
 
 
+@pytest.mark.parametrize("shape", [(0,), (7,), (7, 3)])
+def test_log_numpy_sharded(shape: Tuple[int, ...]) -> None:
+    arr = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+    with mlflow.start_run() as run:
+        lg.log_numpy_sharded(arr, "arr", shard_rows=3)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    index = _read_data(os.path.join(artifacts_dir, "arr", "index.json"))
+    assert index["shape"] == list(shape)
+    assert len(index["shards"]) == max(-(-shape[0] // 3), 1)
+    shards = [
+        np.load(os.path.join(artifacts_dir, "arr", shard))["arr"]
+        for shard in index["shards"]
+    ]
+    np.testing.assert_array_equal(np.concatenate(shards), arr)
+
+
+def test_log_corr_matrix() -> None:
+    df = pd.DataFrame(np.random.rand(10, 5), columns=list("abcde"))
+    with mlflow.start_run() as run:
+        default_path = _get_default_args(lg.log_corr_matrix)["path"]
+        lg.log_corr_matrix(df)
+        assert_file_exists_in_artifacts(run, default_path)
+
+    with mlflow.start_run() as run:
+        path = "corr.png"
+        lg.log_corr_matrix(df, path, cluster=True)
+        assert_file_exists_in_artifacts(run, path)
+
+
+def test_log_corr_matrix_with_tiles() -> None:
+    df = pd.DataFrame(np.random.rand(10, 5), columns=list("abcde"))
+    with mlflow.start_run() as run:
+        lg.log_corr_matrix(df, "corr.png", cluster=True, tile_size=2)
+        for path in ["corr_tiles/0_0.png", "corr_tiles/1_2.png", "corr_tiles/2_2.png"]:
+            assert_file_exists_in_artifacts(run, path)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    corr = np.load(os.path.join(artifacts_dir, "corr.npy"))
+    columns = _read_data(os.path.join(artifacts_dir, "corr_columns.json"))["columns"]
+    expected = df[columns].corr().to_numpy()
+    np.testing.assert_allclose(corr, expected, atol=1e-5)
+
+
 def test_log_confusion_matrix() -> None:
     with mlflow.start_run() as run:
         default_path = _get_default_args(lg.log_confusion_matrix)["path"]
@@ -204,6 +710,59 @@ def test_log_confusion_matrix() -> None:
         assert_file_exists_in_artifacts(run, path)
 
 
+def test_log_classification_report() -> None:
+    with mlflow.start_run() as run:
+        lg.log_classification_report(y_true=["a", "b", "b"], y_pred=["a", "a", "b"])
+        assert_file_exists_in_artifacts(run, "classification_report.csv")
+        assert_file_exists_in_artifacts(run, "confusion_matrix.png")
+
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    assert len(metrics) == 3 * 5
+    assert metrics["precision.a"] == 0.5
+    assert metrics["recall.b"] == 0.5
+    assert metrics["f1.macro_avg"] == pytest.approx(2 / 3)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    report = pd.read_csv(os.path.join(artifacts_dir, "classification_report.csv"))
+    averages = ["macro_avg", "micro_avg", "weighted_avg"]
+    assert report["label"].tolist() == ["a", "b"] + averages
+    assert report.columns.tolist() == ["label", "precision", "recall", "f1", "support"]
+
+
+def test_log_classification_report_with_cm() -> None:
+    with mlflow.start_run() as run:
+        lg.log_classification_report([[1, 0], [1, 1]], parent_key="val", cm_path=None)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert os.listdir(artifacts_dir) == ["classification_report.csv"]
+
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    assert metrics["val.precision.0"] == 0.5
+    assert metrics["val.recall.1"] == 0.5
+
+
+def test_log_classification_report_sparse(log_batch_calls: List[dict]) -> None:
+    pytest.importorskip("scipy")
+    y = np.arange(2000) % 500
+    with mlflow.start_run() as run:
+        lg.log_classification_report(y_true=y, y_pred=y, sparse=True)
+        assert_file_exists_in_artifacts(run, "classification_report.csv")
+
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    assert len(metrics) == 3 * (500 + 3)
+    assert len(log_batch_calls) == math.ceil(len(metrics) / MAX_METRICS_PER_BATCH)
+    assert metrics["f1.499"] == 1.0
+    # Too many labels to draw a readable confusion matrix.
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert not os.path.exists(os.path.join(artifacts_dir, "confusion_matrix.png"))
+
+
+def test_log_classification_report_requires_labels() -> None:
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="Either `cm` or both"):
+            lg.log_classification_report(y_true=[0, 1])
+
+
 def test_log_feature_importance() -> None:
     default_path = _get_default_args(lg.log_feature_importance)["path"]
     with mlflow.start_run() as run:
@@ -228,6 +787,71 @@ def test_log_feature_importance_with_limit(limit: int) -> None:
         assert_file_exists_in_artifacts(run, default_path)
 
 
+def test_log_threshold_sweep() -> None:
+    with mlflow.start_run() as run:
+        lg.log_threshold_sweep([0, 1, 1, 0], [0.1, 0.8, 0.4, 0.3])
+        assert_file_exists_in_artifacts(run, "threshold_sweep.csv")
+        assert_file_exists_in_artifacts(run, "threshold_sweep.png")
+
+
+def test_log_threshold_sweep_max_rows() -> None:
+    rs = np.random.RandomState(0)
+    y_true = rs.randint(0, 2, 5000)
+    y_score = rs.rand(5000)
+    with mlflow.start_run() as run:
+        lg.log_threshold_sweep(y_true, y_score, max_rows=100, plot_path=None)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert os.listdir(artifacts_dir) == ["threshold_sweep.csv"]
+    sweep = pd.read_csv(os.path.join(artifacts_dir, "threshold_sweep.csv"))
+    assert len(sweep) <= 102
+    assert sweep["threshold"].is_monotonic_decreasing
+    # The best thresholds must survive downsampling.
+    full = stats.threshold_sweep(y_true, y_score)
+    assert sweep["f1"].max() == pytest.approx(full["f1"].max())
+    assert sweep["cost"].min() == full["cost"].min()
+
+
+def test_log_calibration_curve(log_batch_calls: List[dict]) -> None:
+    y_prob = np.linspace(0, 1, 101)
+    with mlflow.start_run() as run:
+        lg.log_calibration_curve(y_prob > 0.5, y_prob, parent_key="val")
+        assert_file_exists_in_artifacts(run, "calibration_curve.png")
+
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    bins = stats.CalibrationBins().update(y_prob > 0.5, y_prob)
+    assert metrics == {"val.ece": bins.ece, "val.brier": bins.brier}
+    assert len(log_batch_calls) == 1
+
+
+def test_log_attribution_summary() -> None:
+    values = np.random.RandomState(0).randn(50, 3)
+    with mlflow.start_run() as run:
+        lg.log_attribution_summary(values, ["a", "b", "c"], shard_rows=20)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    summary = pd.read_csv(os.path.join(artifacts_dir, "attribution_summary.csv"))
+    assert summary["feature"].tolist() == ["a", "b", "c"]
+    assert os.path.exists(os.path.join(artifacts_dir, "attribution_summary.png"))
+    assert sorted(os.listdir(os.path.join(artifacts_dir, "attributions"))) == [
+        "00000.npz",
+        "00001.npz",
+        "00002.npz",
+        "index.json",
+    ]
+
+
+def test_log_attribution_summary_without_array() -> None:
+    with mlflow.start_run() as run:
+        lg.log_attribution_summary(np.zeros((5, 2)), array_path=None)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    assert sorted(os.listdir(artifacts_dir)) == [
+        "attribution_summary.csv",
+        "attribution_summary.png",
+    ]
+
+
 def test_log_roc_curve() -> None:
     default_path = _get_default_args(lg.log_roc_curve)["path"]
     with mlflow.start_run() as run:
@@ -243,6 +867,10 @@ def test_log_roc_curve() -> None:
         lg.log_roc_curve([0, 1], [0, 1], path=path)
         assert_file_exists_in_artifacts(run, path)
 
+    with mlflow.start_run() as run:
+        lg.log_roc_curve([0, 1], [0, 1], 0.5, data_path="roc.npz")
+        assert_file_exists_in_artifacts(run, "roc.npz")
+
 
 def test_log_pr_curve() -> None:
     default_path = _get_default_args(lg.log_pr_curve)["path"]
@@ -258,3 +886,113 @@ def test_log_pr_curve() -> None:
         path = "pr.png"
         lg.log_pr_curve([1, 0], [1, 0], path=path)
         assert_file_exists_in_artifacts(run, path)
+
+    with mlflow.start_run() as run:
+        lg.log_pr_curve([1, 0], [1, 0], data_path="pr.npz")
+        assert_file_exists_in_artifacts(run, "pr.npz")
+
+
+@pytest.mark.parametrize("func", [lg.log_roc_curves, lg.log_pr_curves])
+def test_log_roc_and_pr_curves(func: Callable) -> None:
+    default_path = _get_default_args(func)["path"]
+    with mlflow.start_run() as run:
+        func({"a": ([0, 1], [0, 1]), "b": ([0, 0, 1], [0, 1, 1])})
+        assert_file_exists_in_artifacts(run, default_path)
+
+
+def test_log_manifest() -> None:
+    with mlflow.start_run() as run:
+        with lg.record_manifest():
+            lg.log_dict({"a": 0}, "dict.json")
+            lg.log_dict({"a": 1}, "dict.json")
+            lg.log_numpy_sharded(np.arange(10), "arrays", shard_rows=5)
+            lg.log_manifest("checkpoint.json")
+            lg.log_text("text", "text.txt")
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    with open(os.path.join(artifacts_dir, "checkpoint.json")) as f:
+        manifest = json.load(f)
+    entries = manifest["artifacts"]
+    assert manifest["version"] == 1
+    assert [e["path"] for e in entries] == [
+        "arrays/00000.npz",
+        "arrays/00001.npz",
+        "arrays/index.json",
+        "dict.json",
+    ]
+    for e in entries:
+        local_path = os.path.join(artifacts_dir, e["path"])
+        assert e["bytes"] == os.path.getsize(local_path)
+        assert e["sha256"] == file_sha256(local_path)
+        assert e["seconds"] >= 0
+        assert e["format"] == os.path.splitext(e["path"])[-1].lstrip(".")
+
+    # The manifest logged on exit includes the artifacts logged since then.
+    with open(os.path.join(artifacts_dir, "manifest.json")) as f:
+        entries = json.load(f)["artifacts"]
+    assert [e["path"] for e in entries][-1] == "text.txt"
+    assert "checkpoint.json" not in [e["path"] for e in entries]
+    assert lg._manifests == {}
+
+
+def test_artifacts_are_not_recorded_without_record_manifest(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def file_sha256(path: str) -> str:
+        raise AssertionError("Artifacts shouldn't be hashed.")
+
+    monkeypatch.setattr(lg, "file_sha256", file_sha256)
+    with mlflow.start_run() as run:
+        lg.log_text("text", "text.txt")
+        # Nothing is logged if no artifacts are recorded.
+        with lg.record_manifest():
+            pass
+
+    assert lg._manifests == {}
+    assert list_artifacts(run.info.run_id) == ["text.txt"]
+
+
+def test_log_manifest_seeds_entries_from_existing_manifest(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with mlflow.start_run() as run:
+        with lg.record_manifest():
+            lg.log_df(pd.DataFrame({"a": [0]}), "df.csv.gz")
+
+    paths = []
+    load_json_artifact = lg._load_json_artifact
+
+    def patched(run_id: str, path: str) -> Any:
+        paths.append(path)
+        return load_json_artifact(run_id, path)
+
+    monkeypatch.setattr(lg, "_load_json_artifact", patched)
+    # Another process only knows the run from the server.
+    with mlflow.start_run(run_id=run.info.run_id):
+        with lg.record_manifest():
+            lg.log_text("text", "text.txt")
+            # The existing manifest is only fetched when the manifest is logged.
+            assert paths == []
+    assert paths == ["manifest.json"]
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    with open(os.path.join(artifacts_dir, "manifest.json")) as f:
+        entries = json.load(f)["artifacts"]
+    assert [(e["path"], e["format"]) for e in entries] == [
+        ("df.csv.gz", "csv"),
+        ("text.txt", "txt"),
+    ]
+
+
+def test_log_manifest_with_spool(tmpdir: py.path.local) -> None:
+    journal_dir = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(journal_dir):
+            with lg.record_manifest():
+                lg.log_text("text", "text.txt")
+        spool.replay(journal_dir)
+
+    artifacts_dir = run.info.artifact_uri.replace("file://", "")
+    with open(os.path.join(artifacts_dir, "manifest.json")) as f:
+        entries = json.load(f)["artifacts"]
+    assert [(e["path"], e["bytes"]) for e in entries] == [("text.txt", 4)]
@@ -1,8 +1,12 @@
+from typing import Callable
+
 import numpy as np
+import pandas as pd
 import py
 import pytest
 
 from mlflow_extend import plotting as mplt
+from mlflow_extend import stats
 from mlflow_extend.testing.utils import assert_is_figure
 from mlflow_extend.typing import ArrayLike
 
@@ -21,6 +25,13 @@ def test_corr_matrix(tmpdir: py.path.local, corr: ArrayLike) -> None:
     assert_is_figure(fig)
 
 
+@pytest.mark.parametrize("raster", [None, True, False])
+def test_corr_matrix_with_raster(tmpdir: py.path.local, raster: bool) -> None:
+    df = pd.DataFrame(np.random.rand(10, 60))
+    fig = mplt.corr_matrix(df.corr(), raster=raster)
+    assert_is_figure(fig)
+
+
 def test_feature_importance(tmpdir: py.path.local) -> None:
     features = ["a", "b", "c"]
     importances = [1, 2, 3]
@@ -61,3 +72,65 @@ def test_pr_curve(tmpdir: py.path.local) -> None:
     assert_is_figure(fig)
 
     fig = mplt.pr_curve([1, 2, 3], [1, 2, 3], 0.5)
+
+
+@pytest.mark.parametrize("num_curves", [1, 3, 30])
+@pytest.mark.parametrize("func", [mplt.roc_curves, mplt.pr_curves])
+def test_roc_and_pr_curves(func: Callable, num_curves: int) -> None:
+    curves = {i: ([0, 0.5, 1], [0, i / num_curves, 1]) for i in range(num_curves)}
+    fig = func(curves)
+    assert_is_figure(fig)
+    ax = fig.axes[0]
+    assert len(ax.collections) == 1
+    assert len(ax.collections[0].get_segments()) == num_curves
+    assert (ax.get_legend() is not None) == (num_curves <= mplt._MAX_LEGEND_ITEMS)
+
+
+def test_threshold_sweep() -> None:
+    sweep = stats.threshold_sweep([0, 1, 1, 0], [0.1, 0.8, 0.4, 0.3])
+    fig = mplt.threshold_sweep(sweep)
+    assert_is_figure(fig)
+
+
+def test_calibration_curve() -> None:
+    y_prob = np.linspace(0, 1, 101)
+    assert_is_figure(mplt.calibration_curve(y_prob > 0.5, y_prob))
+    bins = stats.CalibrationBins(n_bins=5).update(y_prob > 0.5, y_prob)
+    assert_is_figure(mplt.calibration_curve(bins=bins))
+
+
+def test_calibration_curve_requires_data() -> None:
+    with pytest.raises(ValueError, match="Either `bins` or both"):
+        mplt.calibration_curve(y_true=[0, 1])
+
+
+def test_attribution_summary() -> None:
+    values = np.random.RandomState(0).randn(100, 30)
+    summary, sample = stats.attribution_summary(values)
+    fig = mplt.attribution_summary(summary, sample, limit=5, max_points=50)
+    assert_is_figure(fig)
+    assert len(fig.axes[0].get_yticklabels()) == 5
+
+
+def test_swarm_offsets() -> None:
+    offsets = mplt._swarm_offsets(np.array([0.0, 0.0, 0.0, 1.0, np.nan]), num_bins=2)
+    assert sorted(offsets[:3]) == [-1 / 3, 0, 1 / 3]
+    assert offsets[3] == 0
+    assert offsets[4] == 0
+
+
+@pytest.mark.parametrize("num", [1, 5])
+def test_histograms(num: int) -> None:
+    x = np.random.RandomState(0).randn(100)
+    fig = mplt.histograms({i: np.histogram(x) for i in range(num)}, ncols=4)
+    assert_is_figure(fig)
+    assert len(fig.axes) == num
+
+
+def test_drift_heatmap() -> None:
+    report = pd.DataFrame(
+        {"psi": np.arange(40.0), "ks": np.nan, "js": 0.0}, index=range(40)
+    )
+    fig = mplt.drift_heatmap(report, limit=10)
+    assert_is_figure(fig)
+    assert [t.get_text() for t in fig.axes[0].get_yticklabels()][0] == "39"
@@ -0,0 +1,142 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlflow_extend.profiling import DataProfile, HyperLogLog, QuantileSketch
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.random.RandomState(0).randn(10000),
+        np.random.RandomState(0).lognormal(size=10000),
+        np.r_[np.zeros(100), np.arange(1, 101)],
+    ],
+)
+def test_quantile_sketch(values: np.ndarray) -> None:
+    qs = [0.01, 0.1, 0.5, 0.9, 0.99]
+    sketch = QuantileSketch(relative_accuracy=0.01).update(values)
+    result = sketch.quantile(qs)
+    # The value at the sketched rank is within the relative accuracy.
+    expected = np.quantile(values, qs, interpolation="lower")
+    upper = np.quantile(values, qs, interpolation="higher")
+    assert np.all(
+        (np.abs(result) >= np.minimum(np.abs(expected), np.abs(upper)) * 0.99 - 1e-12)
+        & (np.abs(result) <= np.maximum(np.abs(expected), np.abs(upper)) * 1.01 + 1e-12)
+    )
+
+
+def test_quantile_sketch_ignores_nan_and_inf() -> None:
+    sketch = QuantileSketch().update([np.nan, np.inf, 1.0])
+    assert sketch.count == 1
+    assert sketch.quantile(0.5) == pytest.approx(1.0, rel=0.01)
+
+
+def test_quantile_sketch_empty() -> None:
+    assert np.isnan(QuantileSketch().quantile([0.5])).all()
+
+
+def test_quantile_sketch_merge() -> None:
+    values = np.random.RandomState(0).randn(1000)
+    whole = QuantileSketch().update(values)
+    merged = QuantileSketch().update(values[:300])
+    merged.merge(QuantileSketch().update(values[300:]))
+    pd.testing.assert_series_equal(merged.positive, whole.positive)
+    pd.testing.assert_series_equal(merged.negative, whole.negative)
+    assert merged.count == whole.count
+
+    with pytest.raises(ValueError, match="different accuracies"):
+        merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_quantile_sketch_histogram() -> None:
+    values = np.random.RandomState(0).rand(1000) * 10
+    counts, edges = QuantileSketch().update(values).histogram(10, (0, 10))
+    expected, _ = np.histogram(values, 10, (0, 10))
+    assert counts.sum() == 1000
+    assert np.abs(counts - expected).max() <= 30
+
+
+@pytest.mark.parametrize("cardinality", [10, 1000, 100000])
+def test_hyperloglog(cardinality: int) -> None:
+    values = pd.Series(np.arange(200000) % cardinality).astype(str)
+    estimate = HyperLogLog().update(values).estimate()
+    assert estimate == pytest.approx(cardinality, rel=0.03)
+
+
+def test_hyperloglog_merge() -> None:
+    a = HyperLogLog().update(pd.Series(np.arange(5000)))
+    b = HyperLogLog().update(pd.Series(np.arange(2500, 7500)))
+    whole = HyperLogLog().update(pd.Series(np.arange(7500)))
+    np.testing.assert_array_equal(a.merge(b).registers, whole.registers)
+
+    with pytest.raises(ValueError, match="different precisions"):
+        a.merge(HyperLogLog(precision=10))
+
+
+def test_hyperloglog_empty() -> None:
+    assert HyperLogLog().update(pd.Series([], dtype=float)).estimate() == 0
+
+
+def test_data_profile() -> None:
+    rs = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "x": rs.randn(1000),
+            "n": rs.randint(0, 100, 1000),
+            "s": rs.choice(["a", "b", "c"], 1000),
+        }
+    )
+    df.loc[::10, "x"] = np.nan
+
+    profile = DataProfile()
+    for chunk in np.array_split(df, 8):
+        profile.update(chunk)
+    result = profile.to_frame(quantiles=[0.5])
+
+    assert result.index.tolist() == ["x", "n", "s"]
+    assert result["count"].tolist() == [900, 1000, 1000]
+    assert result["nulls"].tolist() == [100, 0, 0]
+    numeric = df[["x", "n"]]
+    np.testing.assert_allclose(result.loc[["x", "n"], "min"], numeric.min())
+    np.testing.assert_allclose(result.loc[["x", "n"], "max"], numeric.max())
+    np.testing.assert_allclose(result.loc[["x", "n"], "mean"], numeric.mean())
+    np.testing.assert_allclose(result.loc[["x", "n"], "var"], numeric.var())
+    np.testing.assert_allclose(result.loc["n", "q50"], numeric["n"].median(), rtol=0.02)
+    np.testing.assert_allclose(result["distinct"], df.nunique(), rtol=0.02)
+    assert np.isnan(result.loc["s", ["min", "mean", "var", "q50"]].astype(float)).all()
+
+
+def test_data_profile_merge_from_workers() -> None:
+    df = pd.DataFrame({"a": np.arange(100.0), "b": np.arange(100) % 7})
+    expected = DataProfile().update(df).to_frame()
+
+    # Profiles are sent back from worker processes by pickling.
+    parts = [
+        pickle.loads(pickle.dumps(DataProfile().update(df.iloc[i::4])))
+        for i in range(4)
+    ]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    pd.testing.assert_frame_equal(merged.to_frame(), expected)
+
+
+def test_data_profile_columns_missing_in_chunks() -> None:
+    profile = DataProfile().update(pd.DataFrame({"a": [1.0, 2.0]}))
+    profile.update(pd.DataFrame({"b": [3.0], "a": [np.nan]}))
+    result = profile.to_frame()
+    assert result.index.tolist() == ["a", "b"]
+    assert result["count"].tolist() == [2, 1]
+    assert result["mean"].tolist() == [1.5, 3.0]
+
+
+def test_data_profile_histograms() -> None:
+    df = pd.DataFrame({"a": np.arange(100.0), "s": ["x"] * 100})
+    hists = DataProfile().update(df).histograms(bins=5)
+    assert list(hists) == ["a"]
+    counts, edges = hists["a"]
+    assert counts.sum() == 100
+    assert edges[0] == 0 and edges[-1] == 99
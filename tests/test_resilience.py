@@ -0,0 +1,158 @@
+import time
+from typing import Any, Generator
+
+import mlflow
+import py
+import pytest
+
+from mlflow_extend import logging as lg
+from mlflow_extend import resilience, spool
+from mlflow_extend.testing.utils import (
+    FaultInjectingArtifactRepository,
+    assert_file_exists_in_artifacts,
+    list_artifacts,
+    register_fault_injecting_artifact_repository,
+)
+
+
+@pytest.fixture
+def faulty_experiment(tmpdir: py.path.local) -> Generator[str, None, None]:
+    register_fault_injecting_artifact_repository()
+    artifact_location = "faulty://" + tmpdir.join("artifacts").strpath
+    yield mlflow.create_experiment(tmpdir.strpath, artifact_location)
+    FaultInjectingArtifactRepository.num_failures = 0
+    FaultInjectingArtifactRepository.delay = 0.0
+
+
+@pytest.fixture(autouse=True)
+def reset_uploader() -> Generator[None, None, None]:
+    yield
+    resilience.configure_uploads()
+
+
+def test_circuit_breaker() -> None:
+    breaker = resilience.CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.1)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    # Only a single trial call is allowed in the half-open state.
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_upload_stats() -> None:
+    stats = resilience.UploadStats()
+    assert stats.summary()["latency_p50"] == 0.0
+    for latency in range(1, 101):
+        stats.record_latency(latency)
+    stats.increment("retries")
+
+    summary = stats.summary()
+    assert summary["retries"] == 1
+    assert summary["latency_p50"] == pytest.approx(50.5)
+    assert summary["latency_p99"] == pytest.approx(99.01)
+
+
+def test_upload_retries_transient_failures(faulty_experiment: str) -> None:
+    uploader = resilience.configure_uploads(backoff=0)
+    FaultInjectingArtifactRepository.num_failures = 2
+    with mlflow.start_run(experiment_id=faulty_experiment) as run:
+        lg.log_text("text", "text.txt")
+        assert_file_exists_in_artifacts(run, "text.txt")
+
+    summary = uploader.stats.summary()
+    assert summary["uploads"] == 1
+    assert summary["retries"] == 2
+    assert summary["latency_p50"] > 0
+
+
+def test_upload_raises_without_fallback(faulty_experiment: str) -> None:
+    resilience.configure_uploads(max_retries=1, backoff=0)
+    FaultInjectingArtifactRepository.num_failures = 2
+    with mlflow.start_run(experiment_id=faulty_experiment):
+        with pytest.raises(ConnectionError, match="Injected fault"):
+            lg.log_text("text", "text.txt")
+
+
+def test_upload_does_not_retry_permanent_errors(
+    faulty_experiment: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    resilience.configure_uploads(backoff=0)
+    calls = []
+
+    def log_artifact(*args: Any) -> None:
+        calls.append(args)
+        raise PermissionError("Access denied")
+
+    monkeypatch.setattr(FaultInjectingArtifactRepository, "log_artifact", log_artifact)
+    with mlflow.start_run(experiment_id=faulty_experiment):
+        with pytest.raises(PermissionError, match="Access denied"):
+            lg.log_text("text", "text.txt")
+    assert len(calls) == 1
+
+
+def test_default_uploader_has_no_breaker(faulty_experiment: str) -> None:
+    uploader = resilience.configure_uploads(max_retries=0)
+    assert uploader.breaker is None
+    FaultInjectingArtifactRepository.num_failures = 10
+    with mlflow.start_run(experiment_id=faulty_experiment) as run:
+        for _ in range(10):
+            with pytest.raises(ConnectionError, match="Injected fault"):
+                lg.log_text("text", "text.txt")
+        # Without a fallback, uploads are never rejected without calling the store.
+        lg.log_text("text", "text.txt")
+        assert_file_exists_in_artifacts(run, "text.txt")
+
+
+def test_upload_timeout(faulty_experiment: str, tmpdir: py.path.local) -> None:
+    fallback_dir = tmpdir.join("fallback").strpath
+    uploader = resilience.configure_uploads(
+        max_retries=2, backoff=0, timeout=0.05, fallback_dir=fallback_dir
+    )
+    FaultInjectingArtifactRepository.delay = 0.5
+    with mlflow.start_run(experiment_id=faulty_experiment) as run:
+        lg.log_text("text", "text.txt")
+
+    summary = uploader.stats.summary()
+    assert summary["retries"] == 0
+    assert summary["fallbacks"] == 1
+
+    # The timed out upload completes in the background after the temporary file of
+    # `log_text` is removed.
+    deadline = time.time() + 10
+    while list_artifacts(run.info.run_id) != ["text.txt"]:
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+
+def test_upload_falls_back_to_spool(
+    faulty_experiment: str, tmpdir: py.path.local
+) -> None:
+    fallback_dir = tmpdir.join("fallback").strpath
+    breaker = resilience.CircuitBreaker(failure_threshold=1, reset_timeout=3600)
+    uploader = resilience.configure_uploads(
+        max_retries=1, backoff=0, breaker=breaker, fallback_dir=fallback_dir
+    )
+    FaultInjectingArtifactRepository.num_failures = 2
+    with mlflow.start_run(experiment_id=faulty_experiment) as run:
+        lg.log_text("a", "a.txt")
+        assert breaker.state == "open"
+        # The circuit is open, so this one is spooled without calling the store.
+        lg.log_text("b", "dir/b.txt")
+        assert list_artifacts(run.info.run_id) == []
+
+    summary = uploader.stats.summary()
+    assert summary["failures"] == 1
+    assert summary["fallbacks"] == 2
+
+    uploader.close()
+    assert spool.replay(fallback_dir) == 2
+    assert list_artifacts(run.info.run_id) == ["a.txt", "dir/b.txt"]
@@ -0,0 +1,103 @@
+import time
+
+import mlflow
+import numpy as np
+import py
+import pytest
+
+from mlflow_extend import logging as lg
+from mlflow_extend.run_index import RunIndex
+from mlflow_extend.testing.utils import assert_not_conflict_with_fluent_apis
+
+
+def test_new_apis_do_not_conflict_native_apis() -> None:
+    assert_not_conflict_with_fluent_apis(["RunIndex"])
+
+
+@pytest.fixture
+def experiment_id(request: pytest.FixtureRequest) -> str:
+    return mlflow.create_experiment(request.node.name)
+
+
+def log_run(experiment_id: str, params: dict, metrics: dict) -> str:
+    with mlflow.start_run(experiment_id=experiment_id) as run:
+        lg.log_params_flatten(params)
+        lg.log_metrics_flatten(metrics)
+    # Make sure runs have different start times.
+    time.sleep(0.002)
+    return run.info.run_id
+
+
+def test_query(experiment_id: str) -> None:
+    a = log_run(
+        experiment_id, {"model": {"objective": "binary", "depth": 3}}, {"auc": 0.8}
+    )
+    b = log_run(experiment_id, {"model": {"objective": "regression"}}, {"auc": 0.9})
+    c = log_run(experiment_id, {"model_name": "x"}, {"model": {"loss": 0.1}})
+
+    index = RunIndex(":memory:", [experiment_id])
+    assert index.refresh() == 3
+
+    assert index.query() == [c, b, a]
+    assert index.query(params={"model": {"objective": "binary"}}) == [a]
+    assert index.query(params={"model.objective": "regression"}) == [b]
+    assert index.query(params={"model.depth": None}) == [a]
+    assert index.query(params={"model.depth": 4}) == []
+    assert index.query(metrics={"auc": (0.85, None)}) == [b]
+    assert index.query(metrics={"auc": (None, 0.85)}) == [a]
+    assert index.query(metrics={"auc": (0.8, 0.9)}) == [b, a]
+    # "model_name" is not under "model".
+    assert index.query(prefix="model") == [c, b, a]
+    assert index.query(prefix="model.objective") == [b, a]
+    assert index.query(prefix="model", metrics={"auc": (0.85, None)}) == [b]
+    assert index.query(prefix="model.lo") == []
+    index.close()
+
+
+def test_refresh_is_incremental(experiment_id: str, tmpdir: py.path.local) -> None:
+    path = tmpdir.join("index.db").strpath
+    log_run(experiment_id, {"a": 0}, {"m": 0})
+    active_run = mlflow.start_run(experiment_id=experiment_id)
+    try:
+        lg.log_metrics_flatten({"m": 1})
+        index = RunIndex(path, [experiment_id])
+        assert index.refresh() == 2
+        # Only the active run is fetched again.
+        assert index.refresh() == 1
+        lg.log_metrics_flatten({"m": 2})
+    finally:
+        mlflow.end_run()
+    index.close()
+
+    new_run_id = log_run(experiment_id, {"a": 1}, {"m": 3})
+    # The index is persisted in the file.
+    index = RunIndex(path, [experiment_id])
+    assert index.refresh() == 2
+    assert index.refresh() == 1
+    assert index.query(metrics={"m": (2, 2)}) == [active_run.info.run_id]
+    assert index.query(params={"a": 1}) == [new_run_id]
+    index.close()
+
+
+def test_to_frame(experiment_id: str) -> None:
+    a = log_run(experiment_id, {"model": {"depth": 3}, "seed": 0}, {"auc": 0.8})
+    b = log_run(experiment_id, {"model": {"objective": "binary"}}, {"auc": np.nan})
+
+    index = RunIndex(":memory:", [experiment_id])
+    index.refresh()
+    df = index.to_frame()
+    assert df.columns.tolist() == [
+        "run_id",
+        "params.model.depth",
+        "params.model.objective",
+        "params.seed",
+        "metrics.auc",
+    ]
+    assert df["run_id"].tolist() == [b, a]
+    assert df["params.model.depth"].tolist()[1] == "3"
+    assert df["metrics.auc"].isna().tolist() == [True, False]
+
+    df = index.to_frame([a], prefix="model")
+    assert df.columns.tolist() == ["run_id", "params.model.depth"]
+    assert df["run_id"].tolist() == [a]
+    index.close()
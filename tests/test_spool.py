@@ -0,0 +1,165 @@
+import os
+from typing import Any
+
+import mlflow
+import py
+import pytest
+from mlflow.exceptions import RestException
+
+from mlflow_extend import cli
+from mlflow_extend import logging as lg
+from mlflow_extend import spool
+from mlflow_extend.testing.utils import assert_file_exists_in_artifacts, list_artifacts
+
+
+def test_journal_fsync_batching(tmpdir: py.path.local) -> None:
+    journal = spool.Journal(tmpdir.strpath, fsync_every=3, fsync_interval=3600)
+    for i in range(5):
+        journal.log_params("run", {"a": i})
+        assert journal._num_unsynced == (i + 1) % 3
+    journal.close()
+    assert journal._num_unsynced == 0
+
+    records = list(spool.read_journal(tmpdir.strpath))
+    assert [r["data"] for r in records] == [{"a": str(i)} for i in range(5)]
+    assert len({r["id"] for r in records}) == 5
+
+
+def test_read_journal_skips_incomplete_record(tmpdir: py.path.local) -> None:
+    journal = spool.Journal(tmpdir.strpath)
+    journal.log_params("run", {"a": 0})
+    journal.close()
+    with open(os.path.join(tmpdir.strpath, spool.JOURNAL_FILE), "a") as f:
+        f.write('{"type": "par')
+
+    assert len(list(spool.read_journal(tmpdir.strpath))) == 1
+
+
+def test_spool(tmpdir: py.path.local) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(path) as journal:
+            assert spool.get_spool() is journal
+            lg.log_params_flatten({"a": {"b": 0}})
+            lg.log_metrics_flatten({"c": 1.0}, step=1)
+            lg.log_dict({"d": 0}, "dir/dict.json")
+        assert spool.get_spool() is None
+
+    run_id = run.info.run_id
+    loaded_run = mlflow.get_run(run_id)
+    assert loaded_run.data.params == {}
+    assert loaded_run.data.metrics == {}
+    assert list_artifacts(run_id) == []
+
+    assert spool.replay(path) == 3
+    loaded_run = mlflow.get_run(run_id)
+    assert loaded_run.data.params == {"a.b": "0"}
+    assert loaded_run.data.metrics == {"c": 1.0}
+    assert_file_exists_in_artifacts(run, "dir/dict.json")
+
+    # Replaying again must not log anything twice.
+    assert spool.replay(path) == 0
+    client = mlflow.tracking.MlflowClient()
+    assert len(client.get_metric_history(run_id, "c")) == 1
+
+
+def test_spool_without_active_run(tmpdir: py.path.local) -> None:
+    with spool.spool(tmpdir.strpath):
+        with pytest.raises(RuntimeError, match="No active run."):
+            lg.log_params_flatten({"a": 0})
+
+
+def test_replay_in_batches(tmpdir: py.path.local) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(path):
+            lg.log_params_flatten({"p{}".format(i): i for i in range(250)})
+            lg.log_metrics_flatten({"m{}".format(i): i for i in range(2500)})
+
+    assert spool.replay(path) == 2
+    loaded_run = mlflow.get_run(run.info.run_id)
+    assert len(loaded_run.data.params) == 250
+    assert len(loaded_run.data.metrics) == 2500
+
+
+def test_replay_retries(tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(path):
+            lg.log_params_flatten({"a": 0})
+
+    log_batch = mlflow.tracking.MlflowClient.log_batch
+    calls = []
+
+    def flaky_log_batch(*args: Any, **kwargs: Any) -> None:
+        calls.append(args)
+        if len(calls) == 1:
+            raise ConnectionError("Connection refused")
+        log_batch(*args, **kwargs)
+
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "log_batch", flaky_log_batch)
+    assert spool.replay(path, backoff=0) == 1
+    assert len(calls) == 2
+    assert mlflow.get_run(run.info.run_id).data.params == {"a": "0"}
+
+
+def test_replay_does_not_retry_permanent_errors(
+    tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run():
+        with spool.spool(path):
+            lg.log_params_flatten({"a": 0})
+
+    calls = []
+
+    def invalid_log_batch(*args: Any, **kwargs: Any) -> None:
+        calls.append(args)
+        raise RestException({"error_code": "INVALID_PARAMETER_VALUE"})
+
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "log_batch", invalid_log_batch)
+    with pytest.raises(RestException, match="INVALID_PARAMETER_VALUE"):
+        spool.replay(path, backoff=0)
+    assert len(calls) == 1
+
+
+def test_replay_resumes_partially_sent_records(
+    tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(path):
+            lg.log_metrics_flatten({"m{}".format(i): i for i in range(2500)})
+            lg.log_metrics_flatten({"n": 0})
+
+    log_batch = mlflow.tracking.MlflowClient.log_batch
+    calls = []
+
+    def failing_log_batch(*args: Any, **kwargs: Any) -> None:
+        calls.append(args)
+        if len(calls) == 2:
+            raise ConnectionError("Connection refused")
+        log_batch(*args, **kwargs)
+
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "log_batch", failing_log_batch)
+    with pytest.raises(ConnectionError):
+        spool.replay(path, max_retries=0)
+    monkeypatch.undo()
+
+    # Metrics sent before the failure must not be sent again.
+    assert spool.replay(path) == 2
+    client = mlflow.tracking.MlflowClient()
+    for key in ["m0", "m999", "m1000", "m2499", "n"]:
+        assert len(client.get_metric_history(run.info.run_id, key)) == 1
+    assert len(mlflow.get_run(run.info.run_id).data.metrics) == 2501
+
+
+def test_replay_cli(tmpdir: py.path.local, capsys: pytest.CaptureFixture) -> None:
+    path = tmpdir.strpath
+    with mlflow.start_run() as run:
+        with spool.spool(path):
+            lg.log_params_flatten({"a": 0})
+
+    cli.main(["replay", path, "--tracking-uri", mlflow.get_tracking_uri()])
+    assert "Replayed 1 records" in capsys.readouterr().out
+    assert mlflow.get_run(run.info.run_id).data.params == {"a": "0"}
@@ -0,0 +1,275 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import py
+import pytest
+
+from mlflow_extend import stats
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+def test_corr(block_size: int) -> None:
+    df = pd.DataFrame(np.random.RandomState(0).rand(100, 10))
+    df.iloc[0, 0] = np.nan
+    expected = df.fillna(df.mean()).corr().to_numpy()
+    result = stats.corr(df, block_size)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-5)
+
+
+def test_corr_peak_memory() -> None:
+    data = np.random.RandomState(0).rand(20000, 100).astype(np.float32)
+    tracemalloc.start()
+    try:
+        stats.corr(data, block_size=10)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The normalized float32 copy plus a float64 block, not a float64 copy of all.
+    assert peak < 1.5 * data.nbytes
+
+
+def test_corr_ignores_non_numeric_columns() -> None:
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"], "c": [3, 1, 2]})
+    assert stats.corr(df).shape == (2, 2)
+
+
+def test_corr_with_constant_column() -> None:
+    result = stats.corr(np.array([[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]))
+    assert result[0, 0] == 1
+    assert np.isnan(result[1]).all()
+
+
+def test_cluster_order() -> None:
+    corr = np.array([[1.0, 0.0, 0.9], [0.0, 1.0, 0.0], [0.9, 0.0, 1.0]])
+    order = stats.cluster_order(corr)
+    assert sorted(order) == [0, 1, 2]
+    # Correlated columns must be adjacent.
+    assert abs(list(order).index(0) - list(order).index(2)) == 1
+
+
+def test_confusion_matrix() -> None:
+    cm = stats.confusion_matrix([0, 1, 2, 2], [0, 2, 2, 1])
+    np.testing.assert_array_equal(cm, [[1, 0, 0], [0, 0, 1], [0, 1, 1]])
+
+
+def test_confusion_matrix_ignores_unknown_labels() -> None:
+    cm = stats.confusion_matrix(["a", "b", "c"], ["a", "a", "c"], labels=["a", "b"])
+    np.testing.assert_array_equal(cm, [[1, 0], [1, 0]])
+
+
+def test_confusion_matrix_sparse() -> None:
+    pytest.importorskip("scipy")
+    y_true = np.random.RandomState(0).randint(0, 1000, 5000)
+    y_pred = np.random.RandomState(1).randint(0, 1000, 5000)
+    cm = stats.confusion_matrix(y_true, y_pred, sparse=True)
+    np.testing.assert_array_equal(cm.toarray(), stats.confusion_matrix(y_true, y_pred))
+
+
+def test_classification_report() -> None:
+    cm = np.array([[2, 1, 0], [0, 0, 1], [1, 0, 3]])
+    report = stats.classification_report(cm, labels=["a", "b", "c"])
+
+    precision = np.array([2 / 3, 0, 3 / 4])
+    recall = np.array([2 / 3, 0, 3 / 4])
+    f1 = np.array([2 / 3, 0, 3 / 4])
+    support = np.array([3, 1, 4])
+    np.testing.assert_allclose(report.loc[["a", "b", "c"], "precision"], precision)
+    np.testing.assert_allclose(report.loc[["a", "b", "c"], "recall"], recall)
+    np.testing.assert_allclose(report.loc[["a", "b", "c"], "f1"], f1)
+    np.testing.assert_array_equal(report.loc[["a", "b", "c"], "support"], support)
+    np.testing.assert_allclose(report.loc["macro_avg", "f1"], f1.mean())
+    np.testing.assert_allclose(report.loc["micro_avg", "f1"], 5 / 8)
+    np.testing.assert_allclose(
+        report.loc["weighted_avg", "recall"], (recall * support).sum() / 8
+    )
+    averages = ["macro_avg", "micro_avg", "weighted_avg"]
+    assert (report.loc[averages, "support"] == 8).all()
+
+
+def test_classification_report_sparse() -> None:
+    sparse = pytest.importorskip("scipy.sparse")
+    cm = np.array([[2, 1, 0], [0, 0, 1], [1, 0, 3]])
+    expected = stats.classification_report(cm)
+    result = stats.classification_report(sparse.csr_matrix(cm))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_threshold_sweep() -> None:
+    rs = np.random.RandomState(0)
+    y_true = rs.randint(0, 2, 200)
+    # Round the scores to create ties.
+    y_score = (rs.rand(200) + y_true * 0.3).round(1)
+    sweep = stats.threshold_sweep(y_true, y_score, fp_cost=2.0, fn_cost=5.0)
+
+    thresholds = np.unique(y_score)[::-1]
+    np.testing.assert_array_equal(sweep["threshold"], thresholds)
+    for row in sweep.itertuples():
+        y_pred = y_score >= row.threshold
+        assert row.tp == (y_pred & (y_true == 1)).sum()
+        assert row.fp == (y_pred & (y_true == 0)).sum()
+        assert row.fn == (~y_pred & (y_true == 1)).sum()
+        assert row.tn == (~y_pred & (y_true == 0)).sum()
+        assert row.cost == 2.0 * row.fp + 5.0 * row.fn
+
+    last = sweep.iloc[-1]
+    assert last["recall"] == 1.0
+    assert last["precision"] == y_true.mean()
+
+
+def test_threshold_sweep_pos_label() -> None:
+    sweep = stats.threshold_sweep(["n", "p", "p"], [0.2, 0.9, 0.1], pos_label="p")
+    assert sweep["tp"].tolist() == [1, 1, 2]
+    assert sweep["fp"].tolist() == [0, 1, 1]
+
+
+def test_threshold_sweep_with_invalid_inputs() -> None:
+    with pytest.raises(ValueError, match="must not be empty"):
+        stats.threshold_sweep([], [])
+    with pytest.raises(ValueError, match="must have the same shape"):
+        stats.threshold_sweep([0, 1], [0.5])
+
+
+def test_calibration_bins() -> None:
+    rs = np.random.RandomState(0)
+    y_prob = np.r_[rs.rand(1000), 0.0, 1.0]
+    y_true = rs.rand(len(y_prob)) < y_prob
+    bins = stats.CalibrationBins(n_bins=5, chunk_size=64).update(y_true, y_prob)
+
+    idx = np.minimum((y_prob * 5).astype(int), 4)
+    df = pd.DataFrame({"idx": idx, "prob": y_prob, "pos": y_true})
+    expected = df.groupby("idx").agg(
+        count=("prob", "size"), mean_prob=("prob", "mean"), frac_pos=("pos", "mean")
+    )
+    result = bins.to_frame()
+    np.testing.assert_array_equal(result["count"], expected["count"])
+    np.testing.assert_allclose(result["mean_prob"], expected["mean_prob"])
+    np.testing.assert_allclose(result["frac_pos"], expected["frac_pos"])
+
+    expected_ece = (
+        expected["count"] * (expected["mean_prob"] - expected["frac_pos"]).abs()
+    ).sum() / len(y_prob)
+    assert bins.ece == pytest.approx(expected_ece)
+    assert bins.brier == pytest.approx(((y_prob - y_true) ** 2).mean())
+
+
+def test_calibration_bins_merge() -> None:
+    rs = np.random.RandomState(0)
+    y_prob = rs.rand(100)
+    y_true = rs.rand(100) < y_prob
+    whole = stats.CalibrationBins().update(y_true, y_prob)
+    merged = stats.CalibrationBins().update(y_true[:30], y_prob[:30])
+    merged.merge(stats.CalibrationBins().update(y_true[30:], y_prob[30:]))
+    pd.testing.assert_frame_equal(merged.to_frame(), whole.to_frame())
+    assert merged.brier == pytest.approx(whole.brier)
+
+    with pytest.raises(ValueError, match="different `n_bins`"):
+        merged.merge(stats.CalibrationBins(n_bins=5))
+
+
+def test_calibration_bins_empty() -> None:
+    bins = stats.CalibrationBins(n_bins=2)
+    assert bins.ece == 0.0
+    assert bins.brier == 0.0
+    assert bins.to_frame()["mean_prob"].isna().all()
+
+
+@pytest.mark.parametrize("chunk_size", [7, 65536])
+def test_attribution_summary(chunk_size: int) -> None:
+    values = np.random.RandomState(0).randn(1000, 4) * [1, 2, 3, 4]
+    values[0, 0] = np.nan
+    summary, sample = stats.attribution_summary(
+        values, ["a", "b", "c", "d"], sample_size=500, chunk_size=chunk_size
+    )
+    assert summary.index.tolist() == ["a", "b", "c", "d"]
+    quantiles = ["q5", "q25", "q50", "q75", "q95"]
+    assert summary.columns.tolist() == ["mean_abs", "mean"] + quantiles
+    np.testing.assert_allclose(summary["mean_abs"], np.nanmean(np.abs(values), axis=0))
+    np.testing.assert_allclose(summary["mean"], np.nanmean(values, axis=0))
+
+    # Every sampled row must come from the matrix.
+    assert abs(len(sample) - 500) <= 1000 / chunk_size + 1
+    rows = {tuple(np.nan_to_num(r)) for r in values}
+    assert all(tuple(np.nan_to_num(r)) in rows for r in sample)
+    np.testing.assert_allclose(summary["q50"], np.nanmedian(sample, axis=0))
+
+
+def test_attribution_summary_memmap(tmpdir: py.path.local) -> None:
+    values = np.random.RandomState(0).randn(100, 2)
+    mm = np.memmap(str(tmpdir.join("values.dat")), "float64", "w+", shape=values.shape)
+    mm[:] = values
+    summary, sample = stats.attribution_summary(mm, chunk_size=10)
+    np.testing.assert_allclose(summary["mean_abs"], np.abs(values).mean(axis=0))
+    # The sample covers all rows if there are fewer rows than `sample_size`.
+    np.testing.assert_array_equal(sample, values)
+
+
+def test_drift() -> None:
+    rs = np.random.RandomState(0)
+    ref = pd.DataFrame({"x": rs.randn(500), "y": rs.randint(0, 5, 500).astype(float)})
+    cur = pd.DataFrame({"x": rs.randn(400) + 0.5, "y": rs.randint(1, 6, 400) * 1.0})
+    cur.loc[::10, "x"] = np.nan
+    report = stats.drift(ref, cur, bins=5, block_size=1)
+
+    for col in ["x", "y"]:
+        r, c = ref[col].to_numpy(), cur[col].dropna().to_numpy()
+        # KS statistic: the largest gap between the empirical CDFs.
+        grid = np.union1d(r, c)
+        cdf_r = np.searchsorted(np.sort(r), grid, side="right") / len(r)
+        cdf_c = np.searchsorted(np.sort(c), grid, side="right") / len(c)
+        assert report.loc[col, "ks"] == pytest.approx(np.abs(cdf_r - cdf_c).max())
+
+        edges = np.quantile(r, [0.2, 0.4, 0.6, 0.8])
+        p = np.bincount(np.searchsorted(edges, r), minlength=5) / len(r)
+        q = np.bincount(np.searchsorted(edges, c), minlength=5) / len(c)
+        m = (p + q) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kl_p = np.where(p > 0, p * np.log2(p / m), 0).sum()
+            kl_q = np.where(q > 0, q * np.log2(q / m), 0).sum()
+        assert report.loc[col, "js"] == pytest.approx((kl_p + kl_q) / 2)
+        p, q = np.maximum(p, 1e-4), np.maximum(q, 1e-4)
+        assert report.loc[col, "psi"] == pytest.approx(((q - p) * np.log(q / p)).sum())
+
+
+def test_drift_no_shift() -> None:
+    df = pd.DataFrame({"x": np.arange(100.0), "c": list("ab") * 50})
+    report = stats.drift(df, df)
+    np.testing.assert_allclose(report.loc["x"], [0, 0, 0], atol=1e-12)
+    assert report.loc["c", "psi"] == 0
+    assert np.isnan(report.loc["c", "ks"])
+
+
+def test_drift_ks_peak_memory() -> None:
+    rs = np.random.RandomState(0)
+    ref, cur = rs.randn(20000, 20), rs.randn(10000, 20)
+    ref[::7, 0] = np.nan
+    tracemalloc.start()
+    try:
+        ks = stats._ks(ref, cur)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Sorted copies of both samples, not the pooled values with their weights.
+    assert peak < 1.5 * (ref.nbytes + cur.nbytes)
+
+    r = ref[:, 0][~np.isnan(ref[:, 0])]
+    grid = np.union1d(r, cur[:, 0])
+    cdf_r = np.searchsorted(np.sort(r), grid, side="right") / len(r)
+    cdf_c = np.searchsorted(np.sort(cur[:, 0]), grid, side="right") / len(cur)
+    assert ks[0] == pytest.approx(np.abs(cdf_r - cdf_c).max())
+
+
+def test_drift_ignores_columns_missing_in_cur() -> None:
+    ref = pd.DataFrame({"a": [1.0, 2.0], "b": [1.0, 2.0]})
+    report = stats.drift(ref, ref[["b"]])
+    assert report.index.tolist() == ["b"]
+
+
+def test_drift_with_processes() -> None:
+    rs = np.random.RandomState(0)
+    ref = pd.DataFrame(rs.randn(200, 6))
+    cur = pd.DataFrame(rs.randn(100, 6) * 2)
+    expected = stats.drift(ref, cur)
+    result = stats.drift(ref, cur, block_size=2, max_workers=2)
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,209 @@
+import io
+import logging
+import os
+import sys
+import time
+
+import mlflow
+import pytest
+
+from mlflow_extend import loading as ld
+from mlflow_extend import logging as lg
+from mlflow_extend import resilience
+from mlflow_extend import streams as st
+from mlflow_extend.testing.utils import (
+    assert_not_conflict_with_fluent_apis,
+    list_artifacts,
+)
+
+
+def test_new_apis_do_not_conflict_native_apis() -> None:
+    assert_not_conflict_with_fluent_apis(st.__all__)
+
+
+@pytest.mark.parametrize(
+    "compression, ext", [(None, ""), ("gzip", ".gz"), ("zstd", ".zst")]
+)
+def test_text_stream(compression: str, ext: str) -> None:
+    lines = ["line {}\n".format(i) for i in range(100)]
+    with mlflow.start_run() as run, lg.record_manifest():
+        with st.TextStream("logs", segment_bytes=100, compression=compression) as f:
+            for line in lines:
+                f.write(line)
+                assert f.segment_size < 100
+
+    # Each segment contains whole lines and exceeds the size by less than a line.
+    segments = list_artifacts(run.info.run_id, "logs")
+    assert segments == [
+        "logs/{:05d}.txt{}".format(i, ext) for i in range(len(segments))
+    ]
+    assert len(segments) == len("".join(lines)) // 100 + 1
+    assert ld.load_text_stream(run.info.run_id, "logs") == "".join(lines)
+
+    manifest = ld.load_manifest(run.info.run_id)
+    assert manifest["path"].tolist() == segments
+
+
+def test_text_stream_appends_segments() -> None:
+    with mlflow.start_run() as run:
+        with st.TextStream("logs") as f:
+            f.write("a\n")
+        with st.TextStream("logs") as f:
+            print("b", file=f)
+            f.rotate()
+            print("c", file=f)
+            f.rotate()
+            f.rotate()
+
+    segments = list_artifacts(run.info.run_id, "logs")
+    assert segments == ["logs/00000.txt", "logs/00001.txt", "logs/00002.txt"]
+    assert ld.load_text_stream(run.info.run_id, "logs") == "a\nb\nc\n"
+
+
+def test_text_stream_with_encoding() -> None:
+    with mlflow.start_run() as run:
+        with st.TextStream("logs", encoding="latin-1") as f:
+            f.write("caf\u00e9\n")
+
+    text = ld.load_text_stream(run.info.run_id, "logs", encoding="latin-1")
+    assert text == "caf\u00e9\n"
+
+
+def test_text_stream_after_close() -> None:
+    with mlflow.start_run():
+        f = st.TextStream("logs")
+        f.close()
+        f.close()
+        with pytest.raises(ValueError, match="closed stream"):
+            f.write("a")
+
+
+def test_text_stream_with_invalid_compression() -> None:
+    with pytest.raises(ValueError, match="Invalid compression: abc."):
+        st.TextStream("logs", compression="abc")
+
+
+def test_text_stream_raises_upload_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def upload(*args: str) -> None:
+        raise IOError("upload failed")
+
+    with mlflow.start_run():
+        f = st.TextStream("logs", segment_bytes=1)
+        monkeypatch.setattr(resilience.get_uploader(), "upload", upload)
+        f.write("a")
+        with pytest.raises(IOError, match="upload failed"):
+            f.close()
+    assert not os.path.exists(f._tmpdir)
+
+
+def test_capture_output(capsys: pytest.CaptureFixture) -> None:
+    logger = logging.getLogger("test_capture_output")
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(levelname)s %(message)s")
+    with mlflow.start_run() as run:
+        with st.capture_output(
+            logger=logger.name, formatter=formatter, flush_interval=60
+        ):
+            print("out")
+            print("err", file=sys.stderr)
+            logger.info("step %d", 1)
+            logger.debug("not captured")
+
+    assert capsys.readouterr() == ("out\n", "err\n")
+    text = ld.load_text_stream(run.info.run_id, "output")
+    assert text == "out\nerr\nINFO step 1\n"
+    assert logger.handlers == []
+
+
+def test_capture_output_freezes_log_records() -> None:
+    logger = logging.getLogger("test_capture_output_freezes_log_records")
+    values = [1]
+    with mlflow.start_run() as run:
+        with st.capture_output(
+            stdout=False, stderr=False, logger=logger, flush_interval=60
+        ) as capture:
+            logger.warning("values: %s", values)
+            values.append(2)
+            try:
+                raise ValueError("failed")
+            except ValueError:
+                logger.exception("error")
+            records = list(capture._ring)
+            assert all(r.args is None and r.exc_info is None for r in records)
+
+    text = ld.load_text_stream(run.info.run_id, "output")
+    assert "values: [1]\n" in text
+    assert "ValueError: failed" in text
+
+
+def test_capture_output_flushes_periodically() -> None:
+    with mlflow.start_run() as run:
+        with st.capture_output(
+            path="logs", flush_interval=0.01, upload_interval=0.01, logger=None
+        ):
+            print("a")
+            deadline = time.time() + 10
+            while len(list_artifacts(run.info.run_id, "logs")) == 0:
+                assert time.time() < deadline
+                time.sleep(0.01)
+            assert ld.load_text_stream(run.info.run_id, "logs") == "a\n"
+            print("b")
+
+    assert ld.load_text_stream(run.info.run_id, "logs") == "a\nb\n"
+
+
+def test_capture_output_appends_to_segment_between_uploads() -> None:
+    with mlflow.start_run() as run:
+        with st.capture_output(
+            path="logs", flush_interval=0.01, upload_interval=60, logger=None
+        ) as capture:
+            for i in range(3):
+                print(i)
+                deadline = time.time() + 10
+                while len(capture._ring) > 0:
+                    assert time.time() < deadline
+                    time.sleep(0.01)
+            assert list_artifacts(run.info.run_id, "logs") == []
+
+    assert len(list_artifacts(run.info.run_id, "logs")) == 1
+    assert ld.load_text_stream(run.info.run_id, "logs") == "0\n1\n2\n"
+
+
+def test_capture_output_drops_oldest_entries() -> None:
+    with mlflow.start_run() as run:
+        with st.capture_output(
+            stderr=False, logger=None, buffer_size=2, flush_interval=60
+        ):
+            for i in range(5):
+                print(i)
+
+    text = ld.load_text_stream(run.info.run_id, "output")
+    assert text == "[8 entries dropped]\n4\n"
+
+
+def test_capture_output_restores_on_error() -> None:
+    stdout, stderr = sys.stdout, sys.stderr
+    num_handlers = len(logging.getLogger().handlers)
+    with mlflow.start_run() as run:
+        with pytest.raises(ValueError, match="failed"):
+            with st.capture_output() as capture:
+                print("a")
+                raise ValueError("failed")
+
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    assert len(logging.getLogger().handlers) == num_handlers
+    assert capture.num_dropped == 0
+    assert ld.load_text_stream(run.info.run_id, "output") == "a\n"
+
+
+def test_capture_output_keeps_streams_replaced_later() -> None:
+    stdout = sys.stdout
+    with mlflow.start_run():
+        capture = st.OutputCapture(stderr=False, logger=None).start()
+        replaced = io.StringIO()
+        sys.stdout = replaced
+        try:
+            capture.stop()
+            assert sys.stdout is replaced
+        finally:
+            sys.stdout = stdout
@@ -0,0 +1,133 @@
+import os
+from typing import Any, Dict
+
+import mlflow
+import py
+import pytest
+
+from mlflow_extend import logging as lg
+from mlflow_extend import spool
+from mlflow_extend import sweep as sw
+from mlflow_extend.testing.utils import assert_not_conflict_with_fluent_apis
+
+
+def test_new_apis_do_not_conflict_native_apis() -> None:
+    assert_not_conflict_with_fluent_apis(sw.__all__)
+
+
+def train(params: Dict[str, Any]) -> Dict[str, Any]:
+    if params["x"] < 0:
+        raise ValueError("negative x")
+    lg.log_dict({"x": params["x"]}, "model.json")
+    return {"loss": {"train": (params["x"] - 2) ** 2, "valid": abs(params["x"] - 1)}}
+
+
+def test_expand_grid() -> None:
+    assert sw.expand_grid({}) == [{}]
+    assert sw.expand_grid({"a": [1, 2], "b": [3]}) == [
+        {"a": 1, "b": 3},
+        {"a": 2, "b": 3},
+    ]
+    assert sw.expand_grid(iter([{"a": 1}])) == [{"a": 1}]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep(max_workers: int) -> None:
+    trials = sw.sweep(
+        train,
+        {"x": [0, 1, 2, 3]},
+        metric="loss.train",
+        mode="min",
+        experiment_name="sweep",
+        run_name="parent",
+        max_workers=max_workers,
+    )
+    assert trials["status"].tolist() == ["FINISHED"] * 4
+    assert trials["params.x"].tolist() == ["0", "1", "2", "3"]
+    assert trials["metrics.loss.train"].tolist() == [4, 1, 0, 1]
+
+    client = mlflow.tracking.MlflowClient()
+    expr_id = mlflow.get_experiment_by_name("sweep").experiment_id
+    parent_id = None
+    for run_id, x in zip(trials["run_id"], range(4)):
+        run = client.get_run(run_id)
+        assert run.info.experiment_id == expr_id
+        assert run.info.status == "FINISHED"
+        assert run.data.params == {"x": str(x)}
+        assert run.data.metrics["loss.valid"] == abs(x - 1)
+        artifacts = [a.path for a in client.list_artifacts(run_id)]
+        assert artifacts == ["manifest.json", "model.json"]
+        parent_id = run.data.tags["mlflow.parentRunId"]
+
+    parent = client.get_run(parent_id)
+    assert parent.data.tags["mlflow.runName"] == "parent"
+    assert parent.data.tags["best_run_id"] == trials["run_id"][2]
+    assert parent.data.metrics == {"best.loss.train": 0, "best.loss.valid": 1}
+    assert parent.data.params == {"best.x": "2"}
+    assert mlflow.active_run() is None
+
+
+def test_sweep_with_processes_under_spool(tmpdir: py.path.local) -> None:
+    with spool.spool(tmpdir.strpath):
+        trials = sw.sweep(train, {"x": [0, 1]}, metric="loss.train", max_workers=2)
+
+    # Workers upload their trials themselves instead of writing to the journal.
+    for run_id in trials["run_id"]:
+        run = mlflow.get_run(run_id)
+        assert run.info.status == "FINISHED"
+        assert set(run.data.metrics) == {"loss.train", "loss.valid"}
+
+    spool.replay(tmpdir.strpath)
+    parent_id = mlflow.get_run(trials["run_id"][0]).data.tags["mlflow.parentRunId"]
+    assert "best.loss.train" in mlflow.get_run(parent_id).data.metrics
+
+
+def test_sweep_with_failed_trials() -> None:
+    trials = sw.sweep(train, [{"x": -1}, {"x": 1}], metric="loss.valid", mode="min")
+    assert trials["status"].tolist() == ["FAILED", "FINISHED"]
+
+    client = mlflow.tracking.MlflowClient()
+    failed = client.get_run(trials["run_id"][0])
+    assert failed.info.status == "FAILED"
+    artifacts = [a.path for a in client.list_artifacts(failed.info.run_id)]
+    assert artifacts == ["error.txt", "manifest.json"]
+
+    parent = client.get_run(failed.data.tags["mlflow.parentRunId"])
+    assert parent.data.tags["best_run_id"] == trials["run_id"][1]
+
+
+def test_sweep_with_non_dict_metrics() -> None:
+    trials = sw.sweep(lambda params: [params["x"]], {"x": [1]})
+    assert trials["status"].tolist() == ["FAILED"]
+    client = mlflow.tracking.MlflowClient()
+    error = client.download_artifacts(trials["run_id"][0], "error.txt")
+    with open(error) as f:
+        assert "must return a dict or None" in f.read()
+
+
+def test_sweep_with_failed_replay(monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer_dirs = []
+
+    def replay(path: str, *args: Any, **kwargs: Any) -> None:
+        buffer_dirs.append(path)
+        raise ConnectionError("server unavailable")
+
+    monkeypatch.setattr(sw.spool, "replay", replay)
+    trials = sw.sweep(train, {"x": [1]})
+    assert trials["status"].tolist() == ["FAILED"]
+    assert mlflow.get_run(trials["run_id"][0]).info.status == "FAILED"
+    assert not os.path.exists(buffer_dirs[0])
+    assert mlflow.active_run() is None
+
+
+def test_sweep_without_metric() -> None:
+    trials = sw.sweep(train, {"x": [1]})
+    parent_id = mlflow.get_run(trials["run_id"][0]).data.tags["mlflow.parentRunId"]
+    parent = mlflow.get_run(parent_id)
+    assert parent.data.metrics == {}
+    assert "best_run_id" not in parent.data.tags
+
+
+def test_sweep_invalid_mode() -> None:
+    with pytest.raises(ValueError, match="`mode` must be either"):
+        sw.sweep(train, {"x": [1]}, mode="best")
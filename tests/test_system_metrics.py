@@ -0,0 +1,115 @@
+import sys
+import time
+from typing import Any, Callable
+
+import mlflow
+import py
+import pytest
+
+from mlflow_extend import spool
+from mlflow_extend import system_metrics as sm
+from mlflow_extend.testing.utils import assert_not_conflict_with_fluent_apis
+
+
+def test_new_apis_do_not_conflict_native_apis() -> None:
+    assert_not_conflict_with_fluent_apis(sm.__all__)
+
+
+def test_read_proc() -> None:
+    first = sm._read_proc()
+    sum(range(1000000))
+    second = sm._read_proc()
+    assert second["cpu_seconds"] >= first["cpu_seconds"]
+    assert second["num_threads"] >= 1
+    assert second["rss_bytes"] > 0
+
+
+def test_sample_system_metrics() -> None:
+    client = mlflow.tracking.MlflowClient()
+    with mlflow.start_run() as run:
+        with sm.sample_system_metrics(interval=0.01, flush_interval=0.05) as sampler:
+            sum(range(1000000))
+        assert sampler.overhead >= 0
+
+    metrics = client.get_run(run.info.run_id).data.metrics
+    keys = ["cpu_percent", "rss_mb", "num_threads"]
+    assert {"system." + key for key in keys} <= set(metrics)
+    history = client.get_metric_history(run.info.run_id, "system.rss_mb")
+    steps = sorted(m.step for m in history)
+    assert steps == list(range(len(steps)))
+    assert all(m.value > 0 for m in history)
+
+
+def test_sample_disk_rates() -> None:
+    counters = {"cpu_seconds": 0.0, "num_threads": 1, "rss_bytes": 0}
+    sampler = sm.SystemMetricsSampler(prefix="")
+    sampler._prev = dict(counters, read_bytes=0, write_bytes=0)
+    sampler._prev_time = time.monotonic() - 2
+    current = dict(counters, read_bytes=4 * 1024 * 1024, write_bytes=0)
+    sampler._read = lambda: current
+    sampler._sample()
+
+    _, metrics = sampler._samples[0]
+    assert metrics["disk_read_mb_per_s"] == pytest.approx(2, rel=0.05)
+    assert metrics["disk_write_mb_per_s"] == 0
+
+
+def test_sample_system_metrics_without_prefix() -> None:
+    with mlflow.start_run() as run:
+        with sm.sample_system_metrics(interval=60, prefix=""):
+            pass
+
+    # The last sample is taken on stop.
+    metrics = mlflow.get_run(run.info.run_id).data.metrics
+    assert "cpu_percent" in metrics
+
+
+def test_sampler_stops_when_run_ends() -> None:
+    with mlflow.start_run():
+        sampler = sm.SystemMetricsSampler(interval=0.01, flush_interval=0.01).start()
+    thread = sampler._thread
+    assert thread is not None
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    sampler.stop()
+
+
+def _fail_get_run(error: Exception) -> Callable[..., Any]:
+    def get_run(self: Any, run_id: str) -> Any:
+        raise error
+
+    return get_run
+
+
+def test_sampler_ignores_transient_errors_when_checking_run(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    get_run = _fail_get_run(ConnectionError("connection refused"))
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "get_run", get_run)
+    with mlflow.start_run():
+        sampler = sm.SystemMetricsSampler(interval=0.01, flush_interval=0.01).start()
+        time.sleep(0.1)
+        assert sampler._thread is not None and sampler._thread.is_alive()
+        sampler.stop()
+
+
+def test_sampler_does_not_check_run_while_spooling(
+    monkeypatch: pytest.MonkeyPatch, tmpdir: py.path.local
+) -> None:
+    get_run = _fail_get_run(AssertionError("get_run must not be called"))
+    monkeypatch.setattr(mlflow.tracking.MlflowClient, "get_run", get_run)
+    with mlflow.start_run(), spool.spool(tmpdir.strpath):
+        sampler = sm.SystemMetricsSampler(interval=0.01, flush_interval=0.01).start()
+        time.sleep(0.1)
+        sampler.stop()
+
+
+def test_invalid_backend() -> None:
+    with pytest.raises(ValueError, match="`backend` must be one of"):
+        sm.SystemMetricsSampler(backend="wmi")
+
+
+def test_psutil_backend_without_psutil(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    with pytest.raises(ImportError, match="psutil is required"):
+        sm.SystemMetricsSampler(backend="psutil")
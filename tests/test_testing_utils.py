@@ -0,0 +1,82 @@
+import time
+from typing import Any
+
+import mlflow
+import pytest
+
+from mlflow_extend import logging as lg
+from mlflow_extend.testing.utils import iter_artifacts, list_artifacts
+
+
+@pytest.fixture
+def run_id() -> str:
+    with mlflow.start_run() as run:
+        for path in ["a.txt", "b.png", "dir/c.txt", "dir/dir/d.txt"]:
+            lg.log_text(path, path)
+    return run.info.run_id
+
+
+def test_iter_artifacts(run_id: str) -> None:
+    paths = iter_artifacts(run_id)
+    assert not isinstance(paths, list)
+    assert sorted(paths) == ["a.txt", "b.png", "dir/c.txt", "dir/dir/d.txt"]
+
+
+def test_iter_artifacts_with_root(run_id: str) -> None:
+    assert sorted(iter_artifacts(run_id, "dir")) == ["dir/c.txt", "dir/dir/d.txt"]
+
+
+@pytest.mark.parametrize(
+    "max_depth, expected",
+    [
+        (0, ["a.txt", "b.png"]),
+        (1, ["a.txt", "b.png", "dir/c.txt"]),
+        (None, ["a.txt", "b.png", "dir/c.txt", "dir/dir/d.txt"]),
+    ],
+)
+def test_iter_artifacts_with_max_depth(
+    run_id: str, max_depth: int, expected: list
+) -> None:
+    assert sorted(iter_artifacts(run_id, max_depth=max_depth)) == expected
+
+
+def test_iter_artifacts_with_pattern(run_id: str) -> None:
+    assert sorted(iter_artifacts(run_id, pattern="*.txt")) == [
+        "a.txt",
+        "dir/c.txt",
+        "dir/dir/d.txt",
+    ]
+    assert sorted(iter_artifacts(run_id, pattern="dir/*/*.txt")) == ["dir/dir/d.txt"]
+
+
+def test_iter_artifacts_stops_early(monkeypatch: pytest.MonkeyPatch) -> None:
+    with mlflow.start_run() as run:
+        for i in range(10):
+            lg.log_text("", "dir{}/a.txt".format(i))
+        lg.log_text("", "z.txt")
+
+    list_artifacts = mlflow.tracking.MlflowClient.list_artifacts
+
+    def slow_list_artifacts(self: Any, run_id: str, path: Any = None) -> list:
+        if path is not None:
+            time.sleep(1)
+        return list_artifacts(self, run_id, path)
+
+    monkeypatch.setattr(
+        mlflow.tracking.MlflowClient, "list_artifacts", slow_list_artifacts
+    )
+    paths = iter_artifacts(run.info.run_id, max_workers=2)
+    assert next(paths) == "z.txt"
+    start = time.time()
+    paths.close()
+    # The subdirectories would take 5 seconds to list.
+    assert time.time() - start < 0.5
+
+
+def test_list_artifacts(run_id: str) -> None:
+    assert list_artifacts(run_id, max_workers=1) == [
+        "a.txt",
+        "b.png",
+        "dir/c.txt",
+        "dir/dir/d.txt",
+    ]
@@ -1,3 +1,10 @@
+import hashlib
+
+import py
+import pytest
+import requests
+from mlflow.exceptions import MlflowException, RestException
+
 from mlflow_extend import utils
 
 
@@ -6,3 +13,46 @@ def test_flatten_dict() -> None:
     assert utils.flatten_dict(dct) == {"a.b": "c"}
     assert utils.flatten_dict(dct, parent_key="d") == {"d.a.b": "c"}
     assert utils.flatten_dict(dct, sep="_") == {"a_b": "c"}
+
+
+def test_chunks() -> None:
+    assert list(utils.chunks([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(utils.chunks([], 2)) == []
+
+
+def test_file_sha256(tmpdir: py.path.local) -> None:
+    path = tmpdir.join("data.bin")
+    data = bytes(range(256)) * 100
+    path.write_binary(data)
+    expected = hashlib.sha256(data).hexdigest()
+    assert utils.file_sha256(path.strpath) == expected
+    assert utils.file_sha256(path.strpath, chunk_size=7) == expected
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (ConnectionError(), True),
+        (TimeoutError(), True),
+        (requests.exceptions.ConnectionError(), True),
+        (MlflowException("API request failed with error code 503 != 200."), True),
+        (MlflowException("API request failed with error code 404 != 200."), False),
+        (RestException({"error_code": "TEMPORARILY_UNAVAILABLE"}), True),
+        (RestException({"error_code": "RESOURCE_DOES_NOT_EXIST"}), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_transient_error(error: Exception, expected: bool) -> None:
+    assert utils.is_transient_error(error) == expected
+
+
+def test_call_with_retries_retry_on() -> None:
+    attempts = []
+
+    def fail() -> None:
+        attempts.append(None)
+        raise ValueError("permanent")
+
+    with pytest.raises(ValueError, match="permanent"):
+        utils.call_with_retries(fail, backoff=0, retry_on=utils.is_transient_error)
+    assert len(attempts) == 1